@@ -0,0 +1,237 @@
+import math
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock, local
+
+from flask import jsonify, make_response, request
+
+from scheduler import get_scheduler
+
+
+class HMSOverloadedError(Exception):
+    """Raised when no HMS call slot frees up in time; mapped to 503 by the app"""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Hotel system is busy, please try again shortly')
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Caps outstanding HMS calls per worker so bursts shed load instead of queueing"""
+
+    def __init__(self, limit, timeout=0.5, retry_after=1):
+        self.limit = limit
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = BoundedSemaphore(limit)
+        self._lock = Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self):
+        """Hold one HMS call slot, or raise HMSOverloadedError after timeout"""
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise HMSOverloadedError(self.retry_after)
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+
+class MemoryRateLimitBackend:
+    """Token buckets held in this worker's memory"""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = Lock()
+
+    def take(self, key, rate, burst, now=None):
+        """Take one token; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def _prune(self, now):
+        # Drop the oldest half; idle buckets would have refilled to full anyway
+        for key, _ in sorted(self._buckets.items(), key=lambda item: item[1][1])[:len(self._buckets) // 2]:
+            del self._buckets[key]
+
+
+class SQLiteRateLimitBackend:
+    """Token buckets in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = local()
+        connection = self._connection()
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_buckets '
+            '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL DEFAULT 0)'
+        )
+        try:
+            # Files created before full_at existed; their rows are pruned on the first pass
+            connection.execute('ALTER TABLE rate_limit_buckets ADD COLUMN full_at REAL NOT NULL DEFAULT 0')
+        except sqlite3.OperationalError:
+            pass
+        connection.execute('CREATE INDEX IF NOT EXISTS rate_limit_buckets_full_at ON rate_limit_buckets (full_at)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, rate, burst, now=None):
+        """Take one token; returns (allowed, seconds until a token is available)"""
+        # Wall clock, since monotonic clocks are not comparable across processes
+        now = time.time() if now is None else now
+        connection = self._connection()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            row = connection.execute(
+                'SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens, updated = row if row else (burst, now)
+            tokens = min(burst, tokens + max(0, now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            connection.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + (burst - tokens) / rate)
+            )
+            connection.execute('COMMIT')
+        except sqlite3.Error as e:
+            # Fail open: a broken limiter must not take the website down
+            print(f"Rate limit backend error: {e}")
+            try:
+                connection.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+            return True, 0
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def prune(self, now=None):
+        """Delete buckets that have refilled; a missing bucket starts full, so nothing changes"""
+        now = time.time() if now is None else now
+        try:
+            return self._connection().execute('DELETE FROM rate_limit_buckets WHERE full_at <= ?', (now,)).rowcount
+        except sqlite3.Error as e:
+            print(f"Rate limit backend error: {e}")
+            return 0
+
+
+def create_rate_limit_backend(spec):
+    """Build a backend from RATE_LIMIT_BACKEND ('memory', 'sqlite:///path' or an instance)"""
+    if not isinstance(spec, str):
+        return spec
+    if spec == 'memory':
+        return MemoryRateLimitBackend()
+    if spec.startswith('sqlite:///'):
+        return SQLiteRateLimitBackend(spec[len('sqlite:///'):])
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {spec}")
+
+
+class AdmissionController:
+    """Per-client, per-route token-bucket rate limiting for the Flask app"""
+
+    def __init__(self, limits, backend, trust_proxy=False):
+        # Normalize {'endpoint': {'per_minute', 'burst', 'methods'}} once
+        self.limits = {
+            endpoint: (
+                rule['per_minute'] / 60.0,
+                rule.get('burst', rule['per_minute']),
+                frozenset(rule.get('methods') or ())
+            )
+            for endpoint, rule in limits.items()
+        }
+        self.backend = backend
+        self.trust_proxy = trust_proxy
+        self.rejected = 0
+
+    def client_id(self):
+        """Identify the client; X-Forwarded-For is only trusted behind our own proxy"""
+        if self.trust_proxy and request.access_route:
+            return request.access_route[0]
+        return request.remote_addr or 'unknown'
+
+    def check(self):
+        """before_request hook: return a 429 response when the client is over its limit"""
+        rule = self.limits.get(request.endpoint)
+        if rule is None:
+            return None
+        rate, burst, methods = rule
+        if methods and request.method not in methods:
+            return None
+
+        allowed, retry_after = self.backend.take(f"{request.endpoint}:{self.client_id()}", rate, burst)
+        if allowed:
+            return None
+        self.rejected += 1
+        return shed_response(429, 'Too many requests, please slow down', retry_after)
+
+
+def shed_response(status, message, retry_after):
+    """Fast rejection with Retry-After, JSON for API callers and plain text for pages"""
+    retry_after = max(1, math.ceil(retry_after))
+    if request.path.startswith(('/api/', '/book')) or request.accept_mimetypes.best == 'application/json':
+        response = jsonify({'success': False, 'message': message, 'retry_after': retry_after})
+    else:
+        response = make_response(message)
+        response.mimetype = 'text/plain'
+    response.status_code = status
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def init_admission_control(app, api_service):
+    """Wire rate limiting and the HMS concurrency cap into the app"""
+    limiter = ConcurrencyLimiter(
+        app.config['HMS_MAX_CONCURRENT_CALLS'],
+        timeout=app.config['HMS_ADMISSION_TIMEOUT']
+    )
+    api_service.hms_limiter = limiter
+
+    @app.errorhandler(HMSOverloadedError)
+    def hms_overloaded(error):
+        return shed_response(503, str(error), error.retry_after)
+
+    controller = None
+    if app.config['RATE_LIMIT_ENABLED']:
+        controller = AdmissionController(
+            app.config['RATE_LIMITS'],
+            create_rate_limit_backend(app.config['RATE_LIMIT_BACKEND']),
+            trust_proxy=app.config['RATE_LIMIT_TRUST_PROXY']
+        )
+        app.before_request(controller.check)
+        if hasattr(controller.backend, 'prune'):
+            def prune_buckets():
+                controller.backend.prune()  # Its row count must not be taken as the next delay
+
+            get_scheduler().schedule(prune_buckets, delay=app.config['RATE_LIMIT_PRUNE_INTERVAL'],
+                                     interval=app.config['RATE_LIMIT_PRUNE_INTERVAL'], jitter=5,
+                                     name='rate-limit-prune')
+        print(f"Rate limiting enabled for {', '.join(sorted(controller.limits))} ({app.config['RATE_LIMIT_BACKEND']})")
+
+    print(f"HMS concurrency cap: {limiter.limit} outstanding calls per worker")
+    return controller
@@ -1,18 +1,25 @@
 try:
     import requests
+    from urllib3.exceptions import NewConnectionError
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     print("Warning: requests module not available. Using mock mode only.")
 
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from threading import Lock
+from admission_control import HMSOverloadedError
 from auth_service import get_auth_service
+from room_model import RoomInventory
+from tracing import span
 
 class HotelAPIService:
     """Service layer for connecting to Hotel Management System API"""
     
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, hms_limiter=None):
         # Connection Configuration - Use production HMS settings
         self.base_url = base_url or os.getenv('HMS_API_URL', 'http://localhost:5000')
         self.api_key = os.getenv('HMS_API_KEY', 'ngenda_website_key')
@@ -22,6 +29,8 @@ class HotelAPIService:
         # HMS Endpoint Configuration
         self.public_rooms_endpoint = os.getenv('HMS_PUBLIC_ROOMS_ENDPOINT', '/api/public/rooms')
         self.bookings_endpoint = os.getenv('HMS_BOOKINGS_ENDPOINT', '/api/bookings/')
+        self.bulk_bookings_endpoint = os.getenv('HMS_BULK_BOOKINGS_ENDPOINT')  # Optional, e.g. /api/bookings/bulk
+        self._bulk_supported = True
         
         # Hotel ID for branch identification
         self.hotel_id = os.getenv('HMS_HOTEL_ID', '1')
@@ -29,6 +38,14 @@ class HotelAPIService:
         # Initialize authentication service
         self.auth_service = get_auth_service()
         
+        # Optional cap on outstanding HMS calls (see admission_control.py)
+        self.hms_limiter = hms_limiter
+        
+        # Current room inventory, rebuilt only when the HMS payload changes
+        self._inventory = None
+        self._payload_digest = None
+        self._inventory_listeners = []
+        
         print(f"HotelAPIService initialized for Hotel ID {self.hotel_id}")
         print(f"Public rooms endpoint: {self.base_url}{self.public_rooms_endpoint}")
         print(f"Bookings endpoint: {self.base_url}{self.bookings_endpoint}")
@@ -39,8 +56,40 @@ class HotelAPIService:
         mode = "Live API" if live_mode else "Mock Data"
         print(f"Switched to {mode} mode")
     
+    def add_inventory_listener(self, listener):
+        """Call listener(previous, inventory) whenever the HMS room payload changes"""
+        self._inventory_listeners.append(listener)
+    
+    def is_current_inventory(self, inventory):
+        """Whether inventory is the latest HMS data (or the mock data in mock mode) rather than a fallback"""
+        if self.mock_mode or not REQUESTS_AVAILABLE:
+            return inventory is _MOCK_INVENTORY
+        return inventory is not None and inventory is self._inventory
+    
+    def get_room(self, room_id):
+        """Look a room up in the last fetched inventory, fetching again only if it is not there"""
+        inventory = self._inventory
+        if self.mock_mode or not REQUESTS_AVAILABLE or inventory is None:
+            inventory = self.get_available_rooms()
+        room = _find_room(inventory, room_id)
+        if room is None and inventory is self._inventory and not self.mock_mode:
+            # Possibly added at the HMS since the last refresh
+            room = _find_room(self.get_available_rooms(), room_id)
+        return room
+    
+    def _hms_request(self, method, url, **kwargs):
+        """Make an HMS call, holding a concurrency slot when a limiter is configured"""
+        with span('hms', desc=f"{method} {url.removeprefix(self.base_url)}"):
+            if self.hms_limiter is None:
+                return requests.request(method, url, **kwargs)
+            with self.hms_limiter.slot():
+                return requests.request(method, url, **kwargs)
+    
     def get_available_rooms(self):
-        """Fetch available rooms from HMS API or return mock data"""
+        """Fetch available rooms from HMS API or return mock data
+        
+        Returns a shared, immutable RoomInventory; callers must not mutate it.
+        """
         if self.mock_mode or not REQUESTS_AVAILABLE:
             return self._get_mock_rooms()
         else:
@@ -53,41 +102,41 @@ class HotelAPIService:
                     'X-Hotel-ID': self.hotel_id
                 }
                 
-                response = requests.get(
+                response = self._hms_request(
+                    'GET',
                     f"{self.base_url}{self.public_rooms_endpoint}",
                     headers=headers,
                     timeout=self.timeout
                 )
                 response.raise_for_status()
                 
+                # Only re-map rooms when the HMS payload actually changed
+                digest = hashlib.sha1(response.content).hexdigest()
+                if self._inventory is not None and digest == self._payload_digest:
+                    return self._inventory
+                
                 # Map incoming JSON to our frontend fields
                 api_data = response.json()
                 if api_data.get('success') and 'rooms' in api_data:
-                    rooms = []
-                    for room in api_data['rooms']:
-                        # Ensure room categories match our frontend filter buttons
-                        mapped_room = {
-                            'id': room.get('id'),
-                            'name': room.get('name'),
-                            'category': room.get('category'),  # classic, superior, deluxe, executive
-                            'price': room.get('price'),
-                            'price_usd': room.get('price_usd'),
-                            'capacity': room.get('capacity', 2),
-                            'size': room.get('size', '25 sqm'),
-                            'beds': room.get('beds', 'Double Bed'),
-                            'amenities': room.get('amenities', []),
-                            'image': room.get('image', 'default_room.jpg'),
-                            'available': room.get('available', True),
-                            'description': room.get('description', ''),
-                            'currency': room.get('currency', 'TZS')
-                        }
-                        rooms.append(mapped_room)
-                    print(f"Successfully fetched {len(rooms)} rooms from HMS")
-                    return rooms
+                    inventory = RoomInventory.from_records(api_data['rooms'])
+                    previous, self._inventory = self._inventory, inventory
+                    self._payload_digest = digest
+                    print(f"Successfully fetched {len(inventory)} rooms from HMS (inventory {inventory.version})")
+                    for listener in self._inventory_listeners:
+                        try:
+                            listener(previous, inventory)
+                        except Exception as e:
+                            print(f"Inventory listener error: {e}")
+                    return inventory
                 else:
                     print(f"API returned unexpected format: {api_data}")
                     return self._get_mock_rooms()
                     
+            except HMSOverloadedError:
+                # Shed the HMS call but keep serving the last known inventory
+                if self._inventory is not None:
+                    return self._inventory
+                raise
             except requests.exceptions.RequestException as e:
                 # Error Handling: Fallback to mock data if HMS is offline
                 print(f"HMS API Error: {e}")
@@ -111,21 +160,10 @@ class HotelAPIService:
             headers = self.auth_service.get_auth_headers()
             
             # Ensure payload includes required fields and hotel_id
-            payload = {
-                'guest_name': booking_data.get('guest_name'),
-                'guest_email': booking_data.get('guest_email'),
-                'guest_phone': booking_data.get('guest_phone'),
-                'room_id': booking_data.get('room_id'),
-                'room_type': booking_data.get('room_type'),
-                'check_in': booking_data.get('check_in'),
-                'check_out': booking_data.get('check_out'),
-                'guests': booking_data.get('guests', 1),
-                'special_requests': booking_data.get('special_requests', ''),
-                'source': 'website',
-                'hotel_id': self.hotel_id  # Explicitly include hotel_id for branch routing
-            }
+            payload = self._build_booking_payload(booking_data)
             
-            response = requests.post(
+            response = self._hms_request(
+                'POST',
                 f"{self.base_url}{self.bookings_endpoint}",
                 json=payload,
                 headers=headers,
@@ -153,19 +191,14 @@ class HotelAPIService:
             api_response = response.json()
             if api_response.get('success'):
                 print(f"Booking created successfully: {api_response.get('booking_id')}")
-                return {
-                    'success': True,
-                    'booking_id': api_response.get('booking_id'),
-                    'message': api_response.get('message', 'Booking created successfully'),
-                    'whatsapp_link': api_response.get('whatsapp_link'),
-                    'booking_details': api_response.get('booking_details', {}),
-                    'total_amount': api_response.get('total_amount'),
-                    'currency': api_response.get('currency', 'TZS')
-                }
+                return self._booking_result(api_response)
             else:
                 print(f"Booking failed: {api_response}")
                 return self._create_mock_booking(booking_data)
                 
+        except HMSOverloadedError:
+            # Never pretend a shed booking succeeded; the app answers 503
+            raise
         except requests.exceptions.RequestException as e:
             # Error Handling: Fallback to mock booking if HMS is offline
             print(f"HMS Booking API Error: {e}")
@@ -175,91 +208,252 @@ class HotelAPIService:
             print(f"Unexpected booking error: {e}")
             return self._create_mock_booking(booking_data)
     
-    def _get_mock_rooms(self):
-        """Return mock room data for development"""
+    def _build_booking_payload(self, booking_data):
+        """Build the HMS booking payload from website booking data"""
+        return {
+            'guest_name': booking_data.get('guest_name'),
+            'guest_email': booking_data.get('guest_email'),
+            'guest_phone': booking_data.get('guest_phone'),
+            'room_id': booking_data.get('room_id'),
+            'room_type': booking_data.get('room_type'),
+            'check_in': booking_data.get('check_in'),
+            'check_out': booking_data.get('check_out'),
+            'guests': booking_data.get('guests', 1),
+            'special_requests': booking_data.get('special_requests', ''),
+            'source': 'website',
+            'hotel_id': self.hotel_id  # Explicitly include hotel_id for branch routing
+        }
+    
+    def _booking_result(self, api_response):
+        """Map a successful HMS booking response onto our result fields"""
+        return {
+            'success': True,
+            'booking_id': api_response.get('booking_id'),
+            'message': api_response.get('message', 'Booking created successfully'),
+            'whatsapp_link': api_response.get('whatsapp_link'),
+            'booking_details': api_response.get('booking_details', {}),
+            'total_amount': api_response.get('total_amount'),
+            'currency': api_response.get('currency', 'TZS')
+        }
+    
+    def create_bookings_batch(self, bookings, all_or_nothing=False, max_workers=4):
+        """Create a group of bookings, returning one result per item
+        
+        Uses the HMS bulk endpoint when one is configured and supported, otherwise
+        submits the items concurrently with at most max_workers in flight. Unlike
+        single bookings, failed items are reported as failures rather than mocked.
+        With all_or_nothing, bookings that did succeed are cancelled again when any
+        item fails.
+        """
+        if self.mock_mode or not REQUESTS_AVAILABLE:
+            results = []
+            for index, booking_data in enumerate(bookings, start=1):
+                result = self._create_mock_booking(booking_data)
+                # Mock ids are per-second timestamps, so keep them unique within the group
+                result['booking_id'] = f"{result['booking_id']}-{index}"
+                result['booking_details']['id'] = result['booking_id']
+                results.append(result)
+            return self._batch_summary(results, all_or_nothing)
+        
+        # One auth header lookup for the whole group
+        headers = self.auth_service.get_auth_headers()
+        
+        results = None
+        if self.bulk_bookings_endpoint and self._bulk_supported:
+            results = self._submit_bulk_bookings(bookings, headers, all_or_nothing)
+        if results is None:
+            results = self._submit_bookings_concurrently(bookings, headers, max_workers)
+        
+        if all_or_nothing and not all(result['success'] for result in results):
+            self._compensate_bookings(results)
+        
+        return self._batch_summary(results, all_or_nothing)
+    
+    def _submit_bulk_bookings(self, bookings, headers, atomic):
+        """Submit the group as one HMS bulk call; returns None only if the endpoint is unsupported
+        
+        The bulk POST is not idempotent, so once the HMS may have taken the group it is
+        never resubmitted item by item: unclear outcomes are reported as unknown instead.
+        """
+        payload = {
+            'bookings': [self._build_booking_payload(booking) for booking in bookings],
+            'atomic': atomic,
+            'hotel_id': self.hotel_id
+        }
+        try:
+            for attempt in range(2):
+                response = self._hms_request(
+                    'POST',
+                    f"{self.base_url}{self.bulk_bookings_endpoint}",
+                    json=payload,
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                if response.status_code == 401 and attempt == 0 and self.auth_service.force_refresh_token():
+                    headers = self.auth_service.get_auth_headers()
+                    continue
+                break
+            
+            if response.status_code in (404, 405, 501):
+                print("HMS bulk booking endpoint not supported, submitting bookings individually")
+                self._bulk_supported = False
+                return None
+            if 400 <= response.status_code < 500:
+                # Rejected outright, so nothing was booked
+                print(f"HMS bulk booking rejected with {response.status_code}")
+                return self._failed_results(bookings, 'Booking failed')
+            
+            response.raise_for_status()
+            api_response = response.json()
+            items = api_response.get('results') or []
+            if len(items) != len(bookings):
+                print(f"Bulk booking returned {len(items)} results for {len(bookings)} bookings")
+                return self._unknown_results(bookings)
+            
+            return [
+                self._booking_result(item) if item.get('success')
+                else {'success': False, 'message': item.get('message', 'Booking failed')}
+                for item in items
+            ]
+        except HMSOverloadedError:
+            # Shed before anything was sent
+            return self._failed_results(bookings, 'Hotel system is busy, please try again shortly')
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"HMS Bulk Booking API Error: {e}")
+            return self._unknown_results(bookings)
+    
+    def _failed_results(self, bookings, message):
+        return [{'success': False, 'message': message} for _ in bookings]
+    
+    def _unknown_results(self, bookings):
+        """Results for a group the HMS may or may not have booked"""
         return [
-            {
-                'id': 1,
-                'name': 'Standard Double Room',
-                'category': 'classic',
-                'price': 80000,
-                'currency': 'TZS',
-                'price_usd': 30,
-                'capacity': 2,
-                'beds': 'Double Bed',
-                'size': '25 sqm',
-                'amenities': ['Free WiFi', 'Air Conditioning', 'Flat-screen TV', 'Mini Bar', 'Room Service'],
-                'image': 'room2.jpg',
-                'available': True,
-                'description': 'Comfortable standard double room with modern amenities including AC and flat-screen TV'
-            },
-            {
-                'id': 2,
-                'name': 'Superior Double Room',
-                'category': 'superior',
-                'price': 120000,
-                'currency': 'TZS',
-                'price_usd': 45,
-                'capacity': 2,
-                'beds': 'Double Bed',
-                'size': '35 sqm',
-                'amenities': ['Free WiFi', 'Air Conditioning', 'Flat-screen TV', 'Mini Bar', 'Room Service', 'Premium Amenities'],
-                'image': 'room3.jpg',
-                'available': True,
-                'description': 'Enhanced double room with premium amenities and extra space'
-            },
-            {
-                'id': 3,
-                'name': 'Superior Family Room',
-                'category': 'deluxe',
-                'price': 180000,
-                'currency': 'TZS',
-                'price_usd': 68,
-                'capacity': 4,
-                'beds': 'Family Configuration',
-                'size': '45 sqm',
-                'amenities': ['Free WiFi', 'Air Conditioning', 'Flat-screen TV', 'Mini Bar', 'Room Service', 'Family Amenities'],
-                'image': 'Room.jpg',
-                'available': True,
-                'description': 'Perfect family room with space for 4 guests and family-friendly amenities'
-            },
-            {
-                'id': 4,
-                'name': 'Apartment with Balcony',
-                'category': 'executive',
-                'price': 350000,
-                'currency': 'TZS',
-                'price_usd': 130,
-                'capacity': 15,
-                'beds': 'Multiple Beds',
-                'size': '120 sqm',
-                'amenities': ['Free WiFi', 'Microwave', 'Mountain View', 'Air Conditioning', 'Mini Bar', 'Room Service', 'Kitchen', 'Balcony'],
-                'image': 'room1.jpg',
-                'available': True,
-                'description': 'Spacious apartment with modern master bedrooms and fully equipped kitchens, perfect for large groups, featuring mountain views and full kitchen facilities'
-            },
-            {
-                'id': 5,
-                'name': 'Budget Single Room',
-                'category': 'classic',
-                'price': 60000,
-                'currency': 'TZS',
-                'price_usd': 23,
-                'capacity': 1,
-                'beds': 'Single Bed',
-                'size': '20 sqm',
-                'amenities': ['Free WiFi', 'Air Conditioning'],
-                'image': 'room4.JPG',
-                'available': True,
-                'description': 'Affordable single room perfect for budget-conscious travelers'
-            }
+            {'success': False, 'unknown': True,
+             'message': 'Booking status unknown, please contact the hotel before booking again'}
+            for _ in bookings
         ]
     
+    def _submit_bookings_concurrently(self, bookings, headers, max_workers):
+        """POST each booking with bounded parallelism, sharing one set of headers"""
+        refresh_lock = Lock()
+        shared = {'headers': headers}
+        
+        def refresh_headers(stale_headers):
+            # Only the first item to see a 401 refreshes the token; the rest reuse it
+            with refresh_lock:
+                if shared['headers'] is stale_headers and self.auth_service.force_refresh_token():
+                    shared['headers'] = self.auth_service.get_auth_headers()
+                return shared['headers']
+        
+        def submit(booking_data):
+            payload = self._build_booking_payload(booking_data)
+            item_headers = shared['headers']
+            try:
+                for attempt in range(2):
+                    response = self._hms_request(
+                        'POST',
+                        f"{self.base_url}{self.bookings_endpoint}",
+                        json=payload,
+                        headers=item_headers,
+                        timeout=self.timeout
+                    )
+                    if response.status_code == 401 and attempt == 0:
+                        item_headers = refresh_headers(item_headers)
+                        continue
+                    break
+                
+                if response.status_code == 409:
+                    return {'success': False, 'message': 'Room is no longer available'}
+                if response.status_code >= 500:
+                    # The HMS may have booked the room before failing
+                    print(f"HMS booking failed with {response.status_code}")
+                    return self._unknown_results([booking_data])[0]
+                response.raise_for_status()
+                
+                try:
+                    api_response = response.json()
+                except ValueError:
+                    print("HMS booking returned an unreadable response")
+                    return self._unknown_results([booking_data])[0]
+                if api_response.get('success'):
+                    return self._booking_result(api_response)
+                return {'success': False, 'message': api_response.get('message', 'Booking failed')}
+            except HMSOverloadedError:
+                return {'success': False, 'message': 'Hotel system is busy, please try again shortly'}
+            except requests.exceptions.RequestException as e:
+                print(f"HMS Booking API Error: {e}")
+                if _may_have_reached_hms(e):
+                    return self._unknown_results([booking_data])[0]
+                return {'success': False, 'message': 'Hotel system unavailable, please try again'}
+            except Exception as e:
+                print(f"Unexpected booking error: {e}")
+                return {'success': False, 'message': 'Booking failed'}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(bookings)))) as executor:
+            return list(executor.map(submit, bookings))
+    
+    def _compensate_bookings(self, results):
+        """Cancel the bookings that succeeded so an all-or-nothing group leaves nothing behind"""
+        headers = self.auth_service.get_auth_headers()
+        for result in results:
+            if not result['success'] or not result.get('booking_id'):
+                continue
+            try:
+                # Bypasses the HMS concurrency cap: shedding a cancellation would leave a stray booking
+                response = requests.delete(
+                    f"{self.base_url}{self.bookings_endpoint}{result['booking_id']}",
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                result['compensated'] = True
+                print(f"Cancelled booking {result['booking_id']} after group failure")
+            except requests.exceptions.RequestException as e:
+                result['compensated'] = False
+                print(f"Failed to cancel booking {result['booking_id']}: {e}")
+    
+    def _batch_summary(self, results, all_or_nothing):
+        """Build the batch response from per-item results"""
+        items = []
+        for index, result in enumerate(results):
+            if result.get('compensated'):
+                status = 'cancelled'
+            elif result.get('unknown'):
+                status = 'unknown'
+            elif result['success'] and all_or_nothing and 'compensated' in result:
+                status = 'cancel_failed'
+            elif result['success']:
+                status = 'confirmed'
+            else:
+                status = 'failed'
+            items.append({
+                'index': index,
+                'status': status,
+                'booking_id': result.get('booking_id'),
+                'message': result.get('message'),
+                'total_amount': result.get('total_amount'),
+                'currency': result.get('currency')
+            })
+        
+        confirmed = sum(1 for item in items if item['status'] == 'confirmed')
+        return {
+            'success': confirmed == len(items),
+            'all_or_nothing': all_or_nothing,
+            'confirmed': confirmed,
+            'failed': len(items) - confirmed,
+            'results': items
+        }
+    
+    def _get_mock_rooms(self):
+        """Return mock room data for development"""
+        return _MOCK_INVENTORY
+    
     def _create_mock_booking(self, booking_data):
         """Create mock booking response"""
         booking_id = f"BKG{datetime.now().strftime('%Y%m%d%H%M%S')}"
         return {
             'success': True,
+            'mock': True,
             'booking_id': booking_id,
             'message': 'Booking created successfully',
             'booking_details': {
@@ -277,3 +471,103 @@ class HotelAPIService:
     def set_mock_mode(self):
         """Switch to mock mode for development"""
         self.toggle_live_mode(False)
+
+
+def _may_have_reached_hms(error):
+    """Whether a failed request may have been received (read timeout, connection dropped mid-call)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return False
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return not isinstance(reason, NewConnectionError)
+    return False
+
+
+def _find_room(inventory, room_id):
+    """Room for a submitted id (HMS ids are usually ints, forms send strings), or None"""
+    room = inventory.get(room_id)
+    if room is None and str(room_id).isdigit():
+        room = inventory.get(int(room_id))
+    return room
+
+
+# Mock room data for development, built once and shared
+_MOCK_INVENTORY = RoomInventory.from_records([
+    {
+        'id': 1,
+        'name': 'Standard Double Room',
+        'category': 'classic',
+        'price': 80000,
+        'currency': 'TZS',
+        'price_usd': 30,
+        'capacity': 2,
+        'beds': 'Double Bed',
+        'size': '25 sqm',
+        'amenities': ['Free WiFi', 'Air Conditioning', 'Flat-screen TV', 'Mini Bar', 'Room Service'],
+        'image': 'room2.jpg',
+        'available': True,
+        'description': 'Comfortable standard double room with modern amenities including AC and flat-screen TV'
+    },
+    {
+        'id': 2,
+        'name': 'Superior Double Room',
+        'category': 'superior',
+        'price': 120000,
+        'currency': 'TZS',
+        'price_usd': 45,
+        'capacity': 2,
+        'beds': 'Double Bed',
+        'size': '35 sqm',
+        'amenities': ['Free WiFi', 'Air Conditioning', 'Flat-screen TV', 'Mini Bar', 'Room Service', 'Premium Amenities'],
+        'image': 'room3.jpg',
+        'available': True,
+        'description': 'Enhanced double room with premium amenities and extra space'
+    },
+    {
+        'id': 3,
+        'name': 'Superior Family Room',
+        'category': 'deluxe',
+        'price': 180000,
+        'currency': 'TZS',
+        'price_usd': 68,
+        'capacity': 4,
+        'beds': 'Family Configuration',
+        'size': '45 sqm',
+        'amenities': ['Free WiFi', 'Air Conditioning', 'Flat-screen TV', 'Mini Bar', 'Room Service', 'Family Amenities'],
+        'image': 'Room.jpg',
+        'available': True,
+        'description': 'Perfect family room with space for 4 guests and family-friendly amenities'
+    },
+    {
+        'id': 4,
+        'name': 'Apartment with Balcony',
+        'category': 'executive',
+        'price': 350000,
+        'currency': 'TZS',
+        'price_usd': 130,
+        'capacity': 15,
+        'beds': 'Multiple Beds',
+        'size': '120 sqm',
+        'amenities': ['Free WiFi', 'Microwave', 'Mountain View', 'Air Conditioning', 'Mini Bar', 'Room Service', 'Kitchen', 'Balcony'],
+        'image': 'room1.jpg',
+        'available': True,
+        'description': 'Spacious apartment with modern master bedrooms and fully equipped kitchens, perfect for large groups, featuring mountain views and full kitchen facilities'
+    },
+    {
+        'id': 5,
+        'name': 'Budget Single Room',
+        'category': 'classic',
+        'price': 60000,
+        'currency': 'TZS',
+        'price_usd': 23,
+        'capacity': 1,
+        'beds': 'Single Bed',
+        'size': '20 sqm',
+        'amenities': ['Free WiFi', 'Air Conditioning'],
+        'image': 'room4.JPG',
+        'available': True,
+        'description': 'Affordable single room perfect for budget-conscious travelers'
+    }
+])
@@ -1,12 +1,95 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
 from config import config
+from early_hints import init_early_hints
+from funnel_events import CLIENT_STAGES, funnel_report, init_funnel_events
 from api_service import HotelAPIService
+from admission_control import HMSOverloadedError, init_admission_control
 from auth_service import initialize_hms_auth
+from blog_store import BlogStore
+from http_cache import init_http_cache, inventory_tags, room_tags, set_cache_tags
+from service_worker import init_service_worker
+from static_export import init_static_export
+from template_cache import init_template_cache
+from tracing import init_tracing, span
+from pricing import ExchangeRates, PricingError, PricingRules, get_rate_calendar, parse_quote_request
+from profiling import init_profiling
+from reservation_holds import HoldConflictError, create_hold_store
+from room_stream import init_room_stream
+from room_model import RoomInventory
+from room_query import RoomQueryError, get_room_index, parse_room_query, query_etag, render_room_page
+from scheduler import get_scheduler
+import hmac
+import math
 import os
 import smtplib
+import sqlite3
+import time
+from datetime import date, datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+# Fallback rooms for the home page when the API service is unavailable
+FALLBACK_ROOMS = RoomInventory.from_records([
+    {
+        'id': 1,
+        'name': 'Classic Balcony Room',
+        'price': 299000,
+        'currency': 'TZS',
+        'category': 'classic',
+        'image': 'Room.jpg',
+        'size': '30m²',
+        'capacity': 3,
+        'beds': 'balcony'
+    },
+    {
+        'id': 2,
+        'name': 'Superior Double Room',
+        'price': 399000,
+        'currency': 'TZS',
+        'category': 'superior',
+        'image': 'room1.jpg',
+        'size': '35m²',
+        'capacity': 3,
+        'beds': 'double'
+    },
+    {
+        'id': 3,
+        'name': 'Executive Master Suite',
+        'price': 450000,
+        'currency': 'TZS',
+        'category': 'executive',
+        'image': 'room3.jpg',
+        'size': '55m²',
+        'capacity': 2,
+        'beds': 'king'
+    },
+    {
+        'id': 4,
+        'name': 'Deluxe Double Room',
+        'price': 350000,
+        'currency': 'TZS',
+        'category': 'deluxe',
+        'image': 'room2.jpg',
+        'size': '40m²',
+        'capacity': 2,
+        'beds': 'double'
+    },
+    {
+        'id': 5,
+        'name': 'Premium Garden View',
+        'price': 320000,
+        'currency': 'TZS',
+        'category': 'superior',
+        'image': 'room5.JPG',
+        'size': '32m²',
+        'capacity': 3,
+        'beds': 'double'
+    }
+])
+
+# Fields every booking must carry
+BOOKING_REQUIRED_FIELDS = ['guest_name', 'guest_email', 'guest_phone', 'room_id', 'room_type', 'check_in', 'check_out']
+
 # Initialize Flask app
 def create_app(config_name=None):
     app = Flask(__name__)
@@ -15,8 +98,63 @@ def create_app(config_name=None):
     config_name = config_name or os.environ.get('FLASK_CONFIG', 'development')
     app.config.from_object(config[config_name])
     
+    # Sampled per-request spans, reported as Server-Timing (registered first so shed requests are timed too)
+    init_tracing(app)
+    
+    # Opt-in request profiles and background stack sampling (PROFILE_*, STACK_SAMPLER_*)
+    init_profiling(app)
+    
     # Initialize API service
     api_service = HotelAPIService(app.config['HMS_API_URL'])
+    app.extensions['hotel_api'] = api_service
+    
+    # Compiled templates come from the persistent bytecode cache
+    init_template_cache(app)
+    
+    # Link preload headers and 103 Early Hints for each page's CSS/JS/fonts
+    init_early_hints(app)
+    
+    # Versioned service worker and web manifest for offline and repeat visits
+    init_service_worker(app)
+    
+    # Blog posts parsed and indexed once, reloaded when files change
+    blog_store = BlogStore(app.config['BLOG_CONTENT_DIR'], app.config['BLOG_RELOAD_INTERVAL'])
+    
+    # Stay quotes from per-room rate calendars
+    pricing_rules = PricingRules.from_config(app.config)
+    exchange_rates = ExchangeRates(app.config['EXCHANGE_RATE_TZS_PER_USD'], app.config['EXCHANGE_RATE_URL'],
+                                   app.config['EXCHANGE_RATE_TTL'])
+    
+    # Short-lived room/date holds so competing guests are turned away before any HMS call
+    holds = create_hold_store(app.config['HOLDS_BACKEND'], app.config['HOLD_TTL_SECONDS'],
+                              app.config['HOLD_CONFIRMED_TTL'])
+    app.extensions['reservation_holds'] = holds
+    get_scheduler().schedule(holds.purge_expired, delay=60, interval=60, jitter=5, name='hold-purge')
+    
+    # Booking funnel events, buffered per worker and flushed to SQLite in batches
+    funnel = init_funnel_events(app, get_scheduler())
+    
+    def track(stage, room_id=None, detail=None, visitor=None):
+        if funnel is not None:
+            funnel.record(stage, room_id, visitor or request.form.get('visitor'), detail)
+    
+    # Live availability over Server-Sent Events, fed by a periodic inventory refresh
+    init_room_stream(app, api_service)
+    if app.config['INVENTORY_REFRESH_INTERVAL']:
+        def refresh_inventory():
+            api_service.get_available_rooms()
+        
+        get_scheduler().schedule(refresh_inventory, delay=app.config['INVENTORY_REFRESH_INTERVAL'],
+                                 interval=app.config['INVENTORY_REFRESH_INTERVAL'], jitter=5, name='inventory-refresh')
+    
+    # Cache-Control and surrogate keys for the proxy, purged when the inventory changes
+    init_http_cache(app, api_service)
+    
+    # `flask export-static` freezes content and room pages for nginx to serve
+    init_static_export(app, lambda: api_service.get_available_rooms() or FALLBACK_ROOMS, blog_store)
+    
+    # Rate limits per client and a cap on outstanding HMS calls
+    init_admission_control(app, api_service)
     
     # Initialize HMS authentication on startup with production credentials
     print("Initializing HMS authentication with production settings...")
@@ -75,18 +213,19 @@ def create_app(config_name=None):
             msg.attach(MIMEText(body, 'plain'))
             
             # Send email
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(sender_email, sender_password)
-            text = msg.as_string()
-            
-            # Handle single or multiple recipients
-            if isinstance(recipient_email, list):
-                server.sendmail(sender_email, recipient_email, text)
-            else:
-                server.sendmail(sender_email, recipient_email, text)
+            with span('smtp', desc='contact email'):
+                server = smtplib.SMTP('smtp.gmail.com', 587)
+                server.starttls()
+                server.login(sender_email, sender_password)
+                text = msg.as_string()
                 
-            server.quit()
+                # Handle single or multiple recipients
+                if isinstance(recipient_email, list):
+                    server.sendmail(sender_email, recipient_email, text)
+                else:
+                    server.sendmail(sender_email, recipient_email, text)
+                    
+                server.quit()
             
             return True
             
@@ -94,6 +233,92 @@ def create_app(config_name=None):
             print(f"Error sending email: {e}")
             return False
     
+    def validate_booking_group(items):
+        """Validate a group booking, returning (bookings, errors) with errors keyed by item index"""
+        bookings, errors = [], {}
+        stays = {}
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors[index] = 'Booking must be an object'
+                continue
+            
+            missing = [field for field in BOOKING_REQUIRED_FIELDS if not item.get(field)]
+            if missing:
+                errors[index] = f'{", ".join(missing)} required'
+                continue
+            
+            try:
+                guests = int(item.get('guests', 1))
+                check_in = datetime.strptime(str(item['check_in']), '%Y-%m-%d').date()
+                check_out = datetime.strptime(str(item['check_out']), '%Y-%m-%d').date()
+            except (TypeError, ValueError):
+                errors[index] = 'guests must be a number and dates must be YYYY-MM-DD'
+                continue
+            if not isinstance(item['room_id'], (str, int)):
+                errors[index] = 'room_id must be a string or number'
+                continue
+            
+            nights = (check_out - check_in).days
+            if not app.config['MIN_BOOKING_DAYS'] <= nights <= app.config['MAX_BOOKING_DAYS']:
+                errors[index] = f"Stay must be {app.config['MIN_BOOKING_DAYS']}-{app.config['MAX_BOOKING_DAYS']} nights"
+                continue
+            if not 1 <= guests <= app.config['MAX_GUESTS_PER_ROOM']:
+                errors[index] = f"guests must be between 1 and {app.config['MAX_GUESTS_PER_ROOM']}"
+                continue
+            
+            if api_service.get_room(item['room_id']) is None:
+                errors[index] = f"Room {item['room_id']} does not exist"
+                continue
+            
+            # The same room cannot appear twice in a group for overlapping nights
+            room_key = str(item['room_id'])
+            clash = next((other for other, (start, end) in stays.get(room_key, [])
+                          if check_in < end and start < check_out), None)
+            if clash is not None:
+                errors[index] = f'Room {room_key} is already booked by item {clash} for these dates'
+                continue
+            stays.setdefault(room_key, []).append((index, (check_in, check_out)))
+            
+            bookings.append({**item, 'guests': guests, 'special_requests': item.get('special_requests', '')})
+        return bookings, errors
+    
+    def parse_stay(check_in, check_out):
+        """(check_in, check_out) dates from YYYY-MM-DD strings, or None if invalid or empty"""
+        try:
+            start = datetime.strptime(str(check_in), '%Y-%m-%d').date()
+            end = datetime.strptime(str(check_out), '%Y-%m-%d').date()
+        except ValueError:
+            return None
+        return (start, end) if start < end else None
+    
+    def validate_stay(room_id, check_in, check_out):
+        """(stay, None) for an existing room and an allowed stay length, otherwise (None, message)"""
+        stay = parse_stay(check_in, check_out)
+        if not room_id or stay is None:
+            return None, 'room_id, check_in and check_out (YYYY-MM-DD, after check_in) are required'
+        if stay[0] < date.today():
+            return None, 'check_in cannot be in the past'
+        if not app.config['MIN_BOOKING_DAYS'] <= (stay[1] - stay[0]).days <= app.config['MAX_BOOKING_DAYS']:
+            return None, f"Stay must be {app.config['MIN_BOOKING_DAYS']}-{app.config['MAX_BOOKING_DAYS']} nights"
+        if api_service.get_room(room_id) is None:
+            return None, f'Room {room_id} does not exist'
+        return stay, None
+    
+    def hold_conflict_response(error):
+        return jsonify({
+            'success': False,
+            'message': 'This room is being booked by another guest for those dates. Please choose other dates or another room.',
+            'conflict': {'room_id': error.hold.room_id, 'status': error.hold.status}
+        }), 409
+    
+    def settle_hold(hold, result):
+        """Keep the range blocked if the HMS took the booking, free it otherwise"""
+        # A mock fallback in live mode means the HMS never recorded the booking
+        if result.get('success') and not (result.get('mock') and not api_service.mock_mode):
+            holds.confirm(hold.hold_id)
+        else:
+            holds.release(hold.hold_id)
+    
     # Main routes
     @app.route('/')
     def index():
@@ -103,124 +328,14 @@ def create_app(config_name=None):
             rooms_data = api_service.get_available_rooms()
             if not rooms_data:
                 # Fallback hardcoded rooms if API returns empty
-                rooms_data = [
-                    {
-                        'id': 1,
-                        'name': 'Classic Balcony Room',
-                        'price': 299000,
-                        'currency': 'TZS',
-                        'category': 'classic',
-                        'image': 'Room.jpg',
-                        'size': '30m²',
-                        'capacity': 3,
-                        'beds': 'balcony'
-                    },
-                    {
-                        'id': 2,
-                        'name': 'Superior Double Room',
-                        'price': 399000,
-                        'currency': 'TZS',
-                        'category': 'superior',
-                        'image': 'room1.jpg',
-                        'size': '35m²',
-                        'capacity': 3,
-                        'beds': 'double'
-                    },
-                    {
-                        'id': 3,
-                        'name': 'Executive Master Suite',
-                        'price': 450000,
-                        'currency': 'TZS',
-                        'category': 'executive',
-                        'image': 'room3.jpg',
-                        'size': '55m²',
-                        'capacity': 2,
-                        'beds': 'king'
-                    },
-                    {
-                        'id': 4,
-                        'name': 'Deluxe Double Room',
-                        'price': 350000,
-                        'currency': 'TZS',
-                        'category': 'deluxe',
-                        'image': 'room2.jpg',
-                        'size': '40m²',
-                        'capacity': 2,
-                        'beds': 'double'
-                    },
-                    {
-                        'id': 5,
-                        'name': 'Premium Garden View',
-                        'price': 320000,
-                        'currency': 'TZS',
-                        'category': 'superior',
-                        'image': 'room5.JPG',
-                        'size': '32m²',
-                        'capacity': 3,
-                        'beds': 'double'
-                    }
-                ]
+                rooms_data = FALLBACK_ROOMS
         except Exception as e:
             print(f"Error fetching rooms: {e}")
             # Use fallback data if API service fails
-            rooms_data = [
-                {
-                    'id': 1,
-                    'name': 'Classic Balcony Room',
-                    'price': 299000,
-                    'currency': 'TZS',
-                    'category': 'classic',
-                    'image': 'Room.jpg',
-                    'size': '30m²',
-                    'capacity': 3,
-                    'beds': 'balcony'
-                },
-                {
-                    'id': 2,
-                    'name': 'Superior Double Room',
-                    'price': 399000,
-                    'currency': 'TZS',
-                    'category': 'superior',
-                    'image': 'room1.jpg',
-                    'size': '35m²',
-                    'capacity': 3,
-                    'beds': 'double'
-                },
-                {
-                    'id': 3,
-                    'name': 'Executive Master Suite',
-                    'price': 450000,
-                    'currency': 'TZS',
-                    'category': 'executive',
-                    'image': 'room3.jpg',
-                    'size': '55m²',
-                    'capacity': 2,
-                    'beds': 'king'
-                },
-                {
-                    'id': 4,
-                    'name': 'Deluxe Double Room',
-                    'price': 350000,
-                    'currency': 'TZS',
-                    'category': 'deluxe',
-                    'image': 'room2.jpg',
-                    'size': '40m²',
-                    'capacity': 2,
-                    'beds': 'double'
-                },
-                {
-                    'id': 5,
-                    'name': 'Premium Garden View',
-                    'price': 320000,
-                    'currency': 'TZS',
-                    'category': 'superior',
-                    'image': 'room5.JPG',
-                    'size': '32m²',
-                    'capacity': 3,
-                    'beds': 'double'
-                }
-            ]
+            rooms_data = FALLBACK_ROOMS
         
+        if api_service.is_current_inventory(rooms_data):
+            set_cache_tags(inventory_tags(rooms_data))
         return render_template('index.html', rooms=rooms_data)
     
     @app.route('/room_detail/<int:room_id>')
@@ -228,16 +343,20 @@ def create_app(config_name=None):
         """Render individual room detail page"""
         try:
             rooms_data = api_service.get_available_rooms()
-            room = next((r for r in rooms_data if r['id'] == room_id), None)
+            room = rooms_data.get(room_id)
             
             if not room:
                 flash('Room not found', 'error')
                 return redirect(url_for('index'))
             
             # Get similar rooms (same category, excluding current room)
-            similar_rooms = [r for r in rooms_data if r['category'] == room['category'] and r['id'] != room_id][:3]
+            similar_rooms = [r for r in rooms_data if r.category == room.category and r.id != room_id][:3]
             
+            if api_service.is_current_inventory(rooms_data):
+                set_cache_tags(room_tags(room))
             return render_template('room_detail.html', room=room, similar_rooms=similar_rooms)
+        except HMSOverloadedError:
+            raise
         except Exception as e:
             flash(f'Error loading room details: {str(e)}', 'error')
             return redirect(url_for('index'))
@@ -299,7 +418,11 @@ def create_app(config_name=None):
         """Render rooms page with dynamic room data"""
         try:
             rooms_data = api_service.get_available_rooms()
+            if api_service.is_current_inventory(rooms_data):
+                set_cache_tags(inventory_tags(rooms_data))
             return render_template('rooms.html', rooms=rooms_data)
+        except HMSOverloadedError:
+            raise
         except Exception as e:
             flash(f'Error loading rooms: {str(e)}', 'error')
             return render_template('rooms.html', rooms=[])
@@ -321,24 +444,208 @@ def create_app(config_name=None):
                 'special_requests': request.form.get('special_requests', '')
             }
             
+            room_id = str(booking_data['room_id'] or '')
+            track('book_submit', room_id)
+            
             # Validate required fields
-            required_fields = ['guest_name', 'guest_email', 'guest_phone', 'room_id', 'room_type', 'check_in', 'check_out']
-            for field in required_fields:
+            for field in BOOKING_REQUIRED_FIELDS:
                 if not booking_data.get(field):
+                    track('book_failure', room_id, 'invalid')
                     return jsonify({'success': False, 'message': f'{field} is required'}), 400
             
+            stay, error = validate_stay(room_id, booking_data['check_in'], booking_data['check_out'])
+            if stay is None:
+                track('book_failure', room_id, 'invalid')
+                return jsonify({'success': False, 'message': error}), 400
+            
+            # Reuse the hold placed when the room was selected, or take one now
+            hold = holds.get(request.form.get('hold_id', ''))
+            if hold is None or (hold.room_id, hold.check_in, hold.check_out, hold.status) != (
+                    room_id, stay[0].toordinal(), stay[1].toordinal(), 'held'):
+                try:
+                    hold = holds.acquire(room_id, *stay)
+                except HoldConflictError as e:
+                    track('book_failure', room_id, 'hold_conflict')
+                    return hold_conflict_response(e)
+            
             # Create booking via API
-            result = api_service.create_booking(booking_data)
+            try:
+                result = api_service.create_booking(booking_data)
+            except BaseException:
+                holds.release(hold.hold_id)
+                raise
+            settle_hold(hold, result)
             
             if result.get('success'):
+                # A mock fallback in live mode told the guest they booked when the HMS did not
+                fell_back = result.get('mock') and not api_service.mock_mode
+                track('book_mock_fallback' if fell_back else 'book_success', room_id)
                 flash('Booking created successfully! Your booking ID is: ' + result.get('booking_id', ''), 'success')
                 return jsonify({'success': True, 'booking_id': result.get('booking_id')})
             else:
+                track('book_failure', room_id, 'rejected')
                 return jsonify({'success': False, 'message': result.get('message', 'Booking failed')}), 400
                 
+        except HMSOverloadedError:
+            track('book_failure', request.form.get('room_id'), 'overloaded')
+            raise
         except Exception as e:
+            track('book_failure', request.form.get('room_id'), type(e).__name__)
             return jsonify({'success': False, 'message': str(e)}), 500
     
+    @app.route('/api/bookings/batch', methods=['POST'])
+    def create_booking_batch():
+        """Handle a group booking (tour operators, corporate groups)
+        
+        Body: {"bookings": [...], "all_or_nothing": bool, plus optional shared
+        guest_name/guest_email/guest_phone applied to items that omit them}.
+        """
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'message': 'Body must be a JSON object'}), 400
+        items = data.get('bookings')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'message': 'bookings must be a non-empty list'}), 400
+        if len(items) > app.config['BATCH_BOOKING_MAX_ITEMS']:
+            return jsonify({'success': False, 'message': f"At most {app.config['BATCH_BOOKING_MAX_ITEMS']} bookings per group"}), 400
+        
+        shared = {field: data[field] for field in ('guest_name', 'guest_email', 'guest_phone') if data.get(field)}
+        items = [{**shared, **item} if isinstance(item, dict) else item for item in items]
+        
+        # Validate the whole group before anything reaches the HMS
+        bookings, errors = validate_booking_group(items)
+        if errors:
+            return jsonify({
+                'success': False,
+                'message': 'Some bookings are invalid',
+                'errors': [{'index': index, 'message': message} for index, message in sorted(errors.items())]
+            }), 400
+        
+        # Hold every room first; any clash rejects the group without an HMS call
+        group_holds, conflicts = [], []
+        for index, booking in enumerate(bookings):
+            try:
+                group_holds.append(holds.acquire(booking['room_id'], *parse_stay(booking['check_in'], booking['check_out'])))
+            except HoldConflictError as e:
+                conflicts.append({'index': index, 'message': str(e)})
+        if conflicts:
+            for hold in group_holds:
+                holds.release(hold.hold_id)
+            return jsonify({'success': False, 'message': 'Some rooms are being booked by other guests', 'errors': conflicts}), 409
+        
+        try:
+            all_or_nothing = bool(data.get('all_or_nothing', False))
+            result = api_service.create_bookings_batch(
+                bookings,
+                all_or_nothing=all_or_nothing,
+                max_workers=app.config['BATCH_BOOKING_MAX_WORKERS']
+            )
+        except Exception as e:
+            for hold in group_holds:
+                holds.release(hold.hold_id)
+            return jsonify({'success': False, 'message': str(e)}), 500
+        
+        for hold, item in zip(group_holds, result['results']):
+            # An unknown outcome may still be a booking at the HMS, so keep the room blocked
+            if item['status'] in ('confirmed', 'unknown'):
+                holds.confirm(hold.hold_id)
+            else:
+                holds.release(hold.hold_id)
+        
+        if result['success']:
+            return jsonify(result)
+        # 409 when an all-or-nothing group was rolled back, 207 for partial success
+        return jsonify(result), 409 if all_or_nothing else 207
+    
+    @app.route('/api/holds', methods=['POST'])
+    def create_hold():
+        """Hold a room for the selected dates while the guest completes the booking form
+        
+        Body (JSON or form): room_id, check_in, check_out. The returned hold_id
+        can be submitted with /book; 400 for unknown rooms, past dates or stays
+        outside MIN_BOOKING_DAYS-MAX_BOOKING_DAYS, 409 when the room is already held.
+        """
+        data = request.get_json(silent=True) or request.form
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'message': 'Body must be a JSON object'}), 400
+        room_id = data.get('room_id')
+        if room_id is not None and not isinstance(room_id, (str, int)):
+            return jsonify({'success': False, 'message': 'room_id must be a string or number'}), 400
+        stay, error = validate_stay(room_id, data.get('check_in'), data.get('check_out'))
+        if stay is None:
+            return jsonify({'success': False, 'message': error}), 400
+        try:
+            hold = holds.acquire(room_id, *stay)
+        except HoldConflictError as e:
+            return hold_conflict_response(e)
+        return jsonify({'success': True, 'hold': hold.to_dict()}), 201
+    
+    @app.route('/api/holds/<hold_id>', methods=['DELETE'])
+    def release_hold(hold_id):
+        """Release a hold when the guest changes room or dates"""
+        # Confirmed holds stay until they expire; they stand in for the booking until the HMS shows it
+        hold = holds.get(hold_id)
+        if hold is None or hold.status != 'held' or not holds.release(hold_id):
+            return jsonify({'success': False, 'message': 'Hold not found or expired'}), 404
+        return jsonify({'success': True})
+    
+    @app.route('/api/events', methods=['POST'])
+    def record_funnel_events():
+        """Record browser-side funnel steps (room and date selection)
+        
+        Body: {"visitor": id, "events": [{"stage": ..., "room_id": ...}]}, sent
+        with navigator.sendBeacon. Server-side stages cannot be reported here.
+        """
+        if funnel is None:
+            return '', 204
+        data = request.get_json(force=True, silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('events'), list):
+            return jsonify({'success': False, 'message': 'events must be a list'}), 400
+        visitor = str(data.get('visitor') or '')[:64] or None
+        accepted = 0
+        for event in data['events'][:20]:
+            if isinstance(event, dict) and event.get('stage') in CLIENT_STAGES:
+                room_id = event.get('room_id')
+                funnel.record(event['stage'], str(room_id)[:32] if room_id else None, visitor)
+                accepted += 1
+        if not accepted:
+            return jsonify({'success': False, 'message': f"stage must be one of {', '.join(sorted(CLIENT_STAGES))}"}), 400
+        return '', 204
+    
+    @app.route('/api/funnel')
+    def funnel_counts():
+        """Funnel counts and stage-to-stage conversion over the last `hours` (default 24)"""
+        if funnel is None:
+            return jsonify({'success': False, 'message': 'Funnel events are disabled'}), 404
+        # Closed unless FUNNEL_API_TOKEN is configured, like header-triggered profiles
+        token = app.config['FUNNEL_API_TOKEN']
+        if not token:
+            return jsonify({'success': False, 'message': 'Not found'}), 404
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+        try:
+            hours = float(request.args.get('hours', 24))
+        except ValueError:
+            hours = None
+        if hours is None or not math.isfinite(hours) or hours < 0:
+            return jsonify({'success': False, 'message': 'hours must be a non-negative number'}), 400
+        try:
+            funnel.flush()  # Include this worker's buffered events; other workers lag by at most one flush interval
+        except sqlite3.Error as e:
+            print(f"Funnel events flush failed, reporting flushed events only: {e}")
+        try:
+            counts = funnel.counts(since=time.time() - hours * 3600)
+        except sqlite3.Error as e:
+            print(f"Funnel counts failed: {e}")
+            return jsonify({'success': False, 'message': 'Funnel counts are temporarily unavailable'}), 503
+        return jsonify({
+            'success': True,
+            'hours': hours,
+            'stages': funnel_report(counts),
+            'dropped': funnel.dropped
+        })
+    
     @app.route('/booking-success/<booking_id>')
     def booking_success(booking_id):
         """Render booking success page"""
@@ -361,14 +668,38 @@ def create_app(config_name=None):
         return render_template('project-detail.html')
     
     # Blog routes
+    def blog_page_args():
+        """Read page/per_page query parameters with sane bounds"""
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(50, max(1, request.args.get('per_page', app.config['BLOG_PAGE_SIZE'], type=int)))
+        return page, per_page
+    
     @app.route('/blog')
     def blog():
-        """Render the blog grid page"""
-        return render_template('news-grid.html')
+        """Render the blog listing, or the static news grid until posts exist"""
+        if not len(blog_store):
+            return render_template('news-grid.html')
+        page, per_page = blog_page_args()
+        tag = request.args.get('tag')
+        posts, total = blog_store.list_posts(page, per_page, tag=tag)
+        return render_template('blog.html', posts=posts, page=page,
+                               pages=max(1, -(-total // per_page)), tag=tag, query=None)
+    
+    @app.route('/blog/search')
+    def blog_search():
+        """Render blog search results"""
+        page, per_page = blog_page_args()
+        query = request.args.get('q', '').strip()
+        posts, total = blog_store.search(query, page, per_page)
+        return render_template('blog.html', posts=posts, page=page,
+                               pages=max(1, -(-total // per_page)), tag=None, query=query)
     
     @app.route('/blog/<post_type>')
     def blog_post(post_type):
-        """Render different blog post types"""
+        """Render a blog post by slug, or one of the legacy blog post types"""
+        post = blog_store.get_post(post_type)
+        if post:
+            return render_template('blog-post.html', post=post)
         if post_type == 'image':
             return render_template('post-image.html')
         elif post_type == 'gallery':
@@ -380,13 +711,99 @@ def create_app(config_name=None):
         else:
             return render_template('post-gallery.html')
     
+    @app.route('/api/blog/posts')
+    def api_blog_posts():
+        """API endpoint to list blog posts, newest first"""
+        page, per_page = blog_page_args()
+        posts, total = blog_store.list_posts(page, per_page, tag=request.args.get('tag'))
+        return jsonify({'success': True, 'posts': [post.to_dict() for post in posts],
+                        'page': page, 'per_page': per_page, 'total': total})
+    
+    @app.route('/api/blog/posts/<slug>')
+    def api_blog_post(slug):
+        """API endpoint to get one blog post with its rendered HTML"""
+        post = blog_store.get_post(slug)
+        if not post:
+            return jsonify({'success': False, 'message': 'Post not found'}), 404
+        return jsonify({'success': True, 'post': post.to_dict(include_html=True)})
+    
+    @app.route('/api/blog/search')
+    def api_blog_search():
+        """API endpoint for ranked full-text blog search"""
+        page, per_page = blog_page_args()
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'message': 'q is required'}), 400
+        posts, total = blog_store.search(query, page, per_page)
+        return jsonify({'success': True, 'query': query, 'posts': [post.to_dict() for post in posts],
+                        'page': page, 'per_page': per_page, 'total': total})
+    
     # API endpoints for AJAX calls
     @app.route('/api/rooms')
     def api_rooms():
-        """API endpoint to get rooms data"""
+        """API endpoint to get rooms data
+        
+        Without parameters returns every room. Supports category (comma list),
+        min_price, max_price, capacity, available, sort (price, capacity, name,
+        id; prefix - for descending), limit, cursor and fields. Queries are
+        answered from indexes built once per inventory version.
+        """
         try:
             rooms_data = api_service.get_available_rooms()
-            return jsonify({'success': True, 'rooms': rooms_data})
+            etag = query_etag(rooms_data.version, request.args) if request.args else rooms_data.version
+            if request.if_none_match.contains(etag):
+                response = app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+            
+            if request.args:
+                query, fields = parse_room_query(request.args)
+                rooms, total, next_key = get_room_index(rooms_data).query(**query)
+                body = render_room_page(rooms, total, next_key, rooms_data.version, fields)
+            else:
+                # Write the inventory's pre-serialized JSON instead of re-encoding it
+                body = rooms_data.json_bytes
+            
+            response = app.response_class(body, mimetype='application/json')
+            response.set_etag(etag)
+            if api_service.is_current_inventory(rooms_data):
+                set_cache_tags(inventory_tags(rooms_data))
+            return response
+        except RoomQueryError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        except HMSOverloadedError:
+            raise
+        except Exception as e:
+            return jsonify({'success': False, 'message': str(e)}), 500
+    
+    @app.route('/api/quote')
+    def api_quote():
+        """Quote a stay for every room, or the rooms in room_id (repeated or comma list)
+        
+        Takes check_in and check_out (YYYY-MM-DD). Totals include seasonal and
+        weekend rates and the length-of-stay discount, in TZS and USD. Rooms
+        without a price are listed with quotable false.
+        """
+        try:
+            check_in, check_out, room_ids = parse_quote_request(request.args)
+            rooms_data = api_service.get_available_rooms() or FALLBACK_ROOMS
+            tzs_per_usd = exchange_rates.tzs_per_usd()
+            nights, discount, quotes = get_rate_calendar(rooms_data, pricing_rules, tzs_per_usd).quote(
+                check_in, check_out, room_ids, tzs_per_usd
+            )
+            return jsonify({
+                'success': True,
+                'check_in': check_in.isoformat(),
+                'check_out': check_out.isoformat(),
+                'nights': nights,
+                'stay_discount': discount,
+                'tzs_per_usd': tzs_per_usd,
+                'quotes': quotes
+            })
+        except PricingError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        except HMSOverloadedError:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'message': str(e)}), 500
     
@@ -1,6 +1,7 @@
 import os
-import time
-from threading import Lock, Thread
+from threading import Lock
+from scheduler import get_scheduler
+from tracing import span
 
 try:
     import requests
@@ -37,6 +38,11 @@ class HMSAuthService:
         
         # Auto-refresh buffer (refresh 5 minutes before expiry)
         self.refresh_buffer_minutes = 5
+        # Workers spread their refreshes over this many seconds after the refresh point
+        self.refresh_jitter_seconds = float(os.getenv('HMS_TOKEN_REFRESH_JITTER', 30))
+        # Tokens living no longer than the buffer are due at once; never re-authenticate more often than this
+        self.min_refresh_interval = 30
+        self.refresh_job = None
         
         # Verification: Check if we should use real HMS or mock mode
         self.should_use_real_hms = self._verify_production_credentials()
@@ -194,9 +200,10 @@ class HMSAuthService:
         # Check if we need to authenticate or refresh
         if not self._is_token_valid():
             print("Token invalid or expired, re-authenticating...")
-            if not self.authenticate():
-                print("Authentication failed, using mock token")
-                self._create_mock_token()
+            with span('auth', desc='token refresh'):
+                if not self.authenticate():
+                    print("Authentication failed, using mock token")
+                    self._create_mock_token()
         
         return self.jwt_token
     
@@ -232,24 +239,36 @@ class HMSAuthService:
         with self.auth_lock:
             self.jwt_token = None
             self.token_expires_at = None
-        return self.authenticate()
+        with span('auth', desc='forced token refresh'):
+            return self.authenticate()
+    
+    def seconds_until_refresh(self):
+        """Seconds until refresh_buffer_minutes before the token expires (0 if already due)"""
+        if not self.token_expires_at:
+            return 0.0
+        refresh_time = self.token_expires_at - timedelta(minutes=self.refresh_buffer_minutes)
+        return max(0.0, (refresh_time - datetime.now()).total_seconds())
+    
+    def _scheduled_refresh(self):
+        """Scheduler job: refresh if due, then return the delay until the next refresh"""
+        if not self._is_token_valid():
+            print("Background refresh: Re-authenticating...")
+            if not self.authenticate():
+                print(f"Background refresh failed, retrying in {self.retry_delay * 15}s")
+                return self.retry_delay * 15
+        return max(self.min_refresh_interval, self.seconds_until_refresh())
     
     def start_background_refresh(self):
-        """Start background thread to automatically refresh token"""
-        def refresh_worker():
-            while True:
-                try:
-                    time.sleep(60)  # Check every minute
-                    if not self._is_token_valid():
-                        print("Background refresh: Re-authenticating...")
-                        self.authenticate()
-                except Exception as e:
-                    print(f"Background refresh error: {e}")
-                    time.sleep(30)  # Wait before retry
-        
-        refresh_thread = Thread(target=refresh_worker, daemon=True)
-        refresh_thread.start()
-        print("Background token refresh thread started")
+        """Schedule token refresh for refresh_buffer_minutes before expiry on the shared scheduler"""
+        if self.refresh_job is not None and not self.refresh_job.cancelled:
+            return
+        self.refresh_job = get_scheduler().schedule(
+            self._scheduled_refresh,
+            delay=self.seconds_until_refresh(),
+            jitter=self.refresh_jitter_seconds,
+            name='hms-token-refresh'
+        )
+        print(f"Token refresh scheduled in {self.seconds_until_refresh():.0f}s")
     
     def initialize_on_startup(self):
         """Initialize authentication on application startup"""
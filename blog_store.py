@@ -0,0 +1,263 @@
+import heapq
+import html
+import json
+import math
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import date
+from threading import Lock
+
+try:
+    import markdown as markdown_lib
+    MARKDOWN_AVAILABLE = True
+except ImportError:
+    MARKDOWN_AVAILABLE = False
+    print("Warning: markdown module not available. Using basic blog post rendering.")
+
+# Search ranking: BM25 parameters and per-field weights
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {'title': 3, 'tags': 2, 'summary': 1, 'body': 1}
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'was', 'we', 'with', 'you', 'your'
+))
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_LIST_ITEM_RE = re.compile(r'^\s*[-*]\s+')
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass(frozen=True, slots=True)
+class BlogPost:
+    """A parsed blog post with its HTML rendered once at load time"""
+
+    slug: str
+    title: str
+    date: date
+    author: str
+    tags: tuple
+    summary: str
+    image: str
+    html: str
+    source: str
+
+    def to_dict(self, include_html=False):
+        data = {
+            'slug': self.slug,
+            'title': self.title,
+            'date': self.date.isoformat(),
+            'author': self.author,
+            'tags': list(self.tags),
+            'summary': self.summary,
+            'image': self.image
+        }
+        if include_html:
+            data['html'] = self.html
+        return data
+
+
+def render_markdown(text):
+    """Render Markdown to HTML, with a basic fallback when the markdown package is missing"""
+    if MARKDOWN_AVAILABLE:
+        return markdown_lib.markdown(text, extensions=['extra'])
+
+    def inline(line):
+        line = html.escape(line)
+        line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
+        line = re.sub(r'\*(.+?)\*', r'<em>\1</em>', line)
+        line = re.sub(r'`(.+?)`', r'<code>\1</code>', line)
+        return re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', line)
+
+    blocks = []
+    for block in re.split(r'\n\s*\n', text.strip()):
+        lines = block.strip().splitlines()
+        if not lines:
+            continue
+        heading = re.match(r'(#{1,6})\s+(.*)', lines[0])
+        if heading and len(lines) == 1:
+            level = len(heading.group(1))
+            blocks.append(f'<h{level}>{inline(heading.group(2))}</h{level}>')
+        elif all(_LIST_ITEM_RE.match(line) for line in lines):
+            items = ''.join(f'<li>{inline(_LIST_ITEM_RE.sub("", line))}</li>' for line in lines)
+            blocks.append(f'<ul>{items}</ul>')
+        else:
+            blocks.append(f'<p>{inline(" ".join(lines))}</p>')
+    return '\n'.join(blocks)
+
+
+def _text_field(meta, key, default=''):
+    """A string metadata field; missing or null falls back to default"""
+    value = meta.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f'{key} must be a string')
+    return value
+
+
+def _tags_field(meta):
+    tags = meta.get('tags')
+    if tags is None:
+        return ()
+    if isinstance(tags, str):
+        return tuple(tag.strip() for tag in tags.split(',') if tag.strip())
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError('tags must be a list of strings or a comma-separated string')
+    return tuple(tags)
+
+
+def parse_post_file(path):
+    """Parse a Markdown (front matter) or JSON post file into a BlogPost"""
+    with open(path, encoding='utf-8') as f:
+        raw = f.read()
+
+    slug = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith('.json'):
+        meta = json.loads(raw)
+        if not isinstance(meta, dict):
+            raise ValueError('JSON post must be an object')
+        body = _text_field(meta, 'body')
+    else:
+        meta, body = {}, raw
+        match = re.match(r'---\s*\n(.*?)\n---\s*\n', raw, re.S)
+        if match:
+            for line in match.group(1).splitlines():
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    meta[key.strip()] = value.strip()
+            body = raw[match.end():]
+
+    body_text = body.strip()
+    summary = _text_field(meta, 'summary') or re.sub(r'[#*`\[\]]', '', body_text.split('\n\n')[0])[:200]
+    return BlogPost(
+        slug=_text_field(meta, 'slug', slug),
+        title=_text_field(meta, 'title', slug.replace('-', ' ').title()),
+        date=date.fromisoformat(str(meta.get('date', '1970-01-01'))),
+        author=_text_field(meta, 'author', 'Ngenda Hotel'),
+        tags=_tags_field(meta),
+        summary=summary,
+        image=_text_field(meta, 'image'),
+        html=render_markdown(body_text),
+        source=body_text
+    )
+
+
+class _BlogSnapshot:
+    """Immutable posts + inverted index; replaced wholesale when files change"""
+
+    def __init__(self, posts):
+        # Newest first for listings
+        self.posts = tuple(sorted(posts, key=lambda post: (post.date, post.slug), reverse=True))
+        self.by_slug = {post.slug: post for post in self.posts}
+
+        # term -> {post position: weighted term frequency}
+        self.index = {}
+        self.lengths = []
+        for position, post in enumerate(self.posts):
+            fields = {'title': post.title, 'tags': ' '.join(post.tags),
+                      'summary': post.summary, 'body': post.source}
+            length = 0
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    postings = self.index.setdefault(token, {})
+                    postings[position] = postings.get(position, 0) + weight
+                    length += weight
+            self.lengths.append(length)
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0
+
+
+class BlogStore:
+    """Blog posts loaded from Markdown/JSON files, re-parsed only when files change"""
+
+    def __init__(self, content_dir, reload_interval=5):
+        self.content_dir = content_dir
+        self.reload_interval = reload_interval
+        self._snapshot = _BlogSnapshot(())
+        self._files = {}  # path -> (mtime, BlogPost)
+        self._checked_at = 0
+        self._lock = Lock()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Reload changed post files; cheap when nothing changed"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                entries = {
+                    entry.path: entry.stat().st_mtime
+                    for entry in os.scandir(self.content_dir)
+                    if entry.is_file() and entry.name.endswith(('.md', '.json'))
+                }
+            except FileNotFoundError:
+                entries = {}
+
+            if {path: mtime for path, (mtime, _) in self._files.items()} == entries:
+                return
+
+            files = {}
+            for path, mtime in entries.items():
+                cached = self._files.get(path)
+                if cached and cached[0] == mtime:
+                    files[path] = cached
+                    continue
+                try:
+                    files[path] = (mtime, parse_post_file(path))
+                except (OSError, ValueError) as e:
+                    print(f"Skipping blog post {path}: {e}")
+
+            self._files = files
+            self._snapshot = _BlogSnapshot(post for _, post in files.values())
+            print(f"Loaded {len(self._snapshot.posts)} blog posts from {self.content_dir}")
+
+    def __len__(self):
+        self.refresh()
+        return len(self._snapshot.posts)
+
+    def get_post(self, slug):
+        self.refresh()
+        return self._snapshot.by_slug.get(slug)
+
+    def list_posts(self, page=1, per_page=9, tag=None):
+        """Return (posts, total) for one page of the newest-first listing"""
+        self.refresh()
+        posts = self._snapshot.posts
+        if tag:
+            posts = [post for post in posts if tag in post.tags]
+        start = (page - 1) * per_page
+        return posts[start:start + per_page], len(posts)
+
+    def search(self, query, page=1, per_page=9):
+        """BM25-ranked search over title, tags, summary and body; returns (posts, total)"""
+        self.refresh()
+        snapshot = self._snapshot
+        terms = set(tokenize(query))
+        if not terms or not snapshot.posts:
+            return [], 0
+
+        scores = {}
+        count = len(snapshot.posts)
+        for term in terms:
+            postings = snapshot.index.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in postings.items():
+                norm = 1 - BM25_B + BM25_B * snapshot.lengths[position] / snapshot.average_length
+                scores[position] = scores.get(position, 0) + idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+
+        # Only rank as far as the requested page; ties go to the newer (lower position) post
+        start = (page - 1) * per_page
+        ranked = heapq.nsmallest(start + per_page, scores, key=lambda position: (-scores[position], position))
+        return [snapshot.posts[position] for position in ranked[start:]], len(scores)
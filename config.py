@@ -1,5 +1,7 @@
 import os
 
+basedir = os.path.abspath(os.path.dirname(__file__))
+
 class Config:
     """Configuration class for Ngenda Hotel Flask Application"""
     
@@ -29,6 +31,46 @@ class Config:
     STATIC_FOLDER = 'static'
     TEMPLATES_FOLDER = 'templates'
     
+    # Template Configuration
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR') or os.path.join(basedir, '.jinja_cache')  # Bytecode cache
+    TEMPLATE_PRELOAD = os.environ.get('TEMPLATE_PRELOAD', 'False').lower() in ['true', 'on', '1']  # Load all at startup
+    
+    # Profiling Configuration (all off by default)
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(basedir, 'profiles')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))  # Per kind; oldest are deleted
+    PROFILE_ALL_REQUESTS = os.environ.get('PROFILE_ALL_REQUESTS', 'False').lower() in ['true', 'on', '1']
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')  # Enables header-triggered profiles when set
+    PROFILE_HEADER = 'X-Profile'  # Must carry PROFILE_TOKEN
+    PROFILE_ENGINE = os.environ.get('PROFILE_ENGINE', 'cprofile')  # or pyinstrument (speedscope output)
+    STACK_SAMPLER_ENABLED = os.environ.get('STACK_SAMPLER_ENABLED', 'False').lower() in ['true', 'on', '1']
+    STACK_SAMPLER_INTERVAL = float(os.environ.get('STACK_SAMPLER_INTERVAL', 0.1))  # seconds between samples
+    STACK_SAMPLER_FLUSH_INTERVAL = int(os.environ.get('STACK_SAMPLER_FLUSH_INTERVAL', 60))  # seconds per file
+    
+    # Offline Support Configuration
+    SERVICE_WORKER_ENABLED = os.environ.get('SERVICE_WORKER_ENABLED', 'True').lower() in ['true', 'on', '1']
+    BUILD_ID = os.environ.get('BUILD_ID', '')  # Set by deploy-production.sh; part of the cache version
+    SERVICE_WORKER_SHELL_TEMPLATE = 'base.html'  # Static files it references are precached
+    SERVICE_WORKER_ROUTES = ['/', '/about', '/faq', '/gallery', '/services']  # Precached, cache-first
+    SERVICE_WORKER_NETWORK_FIRST = ['/api/rooms']
+    SERVICE_WORKER_NETWORK_TIMEOUT = 3  # seconds before a network-first request falls back to cache
+    SERVICE_WORKER_API_MAX_AGE = 600  # seconds a cached /api/rooms response may be served
+    SERVICE_WORKER_THEME_COLOR = '#c19b76'  # skin-1 primary
+    
+    # Early Hints Configuration (103 is sent where the server exposes environ['wsgi.early_hints'])
+    EARLY_HINTS_ENABLED = os.environ.get('EARLY_HINTS_ENABLED', 'True').lower() in ['true', 'on', '1']
+    EARLY_HINTS_MAX_ASSETS = 32  # Preloads per page, stylesheets first
+    EARLY_HINTS_SCRIPTS = True  # Also preload the deferred scripts at the end of base.html
+    
+    # Static Export Configuration (flask export-static; room and blog pages are added automatically)
+    STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR') or os.path.join(basedir, 'static_export')
+    STATIC_EXPORT_ROUTES = ['/about', '/gallery', '/services', '/faq', '/room-detail', '/project-detail',
+                            '/service-details']
+    
+    # Blog Configuration
+    BLOG_CONTENT_DIR = os.environ.get('BLOG_CONTENT_DIR') or os.path.join(basedir, 'content', 'blog')
+    BLOG_PAGE_SIZE = 9
+    BLOG_RELOAD_INTERVAL = 5  # seconds between checks for changed post files
+    
     # Hotel Specific Settings
     HOTEL_NAME = 'Ngenda Hotel'
     HOTEL_LOCATION = 'Mbeya, Tanzania'
@@ -39,10 +81,86 @@ class Config:
     MIN_BOOKING_DAYS = 1
     MAX_BOOKING_DAYS = 30
     
+    # Pricing Configuration (base price is each room's HMS nightly price in TZS)
+    PRICING_SEASONS = [
+        {'name': 'holidays', 'start': '12-15', 'end': '01-05', 'multiplier': 1.25},
+        {'name': 'dry season', 'start': '06-15', 'end': '09-30', 'multiplier': 1.15},
+        {'name': 'long rains', 'start': '04-01', 'end': '05-31', 'multiplier': 0.85}
+    ]
+    PRICING_WEEKEND_MULTIPLIER = 1.10
+    PRICING_WEEKEND_NIGHTS = (4, 5)  # Friday and Saturday nights
+    PRICING_STAY_DISCOUNTS = {7: 0.10, 14: 0.15, 28: 0.20}  # Nights reached: discount
+    PRICING_HORIZON_DAYS = 365  # How far ahead check_in can be quoted
+    EXCHANGE_RATE_TZS_PER_USD = float(os.environ.get('EXCHANGE_RATE_TZS_PER_USD', 2650))
+    EXCHANGE_RATE_URL = os.environ.get('EXCHANGE_RATE_URL')  # USD-based {"rates": {"TZS": ...}} feed, optional
+    EXCHANGE_RATE_TTL = 3600  # seconds
+    
+    # Group Booking Configuration
+    BATCH_BOOKING_MAX_ITEMS = int(os.environ.get('BATCH_BOOKING_MAX_ITEMS', 20))
+    BATCH_BOOKING_MAX_WORKERS = int(os.environ.get('BATCH_BOOKING_MAX_WORKERS', 4))  # Concurrent HMS POSTs per group
+    
+    # Reservation Hold Configuration
+    HOLDS_BACKEND = os.environ.get('HOLDS_BACKEND', 'memory')  # or sqlite:///path to share across workers
+    HOLD_TTL_SECONDS = int(os.environ.get('HOLD_TTL_SECONDS', 300))  # While the guest fills in the booking form
+    HOLD_CONFIRMED_TTL = int(os.environ.get('HOLD_CONFIRMED_TTL', 900))  # Until the HMS inventory shows the booking
+    
     # API Configuration
     API_TIMEOUT = 30  # seconds
     API_RETRY_ATTEMPTS = 3
     
+    # Admission Control Configuration
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() in ['true', 'on', '1']
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # or sqlite:///path to share across workers
+    RATE_LIMIT_TRUST_PROXY = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'False').lower() in ['true', 'on', '1']
+    RATE_LIMIT_PRUNE_INTERVAL = 300  # Seconds between deleting refilled buckets from the sqlite backend
+    RATE_LIMITS = {
+        # endpoint: token bucket per client IP (methods limits which requests count)
+        'create_booking': {'per_minute': 10, 'burst': 5},
+        'create_booking_batch': {'per_minute': 2, 'burst': 2},
+        'create_hold': {'per_minute': 10, 'burst': 5},
+        'record_funnel_events': {'per_minute': 60, 'burst': 20},
+        'contact': {'per_minute': 2, 'burst': 3, 'methods': ['POST']},
+        'api_rooms': {'per_minute': 120, 'burst': 30}
+    }
+    HMS_MAX_CONCURRENT_CALLS = int(os.environ.get('HMS_MAX_CONCURRENT_CALLS', 8))  # Per worker
+    HMS_ADMISSION_TIMEOUT = float(os.environ.get('HMS_ADMISSION_TIMEOUT', 0.5))  # Seconds to wait for a slot before 503
+    
+    # Live Room Availability Configuration
+    INVENTORY_REFRESH_INTERVAL = int(os.environ.get('INVENTORY_REFRESH_INTERVAL', 30))  # Seconds between HMS room polls, 0 disables
+    ROOM_STREAM_ENABLED = os.environ.get('ROOM_STREAM_ENABLED', 'True').lower() in ['true', 'on', '1']
+    ROOM_STREAM_HEARTBEAT = 15  # Seconds between keepalive comments
+    ROOM_STREAM_MAX_SECONDS = 600  # Streams are recycled; browsers resume with Last-Event-ID
+    ROOM_STREAM_MAX_CLIENTS = int(os.environ.get('ROOM_STREAM_MAX_CLIENTS', 10000))  # Per process
+    ROOM_STREAM_HISTORY = 256  # Events kept for reconnecting browsers
+    ROOM_STREAM_MAX_CHANGES = 500  # Larger changes send a reset (reload the list) instead of every room
+    
+    # HTTP Cache Configuration (caching reverse proxy in front of the app)
+    HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', 'True').lower() in ['true', 'on', '1']
+    HTTP_CACHE_RULES = {'index': 300, 'rooms': 300, 'room_detail': 300, 'api_rooms': 60}  # endpoint: s-maxage seconds
+    HTTP_CACHE_BROWSER_MAX_AGE = 0  # Browsers revalidate; the proxy keeps pages until purged or s-maxage
+    CACHE_TAG_HEADER = os.environ.get('CACHE_TAG_HEADER', 'Surrogate-Key')  # Cache-Tag for Cloudflare, xkey for Varnish
+    CACHE_PURGE_URL = os.environ.get('CACHE_PURGE_URL')  # Purges are sent here with the tags in CACHE_TAG_HEADER
+    CACHE_PURGE_METHOD = os.environ.get('CACHE_PURGE_METHOD', 'PURGE')
+    CACHE_PURGE_TOKEN = os.environ.get('CACHE_PURGE_TOKEN')  # Sent as a Bearer token, optional
+    CACHE_PURGE_DELAY = 1.0  # Seconds to collect tags into one purge
+    CACHE_PURGE_BATCH = 256  # Tags per purge request
+    
+    # Booking Funnel Configuration
+    FUNNEL_EVENTS_ENABLED = os.environ.get('FUNNEL_EVENTS_ENABLED', 'True').lower() in ['true', 'on', '1']
+    FUNNEL_EVENTS_DB = os.environ.get('FUNNEL_EVENTS_DB') or os.path.join(basedir, 'funnel_events.db')  # Shared by all workers
+    FUNNEL_BUFFER_SIZE = 10000  # Events kept per worker between flushes (oldest dropped beyond this)
+    FUNNEL_FLUSH_INTERVAL = 5  # seconds
+    FUNNEL_FLUSH_BATCH = 1000  # Rows per INSERT transaction
+    FUNNEL_API_TOKEN = os.environ.get('FUNNEL_API_TOKEN')  # Bearer token for /api/funnel (404 while unset)
+    
+    # Tracing Configuration
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'True').lower() in ['true', 'on', '1']
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 1.0))  # Fraction of requests timed (Server-Timing)
+    TRACE_EXPORT_FILE = os.environ.get('TRACE_EXPORT_FILE')  # OTLP/JSON lines, off when unset
+    TRACE_EXPORT_SAMPLE_RATE = float(os.environ.get('TRACE_EXPORT_SAMPLE_RATE', 1.0))  # Of timed requests
+    TRACE_FORCE_TOKEN = os.environ.get('TRACE_FORCE_TOKEN')  # Enables header-forced traces when set
+    TRACE_FORCE_HEADER = 'X-Trace'  # Must carry TRACE_FORCE_TOKEN; forces sampling and export
+    
     @staticmethod
     def init_app(app):
         """Initialize Flask app with configuration"""
@@ -56,6 +174,11 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    RATE_LIMIT_TRUST_PROXY = True  # Behind nginx
+    TEMPLATE_PRELOAD = True
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 0.05))
+    # Sync workers would be tied up by open streams; stream_server.py (gevent) serves them
+    ROOM_STREAM_ENABLED = os.environ.get('ROOM_STREAM_ENABLED', 'False').lower() in ['true', 'on', '1']
     HMS_API_URL = os.environ.get('HMS_API_URL') or 'https://api.ngendahotel.com'
 
 class TestingConfig(Config):
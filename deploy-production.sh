@@ -75,6 +75,18 @@ else
     exit 1
 fi
 
+# A new build id bumps the service worker cache version for every visitor
+export BUILD_ID="$(git rev-parse --short HEAD 2>/dev/null || date +%s)"
+echo -e "${YELLOW}🏷️  Build ${BUILD_ID}${NC}"
+
+# Precompile templates so workers start without compiling them
+echo -e "${YELLOW}🧩 Precompiling templates...${NC}"
+FLASK_CONFIG=production flask --app app precompile-templates
+
+# Freeze content and room pages for nginx (only changed pages are re-rendered)
+echo -e "${YELLOW}🧊 Exporting static pages...${NC}"
+FLASK_CONFIG=production flask --app app export-static
+
 # Create logs directory
 echo -e "${YELLOW}📁 Setting up logs directory...${NC}"
 mkdir -p logs
@@ -0,0 +1,129 @@
+import os
+import re
+from html.parser import HTMLParser
+from threading import Lock
+from urllib.parse import urlsplit
+
+from flask import request
+
+_FONT_FACE_RE = re.compile(r'@font-face\s*{[^}]*}', re.S)
+_WOFF2_URL_RE = re.compile(r'''url\(\s*['"]?([^'")?#]+\.woff2)''')
+
+
+class CriticalAssetParser(HTMLParser):
+    """Collects stylesheets, scripts and preload hints from a rendered page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.styles = []
+        self.scripts = []
+        self.preloads = []  # (url, as) declared in the page itself
+        self.origins = []
+
+    def _add(self, items, value):
+        if not value:
+            return
+        if value.startswith('/') and not value.startswith('//'):
+            if value not in items:
+                items.append(value)
+        else:
+            parts = urlsplit(value)
+            origin = f'{parts.scheme or "https"}://{parts.netloc}'
+            if parts.netloc and origin not in self.origins:
+                self.origins.append(origin)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'stylesheet' in rel:
+                self._add(self.styles, attrs.get('href'))
+            elif 'preload' in rel and attrs.get('href') and attrs.get('as'):
+                if (attrs['href'], attrs['as']) not in self.preloads:
+                    self.preloads.append((attrs['href'], attrs['as']))
+        elif tag == 'script':
+            self._add(self.scripts, attrs.get('src'))
+
+
+def stylesheet_fonts(static_folder, static_url_path, stylesheet):
+    """woff2 files declared in a local stylesheet's @font-face rules"""
+    prefix = static_url_path.rstrip('/') + '/'
+    if not stylesheet.startswith(prefix):
+        return []
+    relative = stylesheet[len(prefix):]
+    try:
+        with open(os.path.join(static_folder, relative), encoding='utf-8', errors='replace') as f:
+            css = f.read()
+    except OSError:
+        return []
+    fonts = []
+    base = os.path.dirname(relative)
+    for block in _FONT_FACE_RE.findall(css):
+        match = _WOFF2_URL_RE.search(block)
+        if match:
+            font = prefix + os.path.normpath(os.path.join(base, match.group(1))).replace(os.sep, '/')
+            if font not in fonts:
+                fonts.append(font)
+    return fonts
+
+
+def build_link_header(parser, fonts, max_assets, include_scripts=True):
+    """Link header value: preconnects, then styles, fonts and scripts in discovery order"""
+    links = [f'<{origin}>; rel=preconnect' for origin in parser.origins]
+    assets = [(url, 'style') for url in parser.styles]
+    assets += [(url, 'font') for url in fonts]
+    assets += list(parser.preloads)
+    if include_scripts:
+        assets += [(url, 'script') for url in parser.scripts]
+    seen = set()
+    for url, kind in assets:
+        if url in seen or len(seen) >= max_assets:
+            continue
+        seen.add(url)
+        crossorigin = '; crossorigin' if kind == 'font' else ''
+        links.append(f'<{url}>; rel=preload; as={kind}{crossorigin}')
+    return ', '.join(links)
+
+
+def init_early_hints(app):
+    """Send each endpoint's critical assets as Link preload headers and 103 Early Hints"""
+    if not app.config['EARLY_HINTS_ENABLED']:
+        return
+
+    max_assets = app.config['EARLY_HINTS_MAX_ASSETS']
+    include_scripts = app.config['EARLY_HINTS_SCRIPTS']
+    links = {}  # endpoint -> Link header value, from the first rendered page
+    lock = Lock()
+
+    @app.before_request
+    def send_early_hints():
+        if request.method != 'GET':
+            return
+        value = links.get(request.endpoint)
+        send = request.environ.get('wsgi.early_hints')
+        if value and callable(send):
+            try:
+                # Lets the browser start fetching CSS/JS while the page renders
+                send([('Link', value)])
+            except Exception as e:
+                print(f"Early hints error: {e}")
+
+    @app.after_request
+    def add_preload_links(response):
+        if request.method != 'GET' or response.status_code != 200 or response.mimetype != 'text/html':
+            return response
+        endpoint = request.endpoint
+        value = links.get(endpoint)
+        if value is None and not response.is_streamed:
+            with lock:
+                value = links.get(endpoint)
+                if value is None:
+                    parser = CriticalAssetParser()
+                    parser.feed(response.get_data(as_text=True))
+                    fonts = []
+                    for stylesheet in parser.styles:
+                        fonts += stylesheet_fonts(app.static_folder, app.static_url_path, stylesheet)
+                    value = links[endpoint] = build_link_header(parser, fonts, max_assets, include_scripts)
+        if value:
+            response.headers['Link'] = value
+        return response
@@ -0,0 +1,142 @@
+"""
+Local fake HMS server for tests and benchmarks
+Implements the subset of HMS_API_Specification.md the website calls
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeHMS:
+    """In-process HMS stand-in listening on a random localhost port"""
+
+    def __init__(self, rooms=None, booking_delay=0.0, fail_rooms=(), bulk=False):
+        self.rooms = rooms or []
+        self._rooms_body = None
+        self.booking_delay = booking_delay
+        self.fail_rooms = {str(room_id) for room_id in fail_rooms}
+        self.bulk = bulk
+        self.bulk_status = None  # Book the group, then answer with this error status instead
+        self.revoked_tokens = set()
+        self._logins = 0
+        self.bookings = {}
+        self.cancelled = []
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def set_rooms(self, rooms):
+        with self._lock:
+            self.rooms = rooms
+            self._rooms_body = None
+
+    def rooms_body(self):
+        """Encoded room list, built once per set_rooms so large inventories are cheap to serve"""
+        with self._lock:
+            if self._rooms_body is None:
+                self._rooms_body = json.dumps({'success': True, 'rooms': self.rooms}).encode()
+            return self._rooms_body
+
+    def _book(self, payload):
+        if str(payload.get('room_id')) in self.fail_rooms:
+            return 409, {'success': False, 'message': 'Room is no longer available'}
+        with self._lock:
+            self._counter += 1
+            booking_id = f"HMS{self._counter:06d}"
+            self.bookings[booking_id] = payload
+        return 200, {'success': True, 'booking_id': booking_id, 'total_amount': 80000, 'currency': 'TZS'}
+
+    def _handler(self):
+        hms = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                data = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length) or b'{}')
+
+            def do_GET(self):
+                hms.requests.append(('GET', self.path))
+                if self.path.startswith('/api/public/rooms'):
+                    self._send(200, hms.rooms_body())
+                else:
+                    self._send(404, {'success': False})
+
+            def do_POST(self):
+                hms.requests.append(('POST', self.path))
+                body = self._body()
+                if self.path == '/api/auth/login':
+                    with hms._lock:
+                        hms._logins += 1
+                        token = 'fake-token' if hms._logins == 1 else f'fake-token-{hms._logins}'
+                    self._send(200, {'access_token': token, 'expires_in': 3600})
+                elif self.headers.get('Authorization', '').removeprefix('Bearer ') in hms.revoked_tokens:
+                    self._send(401, {'success': False, 'message': 'Token expired'})
+                elif self.path == '/api/bookings/bulk':
+                    if not hms.bulk:
+                        self._send(404, {'success': False})
+                        return
+                    results = [hms._book(item)[1] for item in body.get('bookings', [])]
+                    if hms.bulk_status:
+                        self._send(hms.bulk_status, {'success': False})
+                        return
+                    self._send(200, {'success': all(r['success'] for r in results), 'results': results})
+                elif self.path == '/api/bookings/':
+                    with hms._lock:
+                        hms.in_flight += 1
+                        hms.max_in_flight = max(hms.max_in_flight, hms.in_flight)
+                    try:
+                        time.sleep(hms.booking_delay)
+                        self._send(*hms._book(body))
+                    finally:
+                        with hms._lock:
+                            hms.in_flight -= 1
+                else:
+                    self._send(404, {'success': False})
+
+            def do_DELETE(self):
+                hms.requests.append(('DELETE', self.path))
+                booking_id = self.path.rstrip('/').rsplit('/', 1)[-1]
+                with hms._lock:
+                    found = hms.bookings.pop(booking_id, None) is not None
+                    if found:
+                        hms.cancelled.append(booking_id)
+                self._send(200 if found else 404, {'success': found})
+
+        return Handler
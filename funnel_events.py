@@ -0,0 +1,143 @@
+import atexit
+import os
+import sqlite3
+import time
+from collections import deque
+from threading import Lock
+
+# Booking funnel in order; browsers may only report the first two
+FUNNEL_STAGES = ('room_select', 'date_pick', 'book_submit', 'book_success', 'book_mock_fallback', 'book_failure')
+CLIENT_STAGES = frozenset(('room_select', 'date_pick'))
+
+
+class FunnelEvents:
+    """Per-process ring buffer of funnel events, flushed to SQLite in batches by a scheduled job
+
+    record() is one deque append under a lock that is only ever held for appends and pops,
+    so the request path never waits on the database. When the ring is full the oldest
+    unflushed events are dropped (and counted) rather than blocking requests.
+    """
+
+    def __init__(self, path, capacity=10000, batch_size=1000):
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self._dropped = 0
+        self._buffer = deque(maxlen=capacity)
+        self._buffer_lock = Lock()
+        self._lock = Lock()  # Serializes flushes and database access
+        self._connection = None
+        self._pid = None
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    def record(self, stage, room_id=None, visitor=None, detail=None):
+        """Queue one event (O(1))"""
+        event = (time.time(), stage, room_id, visitor, detail)
+        with self._buffer_lock:
+            if len(self._buffer) == self.capacity:
+                self._dropped += 1  # The append below evicts the oldest event
+            self._buffer.append(event)
+
+    def _db(self):
+        # One connection per process; a forked worker must not reuse the parent's
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS funnel_events (ts REAL NOT NULL, stage TEXT NOT NULL, room_id TEXT, '
+                'visitor TEXT, detail TEXT)'
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS funnel_events_ts ON funnel_events (ts)')
+            self._pid = os.getpid()
+        return self._connection
+
+    def flush(self):
+        """Write buffered events in batches; returns how many were written
+
+        A batch that fails to insert is rolled back and put back at the front of the
+        buffer for the next flush, then the sqlite3.Error is re-raised.
+        """
+        written = 0
+        with self._lock:
+            while True:
+                with self._buffer_lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    break
+                try:
+                    db = self._db()
+                    db.execute('BEGIN')
+                    db.executemany('INSERT INTO funnel_events VALUES (?, ?, ?, ?, ?)', batch)
+                    db.execute('COMMIT')
+                except sqlite3.Error:
+                    self._rollback()
+                    self._requeue(batch)
+                    raise
+                written += len(batch)
+        return written
+
+    def _rollback(self):
+        try:
+            if self._connection is not None and self._connection.in_transaction:
+                self._connection.execute('ROLLBACK')
+        except sqlite3.Error as e:
+            print(f"Funnel events rollback failed, reconnecting: {e}")
+            self._connection = None
+
+    def _requeue(self, batch):
+        """Put an unwritten batch back ahead of newer events, dropping its oldest if the ring has refilled"""
+        with self._buffer_lock:
+            keep = batch[max(0, len(batch) - (self.capacity - len(self._buffer))):]
+            self._dropped += len(batch) - len(keep)
+            self._buffer.extendleft(reversed(keep))
+
+    def counts(self, since=None):
+        """{stage: {'events', 'visitors'}} for every funnel stage, from flushed events of all workers"""
+        with self._lock:
+            rows = self._db().execute(
+                'SELECT stage, COUNT(*), COUNT(DISTINCT visitor) FROM funnel_events WHERE ts >= ? GROUP BY stage',
+                (since or 0,)
+            ).fetchall()
+        found = {stage: {'events': events, 'visitors': visitors} for stage, events, visitors in rows}
+        return {stage: found.get(stage, {'events': 0, 'visitors': 0}) for stage in FUNNEL_STAGES}
+
+
+def funnel_report(counts):
+    """Funnel stages in order, each with its conversion from the previous reached stage"""
+    stages, previous = [], None
+    for stage in FUNNEL_STAGES:
+        events = counts[stage]['events']
+        stages.append({
+            'stage': stage,
+            'events': events,
+            'visitors': counts[stage]['visitors'],
+            'conversion': round(events / previous, 4) if previous else None
+        })
+        if stage in ('room_select', 'date_pick', 'book_submit'):
+            previous = events or previous
+    return stages
+
+
+def init_funnel_events(app, scheduler):
+    """Collector for booking-funnel events, flushed every FUNNEL_FLUSH_INTERVAL seconds"""
+    if not app.config['FUNNEL_EVENTS_ENABLED']:
+        return None
+    events = FunnelEvents(app.config['FUNNEL_EVENTS_DB'], app.config['FUNNEL_BUFFER_SIZE'],
+                          app.config['FUNNEL_FLUSH_BATCH'])
+
+    def flush():
+        # Its row count must not be taken as the next delay
+        try:
+            events.flush()
+        except sqlite3.Error as e:
+            print(f"Funnel events flush failed, retrying next interval: {e}")
+
+    scheduler.schedule(flush, delay=app.config['FUNNEL_FLUSH_INTERVAL'],
+                       interval=app.config['FUNNEL_FLUSH_INTERVAL'], name='funnel-flush')
+    atexit.register(flush)
+    app.extensions['funnel_events'] = events
+    return events
@@ -0,0 +1,150 @@
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+from threading import Lock
+
+from flask import g, request, session
+
+from room_stream import diff_inventories
+from scheduler import get_scheduler
+
+
+def inventory_tags(inventory):
+    """Tags for pages listing the whole inventory"""
+    return ['rooms', f'inventory-{inventory.version}']
+
+
+def room_tags(room):
+    """Tags for a room's page, which also lists rooms of the same category"""
+    return [f'room-{room.id}', f'category-{room.category}']
+
+
+def set_cache_tags(tags):
+    """Mark the current response cacheable by the proxy under these surrogate keys"""
+    g.cache_tags = tags
+
+
+def purge_tags(previous, inventory):
+    """Tags of every cached page that showed data which changed between two inventory versions"""
+    if previous is None:
+        return []
+    changed, removed = diff_inventories(previous, inventory)
+    if not changed and not removed:
+        return []
+    tags = {f'inventory-{previous.version}'}
+    for room in changed:
+        tags.update(room_tags(room))
+        # A room that moved category leaves its old category's pages stale too
+        old = previous.get(room.id)
+        if old is not None:
+            tags.update(room_tags(old))
+    for room_id in removed:
+        tags.update(room_tags(previous.get(room_id)))
+    return sorted(tags)
+
+
+class CachePurger:
+    """Collects tags for a moment, then purges them at the proxy in batches off the request path"""
+
+    def __init__(self, url, method='PURGE', tag_header='Surrogate-Key', token=None, delay=1.0, batch_size=256,
+                 timeout=5, max_attempts=3):
+        self.url = url
+        self.method = method
+        self.tag_header = tag_header
+        self.token = token
+        self.delay = delay
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.purged = 0
+        self.failures = 0
+        self._pending = set()
+        self._scheduled = False
+        self._attempts = 0
+        self._lock = Lock()
+
+    def purge(self, tags):
+        if not tags:
+            return
+        with self._lock:
+            self._pending.update(tags)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        get_scheduler().schedule(self.flush, delay=self.delay, name='cache-purge')
+
+    def purge_inventory(self, previous, inventory):
+        """Inventory listener"""
+        self.purge(purge_tags(previous, inventory))
+
+    def flush(self):
+        """Send the pending tags; returns a retry delay while the proxy keeps failing"""
+        with self._lock:
+            tags, self._pending = sorted(self._pending), set()
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        for start in range(0, len(tags), self.batch_size):
+            batch = tags[start:start + self.batch_size]
+            try:
+                response = requests.request(self.method, self.url, headers={**headers, self.tag_header: ' '.join(batch)},
+                                            timeout=self.timeout)
+                response.raise_for_status()
+                self.purged += len(batch)
+            except Exception as e:
+                self.failures += 1
+                with self._lock:
+                    self._pending.update(tags[start:])
+                    self._attempts += 1
+                    if self._attempts < self.max_attempts:
+                        print(f"Cache purge failed ({e}), retrying")
+                        return 5.0 * self._attempts
+                    # Give up; s-maxage bounds how long the proxy serves the stale pages
+                    print(f"Cache purge failed ({e}), dropping {len(self._pending)} tags")
+                    self._pending.clear()
+                    self._attempts = 0
+                    self._scheduled = False
+                return None
+        with self._lock:
+            self._attempts = 0
+            if self._pending:
+                return self.delay  # Tags that arrived while this batch was being sent
+            self._scheduled = False
+        return None
+
+
+def init_http_cache(app, api_service):
+    """Cache-Control/s-maxage and surrogate-key headers for tagged pages, plus purges on inventory changes"""
+    if not app.config['HTTP_CACHE_ENABLED']:
+        return None
+
+    rules = app.config['HTTP_CACHE_RULES']
+    browser_max_age = app.config['HTTP_CACHE_BROWSER_MAX_AGE']
+    tag_header = app.config['CACHE_TAG_HEADER']
+
+    @app.after_request
+    def add_cache_headers(response):
+        tags = g.pop('cache_tags', None)
+        s_maxage = rules.get(request.endpoint)
+        if not tags or s_maxage is None or request.method not in ('GET', 'HEAD'):
+            return response
+        # Anything carrying a per-visitor cookie (e.g. a flash message) must stay private
+        if response.status_code != 200 or session.modified:
+            return response
+        response.headers['Cache-Control'] = f'public, max-age={browser_max_age}, s-maxage={s_maxage}'
+        response.headers[tag_header] = ' '.join(tags)
+        return response
+
+    purger = None
+    if app.config['CACHE_PURGE_URL']:
+        if not REQUESTS_AVAILABLE:
+            print("Warning: requests module not available. Cache purging disabled.")
+        else:
+            purger = CachePurger(app.config['CACHE_PURGE_URL'], app.config['CACHE_PURGE_METHOD'], tag_header,
+                                 app.config['CACHE_PURGE_TOKEN'], app.config['CACHE_PURGE_DELAY'],
+                                 app.config['CACHE_PURGE_BATCH'])
+            api_service.add_inventory_listener(purger.purge_inventory)
+            app.extensions['cache_purger'] = purger
+    print(f"HTTP cache headers enabled for {', '.join(sorted(rules))} (purge {'on' if purger else 'off'})")
+    return purger
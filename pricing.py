@@ -0,0 +1,253 @@
+import time
+from datetime import date, timedelta
+from threading import Lock
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    print("Warning: numpy not available. Using pure Python stay quotes.")
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+class PricingError(ValueError):
+    """Stay cannot be quoted (bad dates, too short/long, beyond the calendar)"""
+
+
+class PricingRules:
+    """Seasonal, weekend and length-of-stay rules applied on top of each room's base price"""
+
+    def __init__(self, seasons=(), weekend_multiplier=1.0, weekend_nights=(4, 5), stay_discounts=None,
+                 min_nights=1, max_nights=30, horizon_days=365):
+        # seasons: ({'name', 'start': 'MM-DD', 'end': 'MM-DD', 'multiplier'}, ...); end is inclusive
+        self.seasons = tuple(seasons)
+        self.weekend_multiplier = weekend_multiplier
+        self.weekend_nights = frozenset(weekend_nights)  # date.weekday() of the night's check-in day
+        # {min nights: discount fraction}; the largest threshold reached applies
+        self.stay_discounts = sorted((stay_discounts or {}).items())
+        self.min_nights = min_nights
+        self.max_nights = max_nights
+        self.horizon_days = horizon_days
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            seasons=config['PRICING_SEASONS'],
+            weekend_multiplier=config['PRICING_WEEKEND_MULTIPLIER'],
+            weekend_nights=config['PRICING_WEEKEND_NIGHTS'],
+            stay_discounts=config['PRICING_STAY_DISCOUNTS'],
+            min_nights=config['MIN_BOOKING_DAYS'],
+            max_nights=config['MAX_BOOKING_DAYS'],
+            horizon_days=config['PRICING_HORIZON_DAYS']
+        )
+
+    def night_multiplier(self, night):
+        """Combined season and weekend multiplier for one night"""
+        multiplier = 1.0
+        month_day = night.strftime('%m-%d')
+        for season in self.seasons:
+            start, end = season['start'], season['end']
+            # A season may wrap the new year (e.g. 12-15 to 01-05)
+            if (start <= month_day <= end) if start <= end else (month_day >= start or month_day <= end):
+                multiplier *= season['multiplier']
+                break
+        if night.weekday() in self.weekend_nights:
+            multiplier *= self.weekend_multiplier
+        return multiplier
+
+    def stay_discount(self, nights):
+        discount = 0.0
+        for threshold, value in self.stay_discounts:
+            if nights >= threshold:
+                discount = value
+        return discount
+
+
+def _base_price_tzs(room, tzs_per_usd=None):
+    """Nightly base price in TZS, or None when the room has no price or it cannot be converted"""
+    if room.price is None or room.price <= 0:
+        return None
+    currency = (room.currency or 'TZS').upper()
+    if currency == 'TZS':
+        return room.price
+    if currency == 'USD' and tzs_per_usd:
+        return room.price * tzs_per_usd
+    return None
+
+
+class RateCalendar:
+    """Nightly rates for every room over the booking horizon, with prefix sums for O(1) range totals
+
+    Rates are in TZS; USD-priced rooms are converted at tzs_per_usd. Rooms
+    without a usable price are kept in the calendar but never quoted.
+    """
+
+    def __init__(self, inventory, rules, start=None, tzs_per_usd=None):
+        self.rules = rules
+        self.start = start or date.today()
+        self.days = rules.horizon_days + rules.max_nights
+        self.version = inventory.version
+        self.room_ids = [room.id for room in inventory]
+        self.positions = {room_id: position for position, room_id in enumerate(self.room_ids)}
+        base_prices = [_base_price_tzs(room, tzs_per_usd) for room in inventory]
+        self.quotable = [price is not None for price in base_prices]
+        base_prices = [price or 0 for price in base_prices]
+        multipliers = [rules.night_multiplier(self.start + timedelta(days=day)) for day in range(self.days)]
+
+        if NUMPY_AVAILABLE:
+            # rooms x days nightly rates rounded to whole shillings, then cumulative along the stay axis
+            rates = np.rint(np.outer(np.asarray(base_prices, dtype=np.float64), multipliers)).astype(np.int64)
+            self.cumulative = np.zeros((len(base_prices), self.days + 1), dtype=np.int64)
+            np.cumsum(rates, axis=1, out=self.cumulative[:, 1:])
+        else:
+            self.cumulative = []
+            for price in base_prices:
+                running, row = 0, [0]
+                for multiplier in multipliers:
+                    running += round(price * multiplier)
+                    row.append(running)
+                self.cumulative.append(row)
+
+    def stay_range(self, check_in, check_out):
+        """Validate a stay and return (first day offset, nights)"""
+        if check_out <= check_in:
+            raise PricingError('check_out must be after check_in')
+        nights = (check_out - check_in).days
+        if nights < self.rules.min_nights or nights > self.rules.max_nights:
+            raise PricingError(f'Stays must be {self.rules.min_nights}-{self.rules.max_nights} nights')
+        offset = (check_in - self.start).days
+        if offset < 0:
+            raise PricingError('check_in is in the past')
+        if offset >= self.rules.horizon_days:
+            raise PricingError(f'Rates are only available {self.rules.horizon_days} days ahead')
+        return offset, nights
+
+    def subtotals(self, offset, nights, room_ids=None):
+        """Undiscounted stay totals for the given rooms (all rooms by default), in room order"""
+        if room_ids is None:
+            positions = None
+        else:
+            try:
+                positions = [self.positions[room_id] for room_id in room_ids]
+            except KeyError as e:
+                raise PricingError(f'Unknown room: {e.args[0]}')
+
+        if NUMPY_AVAILABLE:
+            cumulative = self.cumulative if positions is None else self.cumulative[positions]
+            return cumulative[:, offset + nights] - cumulative[:, offset]
+        rows = self.cumulative if positions is None else [self.cumulative[position] for position in positions]
+        return [row[offset + nights] - row[offset] for row in rows]
+
+    def quote(self, check_in, check_out, room_ids=None, tzs_per_usd=None):
+        """Quote a stay for the given rooms (all by default); returns (nights, discount, quotes)"""
+        offset, nights = self.stay_range(check_in, check_out)
+        subtotals = self.subtotals(offset, nights, room_ids)
+        discount = self.rules.stay_discount(nights)
+        ids = self.room_ids if room_ids is None else room_ids
+        quotable = [self.quotable[self.positions[room_id]] for room_id in ids]
+
+        if NUMPY_AVAILABLE:
+            totals = np.rint(subtotals * (1 - discount)).astype(np.int64)
+            usd = np.round(totals / tzs_per_usd, 2) if tzs_per_usd else None
+            subtotals, totals = subtotals.tolist(), totals.tolist()
+            usd = usd.tolist() if usd is not None else None
+        else:
+            totals = [round(subtotal * (1 - discount)) for subtotal in subtotals]
+            usd = [round(total / tzs_per_usd, 2) for total in totals] if tzs_per_usd else None
+
+        quotes = []
+        for position, (room_id, subtotal, total) in enumerate(zip(ids, subtotals, totals)):
+            if not quotable[position]:
+                quotes.append({'room_id': room_id, 'quotable': False, 'message': 'No price available for this room'})
+                continue
+            quotes.append({
+                'room_id': room_id,
+                'quotable': True,
+                'subtotal': subtotal,
+                'discount': subtotal - total,
+                'total': total,
+                'currency': 'TZS',
+                'total_usd': usd[position] if usd is not None else None
+            })
+        return nights, discount, quotes
+
+
+_calendar_cache = {}
+_calendar_lock = Lock()
+
+
+def get_rate_calendar(inventory, rules, tzs_per_usd=None):
+    """Return the rate calendar for this inventory version, today's date and exchange rate, building it on first use"""
+    key = (inventory.version, date.today(), id(rules), tzs_per_usd)
+    calendar = _calendar_cache.get(key)
+    if calendar is None:
+        with _calendar_lock:
+            calendar = _calendar_cache.get(key)
+            if calendar is None:
+                calendar = RateCalendar(inventory, rules, tzs_per_usd=tzs_per_usd)
+                # Only the current version, day and rate are ever quoted
+                _calendar_cache.clear()
+                _calendar_cache[key] = calendar
+    return calendar
+
+
+class ExchangeRates:
+    """TZS per USD, refreshed from EXCHANGE_RATE_URL at most once per ttl and falling back to the configured rate"""
+
+    def __init__(self, tzs_per_usd, url=None, ttl=3600):
+        self.rate = float(tzs_per_usd)
+        self.url = url
+        self.ttl = ttl
+        self._fetched_at = None
+        self._lock = Lock()
+
+    def tzs_per_usd(self):
+        if not self.url or not REQUESTS_AVAILABLE:
+            return self.rate
+        now = time.monotonic()
+        if self._fetched_at is not None and now - self._fetched_at < self.ttl:
+            return self.rate
+        # One request refreshes; others keep quoting with the previous rate
+        if not self._lock.acquire(blocking=False):
+            return self.rate
+        try:
+            self._fetched_at = now
+            response = requests.get(self.url, timeout=5)
+            response.raise_for_status()
+            # Open exchange-rate APIs with base USD return {"rates": {"TZS": ...}}
+            self.rate = float(response.json()['rates']['TZS'])
+        except Exception as e:
+            print(f"Exchange rate refresh failed, keeping {self.rate}: {e}")
+        finally:
+            self._lock.release()
+        return self.rate
+
+    def to_usd(self, amount_tzs):
+        return round(amount_tzs / self.tzs_per_usd(), 2)
+
+    def to_tzs(self, amount_usd):
+        return round(amount_usd * self.tzs_per_usd())
+
+
+def parse_quote_request(args):
+    """Parse check_in, check_out and optional room_id list from /api/quote query arguments"""
+    try:
+        check_in = date.fromisoformat(args.get('check_in', ''))
+        check_out = date.fromisoformat(args.get('check_out', ''))
+    except ValueError:
+        raise PricingError('check_in and check_out must be YYYY-MM-DD dates')
+
+    room_ids = None
+    values = args.getlist('room_id')
+    if values:
+        try:
+            room_ids = [int(room_id) for value in values for room_id in value.split(',') if room_id]
+        except ValueError:
+            raise PricingError('room_id must be an integer or comma-separated integers')
+    return check_in, check_out, room_ids
@@ -0,0 +1,200 @@
+import atexit
+import cProfile
+import hmac
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+try:
+    import pyinstrument
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+_sequence = itertools.count(1)
+
+
+def output_name(prefix):
+    """Unique, time-sortable file name stem for this worker"""
+    return f'{prefix}-{os.getpid()}-{time.strftime("%Y%m%d-%H%M%S")}-{next(_sequence)}'
+
+
+def rotate_files(directory, prefix, keep):
+    """Delete the oldest files starting with prefix so at most keep remain"""
+    try:
+        entries = [entry for entry in os.scandir(directory) if entry.is_file() and entry.name.startswith(prefix)]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:max(0, len(entries) - keep)]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})'
+
+
+def collapse_stack(frame, thread_name):
+    """Collapsed-stack line key (root first, ';'-separated) as used by flamegraph.pl and speedscope"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """Low-frequency sampler of every thread's stack, flushed to collapsed-stack files"""
+
+    def __init__(self, output_dir, interval=0.1, flush_interval=60, max_files=50):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.max_files = max_files
+        self.counts = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def ensure_running(self):
+        """Start the sampler thread in this process (threads do not survive a gunicorn fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.counts.clear()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self.flush()
+
+    def sample(self):
+        """Record one stack per thread except the sampler itself"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        stacks = [collapse_stack(frame, names.get(ident, f'thread-{ident}'))
+                  for ident, frame in sys._current_frames().items() if ident != own]
+        with self._lock:
+            self.counts.update(stacks)
+            self.samples += 1
+
+    def flush(self):
+        """Write the stacks collected since the last flush; returns the file path or None"""
+        with self._lock:
+            counts, self.counts = self.counts, Counter()
+        if not counts:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f'{output_name("stacks")}.collapsed')
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in counts.most_common():
+                f.write(f'{stack} {count}\n')
+        rotate_files(self.output_dir, 'stacks-', self.max_files)
+        return path
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+                if time.monotonic() >= next_flush:
+                    next_flush = time.monotonic() + self.flush_interval
+                    self.flush()
+            except Exception as e:
+                print(f"Stack sampler error: {e}")
+
+
+def init_profiling(app):
+    """Opt-in per-request profiles (config- or header-gated) and a background stack sampler"""
+    output_dir = app.config['PROFILE_DIR']
+    max_files = app.config['PROFILE_MAX_FILES']
+    profile_all = app.config['PROFILE_ALL_REQUESTS']
+    token = app.config['PROFILE_TOKEN']
+    header = app.config['PROFILE_HEADER']
+    engine = app.config['PROFILE_ENGINE']
+    if engine == 'pyinstrument' and not PYINSTRUMENT_AVAILABLE:
+        print("Warning: pyinstrument not available. Using cProfile for request profiles.")
+        engine = 'cprofile'
+
+    sampler = None
+    if app.config['STACK_SAMPLER_ENABLED']:
+        sampler = StackSampler(output_dir, app.config['STACK_SAMPLER_INTERVAL'],
+                               app.config['STACK_SAMPLER_FLUSH_INTERVAL'], max_files)
+        app.extensions['stack_sampler'] = sampler
+        atexit.register(sampler.stop)
+
+    if not profile_all and not token and sampler is None:
+        return
+
+    def wants_profile():
+        if profile_all:
+            return True
+        # Header profiling needs the shared secret so visitors cannot trigger it
+        supplied = request.headers.get(header)
+        return bool(token and supplied and hmac.compare_digest(supplied.encode(), token.encode()))
+
+    @app.before_request
+    def start_profile():
+        if sampler is not None:
+            sampler.ensure_running()
+        if not wants_profile():
+            return
+        if engine == 'pyinstrument':
+            profiler = pyinstrument.Profiler(interval=0.001)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        g.request_profiler = profiler
+
+    @app.after_request
+    def finish_profile(response):
+        profiler = g.pop('request_profiler', None)
+        if profiler is None:
+            return response
+        os.makedirs(output_dir, exist_ok=True)
+        name = f'{output_name("request")}-{request.endpoint or "unknown"}'
+        if engine == 'pyinstrument':
+            profiler.stop()
+            path = os.path.join(output_dir, f'{name}.speedscope.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output(pyinstrument.renderers.SpeedscopeRenderer()))
+        else:
+            profiler.disable()
+            # Open with snakeviz, or convert to a flamegraph with flameprof
+            path = os.path.join(output_dir, f'{name}.prof')
+            profiler.dump_stats(path)
+        rotate_files(output_dir, 'request-', max_files)
+        response.headers['X-Profile-File'] = os.path.basename(path)
+        return response
+
+    @app.teardown_request
+    def discard_profile(error=None):
+        # A request that raised never reached after_request; never leave a profiler running on the thread
+        profiler = g.pop('request_profiler', None)
+        if profiler is not None:
+            if engine == 'pyinstrument':
+                profiler.stop()
+            else:
+                profiler.disable()
+
+    print(f"Profiling enabled (output {output_dir}, sampler {'on' if sampler else 'off'})")
@@ -0,0 +1,229 @@
+import os
+import sqlite3
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date
+from threading import Lock, local
+
+
+class HoldConflictError(Exception):
+    """The room is already held or booked for overlapping dates"""
+
+    def __init__(self, hold):
+        super().__init__(f'Room {hold.room_id} is being booked for overlapping dates')
+        self.hold = hold
+
+
+@dataclass(frozen=True, slots=True)
+class Hold:
+    """A short-lived claim on a room for [check_in, check_out) while a booking is in flight"""
+
+    hold_id: str
+    room_id: str
+    check_in: int  # date ordinals
+    check_out: int
+    expires_at: float  # time.time(), comparable across workers
+    status: str = 'held'  # or 'confirmed' once the HMS accepted the booking
+
+    def to_dict(self):
+        return {
+            'hold_id': self.hold_id,
+            'room_id': self.room_id,
+            'check_in': date.fromordinal(self.check_in).isoformat(),
+            'check_out': date.fromordinal(self.check_out).isoformat(),
+            'expires_in': max(0, round(self.expires_at - time.time())),
+            'status': self.status
+        }
+
+
+class HoldStore:
+    """Room/date-range holds in a per-room interval index, optionally shared across workers via SQLite
+
+    Each room keeps its unexpired holds sorted by check_in. Active holds never overlap, so one
+    bisect finds the only candidate conflict. With a database path, SQLite is the source of
+    truth: PRAGMA data_version tells us when another connection committed, and only then is the
+    local index reloaded, so conflicts are normally rejected without touching the database.
+    """
+
+    def __init__(self, path=None, ttl=300, confirmed_ttl=900):
+        self.path = path
+        self.ttl = ttl
+        self.confirmed_ttl = confirmed_ttl
+        self._rooms = {}  # room_id -> sorted [(check_in, check_out, expires_at, hold_id, Hold)]
+        self._by_id = {}
+        self._room_locks = {}
+        self._lock = Lock()
+        self._local = local()
+        if path:
+            self._connection().execute(
+                'CREATE TABLE IF NOT EXISTS reservation_holds (hold_id TEXT PRIMARY KEY, room_id TEXT NOT NULL, '
+                'check_in INTEGER NOT NULL, check_out INTEGER NOT NULL, expires_at REAL NOT NULL, '
+                'status TEXT NOT NULL)'
+            )
+            self._connection().execute(
+                'CREATE INDEX IF NOT EXISTS reservation_holds_room ON reservation_holds (room_id, check_in)'
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=2, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.data_version = None
+        return connection
+
+    def _room_lock(self, room_id):
+        lock = self._room_locks.get(room_id)
+        if lock is None:
+            with self._lock:
+                lock = self._room_locks.setdefault(room_id, Lock())
+        return lock
+
+    def _sync(self):
+        """Reload the index if another connection changed the table since this thread last looked"""
+        if not self.path:
+            return
+        connection = self._connection()
+        version = connection.execute('PRAGMA data_version').fetchone()[0]
+        if version == self._local.data_version:
+            return
+        rows = connection.execute(
+            'SELECT hold_id, room_id, check_in, check_out, expires_at, status FROM reservation_holds '
+            'WHERE expires_at > ?', (time.time(),)
+        ).fetchall()
+        rooms, by_id = {}, {}
+        for row in rows:
+            hold = Hold(*row)
+            rooms.setdefault(hold.room_id, []).append((hold.check_in, hold.check_out, hold.expires_at, hold.hold_id, hold))
+            by_id[hold.hold_id] = hold
+        for entries in rooms.values():
+            entries.sort()
+        with self._lock:
+            self._rooms, self._by_id = rooms, by_id
+        self._local.data_version = version
+
+    def _conflict(self, entries, check_in, check_out, now):
+        """The hold overlapping [check_in, check_out), pruning expired entries first"""
+        if any(entry[2] <= now for entry in entries):
+            entries[:] = [entry for entry in entries if entry[2] > now]
+        index = bisect_left(entries, (check_out,))
+        if index and entries[index - 1][1] > check_in:
+            return entries[index - 1][4]
+        return None
+
+    def acquire(self, room_id, check_in, check_out, ttl=None):
+        """Hold the room for [check_in, check_out) (dates); raises HoldConflictError on overlap"""
+        room_id = str(room_id)
+        start, end = check_in.toordinal(), check_out.toordinal()
+        self._sync()
+        with self._room_lock(room_id):
+            now = time.time()
+            entries = self._rooms.setdefault(room_id, [])
+            conflict = self._conflict(entries, start, end, now)
+            if conflict is not None:
+                raise HoldConflictError(conflict)
+
+            hold = Hold(os.urandom(12).hex(), room_id, start, end, now + (ttl or self.ttl))
+            if self.path:
+                self._insert(hold, now)
+            insort(entries, (start, end, hold.expires_at, hold.hold_id, hold))
+            self._by_id[hold.hold_id] = hold
+            return hold
+
+    def _insert(self, hold, now):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Another worker may have committed a hold after our last sync
+            row = connection.execute(
+                'SELECT hold_id, room_id, check_in, check_out, expires_at, status FROM reservation_holds '
+                'WHERE room_id = ? AND check_in < ? AND check_out > ? AND expires_at > ? LIMIT 1',
+                (hold.room_id, hold.check_out, hold.check_in, now)
+            ).fetchone()
+            if row:
+                raise HoldConflictError(Hold(*row))
+            connection.execute('DELETE FROM reservation_holds WHERE room_id = ? AND expires_at <= ?',
+                               (hold.room_id, now))
+            connection.execute('INSERT INTO reservation_holds VALUES (?, ?, ?, ?, ?, ?)',
+                               (hold.hold_id, hold.room_id, hold.check_in, hold.check_out, hold.expires_at,
+                                hold.status))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            self._local.data_version = None  # Pick up the conflicting hold on the next sync
+            raise
+        # Our own commit does not change this connection's data_version, so the index stays valid
+
+    def get(self, hold_id):
+        """The unexpired hold with this id, or None"""
+        self._sync()
+        hold = self._by_id.get(hold_id)
+        if hold is None or hold.expires_at <= time.time():
+            return None
+        return hold
+
+    def _replace(self, hold, new):
+        with self._room_lock(hold.room_id):
+            entries = self._rooms.get(hold.room_id, [])
+            entries[:] = [entry for entry in entries if entry[3] != hold.hold_id]
+            if new is not None:
+                insort(entries, (new.check_in, new.check_out, new.expires_at, new.hold_id, new))
+                self._by_id[new.hold_id] = new
+            else:
+                self._by_id.pop(hold.hold_id, None)
+
+    def release(self, hold_id):
+        """Drop a hold (booking failed or the guest changed their mind); returns whether it existed"""
+        hold = self.get(hold_id)
+        if hold is None:
+            return False
+        if self.path:
+            self._connection().execute('DELETE FROM reservation_holds WHERE hold_id = ?', (hold_id,))
+        self._replace(hold, None)
+        return True
+
+    def confirm(self, hold_id):
+        """Keep a booked range blocked until the HMS inventory reflects the booking"""
+        hold = self.get(hold_id)
+        if hold is None:
+            return None
+        confirmed = Hold(hold.hold_id, hold.room_id, hold.check_in, hold.check_out,
+                         time.time() + self.confirmed_ttl, 'confirmed')
+        if self.path:
+            self._connection().execute(
+                'UPDATE reservation_holds SET expires_at = ?, status = ? WHERE hold_id = ?',
+                (confirmed.expires_at, confirmed.status, hold_id)
+            )
+        self._replace(hold, confirmed)
+        return confirmed
+
+    def purge_expired(self):
+        """Delete expired holds (scheduled job)"""
+        now = time.time()
+        if self.path:
+            self._connection().execute('DELETE FROM reservation_holds WHERE expires_at <= ?', (now,))
+        with self._lock:
+            rooms = list(self._rooms.items())
+        for room_id, entries in rooms:
+            with self._room_lock(room_id):
+                for entry in entries:
+                    if entry[2] <= now:
+                        self._by_id.pop(entry[3], None)
+                entries[:] = [entry for entry in entries if entry[2] > now]
+
+    def __len__(self):
+        self._sync()
+        now = time.time()
+        return sum(1 for hold in list(self._by_id.values()) if hold.expires_at > now)
+
+
+def create_hold_store(spec, ttl=300, confirmed_ttl=900):
+    """Build a store from HOLDS_BACKEND ('memory' or 'sqlite:///path')"""
+    if spec == 'memory':
+        return HoldStore(None, ttl, confirmed_ttl)
+    if spec.startswith('sqlite:///'):
+        return HoldStore(spec[len('sqlite:///'):], ttl, confirmed_ttl)
+    raise ValueError(f"Unknown HOLDS_BACKEND: {spec}")
@@ -0,0 +1,100 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+
+@dataclass(frozen=True, slots=True)
+class Room:
+    """Immutable room record shared by every request for one inventory version"""
+
+    id: int
+    name: str
+    category: str
+    price: int
+    currency: str = 'TZS'
+    price_usd: int = None
+    capacity: int = 2
+    beds: str = 'Double Bed'
+    size: str = '25 sqm'
+    amenities: tuple = ()
+    image: str = 'default_room.jpg'
+    available: bool = True
+    description: str = ''
+    json_bytes: bytes = field(default=b'', repr=False, compare=False)
+
+    def __post_init__(self):
+        # Pre-serialize once so /api/rooms can write cached bytes
+        if not self.json_bytes:
+            object.__setattr__(self, 'json_bytes', compact_json(self.to_dict()))
+
+    @classmethod
+    def from_hms(cls, data):
+        """Map an HMS room payload onto our frontend fields"""
+        return cls(
+            id=data.get('id'),
+            name=data.get('name'),
+            category=data.get('category'),  # classic, superior, deluxe, executive
+            price=data.get('price'),
+            price_usd=data.get('price_usd'),
+            capacity=data.get('capacity', 2),
+            size=data.get('size', '25 sqm'),
+            beds=data.get('beds', 'Double Bed'),
+            amenities=tuple(data.get('amenities') or ()),
+            image=data.get('image', 'default_room.jpg'),
+            available=data.get('available', True),
+            description=data.get('description', ''),
+            currency=data.get('currency', 'TZS')
+        )
+
+    def to_dict(self):
+        """Return the room as a plain dict (the shape /api/rooms has always served)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'price': self.price,
+            'price_usd': self.price_usd,
+            'capacity': self.capacity,
+            'size': self.size,
+            'beds': self.beds,
+            'amenities': list(self.amenities),
+            'image': self.image,
+            'available': self.available,
+            'description': self.description,
+            'currency': self.currency
+        }
+
+
+class RoomInventory:
+    """One immutable version of the room list, with lookups and cached JSON"""
+
+    __slots__ = ('rooms', 'by_id', 'version', 'json_bytes')
+
+    def __init__(self, rooms, version=None):
+        self.rooms = tuple(rooms)
+        self.by_id = MappingProxyType({room.id: room for room in self.rooms})
+        self.json_bytes = b'{"success":true,"rooms":[' + b','.join(room.json_bytes for room in self.rooms) + b']}'
+        self.version = version or hashlib.sha1(self.json_bytes).hexdigest()[:16]
+
+    @classmethod
+    def from_records(cls, records, version=None):
+        """Build an inventory from HMS-shaped room dicts"""
+        return cls((Room.from_hms(record) for record in records), version=version)
+
+    def get(self, room_id):
+        """Return the room with the given id, or None"""
+        return self.by_id.get(room_id)
+
+    def __iter__(self):
+        return iter(self.rooms)
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def __bool__(self):
+        return bool(self.rooms)
+
+
+def compact_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
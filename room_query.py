@@ -0,0 +1,246 @@
+import base64
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from threading import Lock
+
+from room_model import compact_json
+
+# Sortable keys and how to read them off a Room (None sorts first)
+SORT_KEYS = {
+    'price': lambda room: room.price if room.price is not None else -1,
+    'capacity': lambda room: room.capacity if room.capacity is not None else -1,
+    'name': lambda room: room.name or '',
+    'id': lambda room: room.id if room.id is not None else -1
+}
+
+# Fields a client may ask for with ?fields=
+PROJECTABLE_FIELDS = frozenset((
+    'id', 'name', 'category', 'price', 'price_usd', 'capacity', 'size', 'beds',
+    'amenities', 'image', 'available', 'description', 'currency'
+))
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Below this share of the inventory, sort the filtered rooms instead of scanning a sort order
+_SMALL_RESULT_RATIO = 8
+
+
+class RoomQueryError(ValueError):
+    """Invalid /api/rooms query parameter"""
+
+
+def normalize_category(category):
+    """Category as indexed and as queried, so HMS casing does not matter"""
+    return str(category or '').strip().lower()
+
+
+class RoomIndex:
+    """Sorted arrays and postings over one inventory version, built once and shared"""
+
+    def __init__(self, inventory):
+        self.version = inventory.version
+        self.rooms = inventory.rooms
+        positions = range(len(self.rooms))
+
+        # Per sort key: room positions in ascending (value, id) order, the parallel
+        # keys for bisect and each room's rank in that order
+        self.order, self.keys, self.rank = {}, {}, {}
+        for name, value in SORT_KEYS.items():
+            values = [value(room) for room in self.rooms]
+            order = sorted(positions, key=lambda p: (values[p], self.rooms[p].id))
+            rank = [0] * len(order)
+            for i, position in enumerate(order):
+                rank[position] = i
+            self.order[name] = order
+            self.keys[name] = [(values[p], self.rooms[p].id) for p in order]
+            self.rank[name] = rank
+
+        by_category = {}
+        for position in positions:
+            by_category.setdefault(normalize_category(self.rooms[position].category), []).append(position)
+        self.by_category = {category: frozenset(found) for category, found in by_category.items()}
+        self.available = frozenset(p for p in positions if self.rooms[p].available)
+        self.unavailable = frozenset(positions) - self.available
+
+    def _bounds(self, key, low=None, high=None):
+        """Slice of self.order[key] whose values lie within [low, high], via bisect"""
+        keys = self.keys[key]
+        start = 0 if low is None else bisect_left(keys, (low,))
+        end = len(keys) if high is None else bisect_right(keys, (high, float('inf')))
+        return start, end
+
+    def _matches(self, categories, min_price, max_price, capacity, available):
+        """Positions matching every filter, or None when nothing filters"""
+        sets, ranges = [], []
+        if categories:
+            postings = [self.by_category.get(category, frozenset()) for category in categories]
+            sets.append(postings[0] if len(postings) == 1 else frozenset().union(*postings))
+        if available is not None:
+            sets.append(self.available if available else self.unavailable)
+        if min_price is not None or max_price is not None:
+            ranges.append(('price', *self._bounds('price', min_price, max_price)))
+        if capacity is not None:
+            ranges.append(('capacity', *self._bounds('capacity', capacity)))
+        if not sets and not ranges:
+            return None
+
+        # Start from the smallest candidate set; set intersections run in C
+        sets.sort(key=len)
+        ranges.sort(key=lambda r: r[2] - r[1])
+        if ranges and (not sets or ranges[0][2] - ranges[0][1] < len(sets[0])):
+            key, start, end = ranges.pop(0)
+            matches = set(self.order[key][start:end]).intersection(*sets)
+        else:
+            matches = sets[0].intersection(*sets[1:])
+
+        # Remaining ranges are rank windows in their sort order
+        for key, start, end in ranges:
+            rank = self.rank[key]
+            matches = {p for p in matches if start <= rank[p] < end}
+        return matches
+
+    def query(self, categories=None, min_price=None, max_price=None, capacity=None,
+              available=None, sort='price', descending=False, after=None, limit=DEFAULT_PAGE_SIZE):
+        """Return (rooms, total, next_key) for one page; next_key is None on the last page"""
+        matches = self._matches(categories, min_price, max_price, capacity, available)
+        total = len(self.rooms) if matches is None else len(matches)
+
+        if matches is not None and len(matches) * _SMALL_RESULT_RATIO < len(self.rooms):
+            # Few matches: order just those by their precomputed rank
+            sorted_keys = self.keys[sort]
+            order = sorted(matches, key=self.rank[sort].__getitem__)
+            keys = [sorted_keys[i] for i in map(self.rank[sort].__getitem__, order)]
+            matches = None
+        else:
+            keys, order = self.keys[sort], self.order[sort]
+
+        # Keyset pagination: resume strictly after the last (value, id) returned
+        if descending:
+            start = len(keys) - 1 if after is None else bisect_left(keys, after) - 1
+            walk = range(start, -1, -1)
+        else:
+            start = 0 if after is None else bisect_right(keys, after)
+            walk = range(start, len(keys))
+
+        page = []
+        for i in walk:
+            if matches is not None and order[i] not in matches:
+                continue
+            page.append(self.rooms[order[i]])
+            if len(page) > limit:
+                break
+
+        if len(page) <= limit:
+            return page, total, None
+        page = page[:limit]
+        return page, total, (SORT_KEYS[sort](page[-1]), page[-1].id)
+
+
+_index_lock = Lock()
+_index_cache = {}
+
+
+def get_room_index(inventory):
+    """Return the index for this inventory version, building it on first use"""
+    index = _index_cache.get(inventory.version)
+    if index is None:
+        with _index_lock:
+            index = _index_cache.get(inventory.version)
+            if index is None:
+                index = RoomIndex(inventory)
+                # Only the current version is ever queried
+                _index_cache.clear()
+                _index_cache[inventory.version] = index
+    return index
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(compact_json(list(key))).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    """(value, room id) to resume after; the value must have the sort key's type to bisect"""
+    try:
+        value, room_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise RoomQueryError('Invalid cursor')
+    expected = str if sort == 'name' else (int, float)
+    if (not isinstance(value, expected) or isinstance(value, bool)
+            or not isinstance(room_id, int) or isinstance(room_id, bool)):
+        raise RoomQueryError(f'Invalid cursor for sort={sort}')
+    return (value, room_id)
+
+
+def parse_room_query(args):
+    """Validate /api/rooms query parameters into RoomIndex.query arguments and a field list"""
+    def number(name, cast=int):
+        raw = args.get(name)
+        if raw in (None, ''):
+            return None
+        try:
+            return cast(raw)
+        except ValueError:
+            raise RoomQueryError(f'{name} must be a number')
+
+    sort = args.get('sort', 'price')
+    descending = sort.startswith('-')
+    sort = sort.lstrip('-')
+    if sort not in SORT_KEYS:
+        raise RoomQueryError(f"sort must be one of {', '.join(sorted(SORT_KEYS))}")
+
+    available = args.get('available')
+    if available is not None:
+        if available.lower() not in ('true', 'false', '1', '0'):
+            raise RoomQueryError('available must be true or false')
+        available = available.lower() in ('true', '1')
+
+    limit = number('limit')
+    limit = DEFAULT_PAGE_SIZE if limit is None else limit
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise RoomQueryError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    fields = None
+    if args.get('fields'):
+        fields = [field for field in args['fields'].split(',') if field]
+        unknown = set(fields) - PROJECTABLE_FIELDS
+        if unknown:
+            raise RoomQueryError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    categories = [normalize_category(c) for c in args.get('category', '').split(',') if c.strip()] or None
+    cursor = args.get('cursor')
+    query = {
+        'categories': categories,
+        'min_price': number('min_price', float),
+        'max_price': number('max_price', float),
+        'capacity': number('capacity'),
+        'available': available,
+        'sort': sort,
+        'descending': descending,
+        'after': decode_cursor(cursor, sort) if cursor else None,
+        'limit': limit
+    }
+    return query, fields
+
+
+def query_etag(version, args):
+    """ETag for one query against one inventory version"""
+    canonical = '&'.join(f'{key}={value}' for key, value in sorted(args.items(multi=True)))
+    return hashlib.sha1(f'{version}?{canonical}'.encode()).hexdigest()[:20]
+
+
+def render_room_page(rooms, total, next_key, version, fields=None):
+    """Serialize a page, reusing each room's cached JSON when no projection is requested"""
+    if fields is None:
+        items = b','.join(room.json_bytes for room in rooms)
+    else:
+        items = b','.join(compact_json({field: getattr(room, field) if field != 'amenities'
+                                  else list(room.amenities) for field in fields})
+                          for room in rooms)
+    meta = compact_json({
+        'total': total,
+        'next_cursor': encode_cursor(next_key) if next_key else None,
+        'version': version
+    })
+    return b'{"success":true,"rooms":[' + items + b'],' + meta[1:]
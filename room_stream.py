@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from flask import request
+
+
+def diff_inventories(previous, inventory):
+    """(changed rooms, removed room ids) between two inventory versions"""
+    before = {room.id: room.json_bytes for room in previous} if previous else {}
+    changed = [room for room in inventory if before.get(room.id) != room.json_bytes]
+    removed = [room_id for room_id in before if inventory.get(room_id) is None]
+    return changed, removed
+
+
+def _frame(event, event_id, data):
+    return b'id: %s\nevent: %s\ndata: %s\n\n' % (event_id.encode(), event.encode(), data)
+
+
+class RoomChangeBroker:
+    """Fans inventory changes out to every stream from one shared ring of pre-encoded events
+
+    Publishing encodes the change once, appends it and sets the event every waiting stream
+    holds; each stream then copies the frames after its own position, so there are no
+    per-subscriber queues and the producer does no per-subscriber work beyond the wake-up.
+    Event ids carry a per-process epoch, so a browser reconnecting to another worker
+    (or after a restart) is told to reload instead of trusting a foreign position.
+    """
+
+    def __init__(self, history=256, max_changes=500):
+        self.max_changes = max_changes
+        self.epoch = os.urandom(4).hex()
+        self.version = None
+        self.sequence = 0
+        self.subscribers = 0
+        self.published = 0
+        self._events = deque(maxlen=history)  # (sequence, frame)
+        self._lock = threading.Lock()
+        self._published = threading.Event()  # Replaced on every publish; waiters hold the one they saw
+
+    def event_id(self, sequence):
+        return f'{self.epoch}-{sequence}'
+
+    def parse_event_id(self, value):
+        """Sequence for a Last-Event-ID from this broker, or None"""
+        epoch, _, sequence = (value or '').partition('-')
+        if epoch != self.epoch or not sequence.isdigit() or int(sequence) > self.sequence:
+            return None
+        return int(sequence)
+
+    def publish_inventory(self, previous, inventory):
+        """Inventory listener: push the rooms that changed (or a reset when too many did)"""
+        if previous is inventory:
+            return
+        changed, removed = diff_inventories(previous, inventory)
+        if previous is not None and not changed and not removed:
+            self.version = inventory.version
+            return
+        if previous is None or len(changed) + len(removed) > self.max_changes:
+            self.publish('reset', json.dumps({'version': inventory.version}).encode(), inventory.version)
+        else:
+            data = b'{"version":%s,"changed":[%s],"removed":%s}' % (
+                json.dumps(inventory.version).encode(),
+                b','.join(room.json_bytes for room in changed),
+                json.dumps(removed).encode()
+            )
+            self.publish('rooms', data, inventory.version)
+
+    def publish(self, event, data, version=None):
+        with self._lock:
+            self.sequence += 1
+            self._events.append((self.sequence, _frame(event, self.event_id(self.sequence), data)))
+            if version is not None:
+                self.version = version
+            self.published += 1
+            published, self._published = self._published, threading.Event()
+        # Wake the streams outside the lock so they can start copying frames right away
+        published.set()
+
+    def wait(self, after, timeout):
+        """Frames published after sequence `after`, waiting up to timeout; None if they left the ring"""
+        with self._lock:
+            published = self._published
+            current = self.sequence
+        if current == after:
+            published.wait(timeout)
+        with self._lock:
+            if self.sequence == after:
+                return []
+            if not self._events or self._events[0][0] > after + 1:
+                return None
+            return [event for event in self._events if event[0] > after]
+
+    @contextmanager
+    def subscription(self):
+        with self._lock:
+            self.subscribers += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.subscribers -= 1
+
+    def stream(self, last_event_id=None, heartbeat=15.0, max_seconds=600.0):
+        """SSE body: replay since last_event_id, then live changes and keepalive comments"""
+        yield b'retry: 5000\n\n'
+        position = self.parse_event_id(last_event_id)
+        if position is None:
+            position = self.sequence
+            event = 'reset' if last_event_id else 'ready'
+            yield _frame(event, self.event_id(position), json.dumps({'version': self.version}).encode())
+        deadline = time.monotonic() + max_seconds
+        with self.subscription():
+            # Browsers reconnect with Last-Event-ID, so recycling long streams loses nothing
+            while time.monotonic() < deadline:
+                frames = self.wait(position, min(heartbeat, max(0.0, deadline - time.monotonic())))
+                if frames is None:
+                    position = self.sequence
+                    yield _frame('reset', self.event_id(position), json.dumps({'version': self.version}).encode())
+                elif frames:
+                    position = frames[-1][0]
+                    yield b''.join(frame for _, frame in frames)
+                else:
+                    yield b': keepalive\n\n'
+
+
+def init_room_stream(app, api_service):
+    """Register /api/rooms/stream, fed by the inventory listener on the API service"""
+    broker = RoomChangeBroker(app.config['ROOM_STREAM_HISTORY'], app.config['ROOM_STREAM_MAX_CHANGES'])
+    api_service.add_inventory_listener(broker.publish_inventory)
+    app.extensions['room_stream'] = broker
+
+    @app.route('/api/rooms/stream')
+    def room_stream():
+        """Server-Sent Events with the rooms whose availability or price changed"""
+        # Every open stream holds its worker; only serve them from the gevent entrypoint (stream_server.py)
+        if not app.config['ROOM_STREAM_ENABLED']:
+            return '', 204  # Tells EventSource not to reconnect
+        if broker.subscribers >= app.config['ROOM_STREAM_MAX_CLIENTS']:
+            return '', 204
+        response = app.response_class(
+            broker.stream(request.headers.get('Last-Event-ID'), app.config['ROOM_STREAM_HEARTBEAT'],
+                          app.config['ROOM_STREAM_MAX_SECONDS']),
+            mimetype='text/event-stream'
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # Let nginx pass events through unbuffered
+        return response
+
+    return broker
@@ -0,0 +1,240 @@
+import atexit
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class Job:
+    """A scheduled callable plus its run and lag statistics"""
+
+    __slots__ = ('name', 'func', 'interval', 'jitter', 'deadline', 'due', 'cancelled', 'running', 'runs', 'failures',
+                 'skipped', 'last_lag', 'max_lag', 'total_lag', 'last_duration')
+
+    def __init__(self, name, func, interval=None, jitter=0.0):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.deadline = None  # Requested run time, before jitter
+        self.due = None
+        self.cancelled = False
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0  # Deadlines that passed while the previous run was still going
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.last_duration = 0.0
+
+    def metrics(self):
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_lag_ms': round(self.last_lag * 1000, 2),
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'avg_lag_ms': round(self.total_lag / self.runs * 1000, 2) if self.runs else 0.0,
+            'last_duration_ms': round(self.last_duration * 1000, 2),
+            'next_run_in': round(self.due - time.monotonic(), 3) if self.due is not None else None
+        }
+
+
+class Scheduler:
+    """One thread per process sleeping until the earliest deadline; jobs run on a bounded thread pool
+
+    A job never overlaps itself, so the pool queue holds at most one entry per job. A job
+    function may return a number of seconds to choose its own next run; otherwise jobs with
+    an interval repeat and the rest run once. Jitter adds a random 0..jitter seconds to every
+    deadline and is re-drawn in forked children so workers spread out.
+    """
+
+    def __init__(self, max_workers=4, lag_warning=1.0, name='scheduler'):
+        self.max_workers = max_workers
+        self.lag_warning = lag_warning
+        self.name = name
+        self._heap = []
+        self._sequence = itertools.count()
+        self._jobs = {}
+        self._condition = threading.Condition()
+        self._executor = None
+        self._thread = None
+        self._pid = None
+        self._stopped = False
+        self._futures = set()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def schedule(self, func, delay=0.0, interval=None, jitter=0.0, name=None):
+        """Run func after delay seconds (then every interval seconds, if given); returns the Job
+
+        A job scheduled under the name of a live job replaces it, so re-creating the app
+        does not leave the old app's repeating jobs behind.
+        """
+        job = Job(name or getattr(func, '__name__', 'job'), func, interval, jitter)
+        with self._condition:
+            previous = self._jobs.get(job.name)
+            if previous is not None:
+                # Its heap entry goes stale; a run in progress finishes but is not rescheduled
+                previous.cancelled = True
+                previous.due = previous.deadline = None
+            self._jobs[job.name] = job
+            self._push(job, time.monotonic() + delay)
+        self._ensure_running()
+        return job
+
+    def reschedule(self, job, delay):
+        """Move a job's next run to delay seconds from now"""
+        with self._condition:
+            if job.cancelled:
+                return
+            self._push(job, time.monotonic() + delay)
+
+    def cancel(self, job):
+        with self._condition:
+            job.cancelled = True
+            job.due = job.deadline = None
+            if self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+            self._condition.notify()
+
+    def metrics(self):
+        """Per-job run counts, lag and duration"""
+        with self._condition:
+            return {name: job.metrics() for name, job in self._jobs.items()}
+
+    def shutdown(self, timeout=5.0):
+        """Stop scheduling and give running jobs up to timeout seconds to finish"""
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify()
+            futures = set(self._futures)
+            executor = self._executor
+        if futures:
+            wait(futures, timeout=timeout)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _push(self, job, deadline):
+        job.deadline = deadline
+        due = deadline + random.uniform(0, job.jitter) if job.jitter else deadline
+        job.due = due
+        # Earlier heap entries for the job become stale; _run skips entries whose due no longer matches
+        heapq.heappush(self._heap, (due, next(self._sequence), job))
+        self._condition.notify()
+
+    def _ensure_running(self):
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._condition:
+            if (self._pid == os.getpid() and self._thread is not None) or self._stopped:
+                return
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f'{self.name}-job')
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _after_fork(self):
+        # Only the forking thread exists in the child: rebuild locks and threads, re-draw jitter
+        self._condition = threading.Condition()
+        self._futures = set()
+        self._executor = None
+        self._thread = None
+        was_running = self._pid is not None and not self._stopped
+        self._pid = None
+        self._heap = []
+        with self._condition:
+            for job in self._jobs.values():
+                job.running = False
+                if job.deadline is not None and not job.cancelled:
+                    self._push(job, job.deadline)
+        if was_running:
+            self._ensure_running()
+
+    def _run(self):
+        condition = self._condition
+        with condition:
+            while not self._stopped:
+                if not self._heap:
+                    condition.wait()
+                    continue
+                due, _, job = self._heap[0]
+                now = time.monotonic()
+                if due > now:
+                    condition.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+                if job.cancelled or job.due != due:
+                    continue
+                job.due = job.deadline = None
+                if job.running:
+                    # Previous run still going: skip this deadline rather than queue work
+                    job.skipped += 1
+                    if job.interval:
+                        self._push(job, now + job.interval)
+                    continue
+                job.running = True
+                lag = now - due
+                try:
+                    future = self._executor.submit(self._execute, job, due, lag)
+                except RuntimeError:
+                    return  # Executor shut down
+                self._futures.add(future)
+                future.add_done_callback(self._futures.discard)
+
+    def _execute(self, job, due, lag):
+        # Name the pool thread after the job so stack samples and thread dumps show what it is doing
+        thread = threading.current_thread()
+        pool_name, thread.name = thread.name, f'{self.name}:{job.name}'
+        start = time.monotonic()
+        next_delay = None
+        try:
+            next_delay = job.func()
+        except Exception as e:
+            job.failures += 1
+            print(f"Scheduled job {job.name} failed: {e}")
+        finally:
+            thread.name = pool_name
+        finished = time.monotonic()
+        with self._condition:
+            job.running = False
+            job.runs += 1
+            job.last_lag = lag
+            job.max_lag = max(job.max_lag, lag)
+            job.total_lag += lag
+            job.last_duration = finished - start
+            if lag > self.lag_warning:
+                print(f"Scheduled job {job.name} started {lag:.2f}s late")
+            if job.cancelled or self._stopped:
+                return
+            if isinstance(next_delay, (int, float)) and not isinstance(next_delay, bool):
+                self._push(job, finished + max(0.0, next_delay))
+            elif job.interval:
+                # Keep to the original cadence unless a run overran it
+                self._push(job, max(due + job.interval, finished))
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Get or create the process-wide scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler(
+                    max_workers=int(os.getenv('SCHEDULER_MAX_WORKERS', 4)),
+                    lag_warning=float(os.getenv('SCHEDULER_LAG_WARNING', 1.0))
+                )
+                atexit.register(_scheduler.shutdown)
+    return _scheduler
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import re
+from threading import Lock
+
+from flask import render_template, request, url_for
+
+_STATIC_REF_RE = re.compile(r"""url_for\(\s*['"]static['"]\s*,\s*filename\s*=\s*['"]([^'"]+)['"]\s*\)""")
+
+
+def shell_assets(app):
+    """Static files referenced by the base template (the shell every page loads)"""
+    source, _, _ = app.jinja_loader.get_source(app.jinja_env, app.config['SERVICE_WORKER_SHELL_TEMPLATE'])
+    seen = []
+    for filename in _STATIC_REF_RE.findall(source):
+        if filename not in seen and os.path.isfile(os.path.join(app.static_folder, filename)):
+            seen.append(filename)
+    return seen
+
+
+def cache_version(app, assets, routes):
+    """Hash of shell asset contents, templates and BUILD_ID; changes on every deploy that changes them"""
+    digest = hashlib.sha1(app.config['BUILD_ID'].encode())
+    for filename in assets:
+        digest.update(filename.encode())
+        with open(os.path.join(app.static_folder, filename), 'rb') as f:
+            digest.update(f.read())
+    # Precached pages change whenever a template does
+    for name in sorted(app.jinja_env.list_templates()):
+        digest.update(name.encode())
+        digest.update(app.jinja_loader.get_source(app.jinja_env, name)[0].encode())
+    digest.update('\n'.join(routes).encode())
+    return digest.hexdigest()[:12]
+
+
+def init_service_worker(app):
+    """Serve a versioned /sw.js and /manifest.webmanifest generated from the shell assets and content routes"""
+    if not app.config['SERVICE_WORKER_ENABLED']:
+        return
+
+    state = {}
+    lock = Lock()
+
+    def build():
+        # Hashing assets reads a few MB, so do it once per worker on first use
+        if 'script' not in state:
+            with lock:
+                if 'script' not in state:
+                    routes = list(app.config['SERVICE_WORKER_ROUTES'])
+                    assets = shell_assets(app)
+                    version = cache_version(app, assets, routes)
+                    precache = routes + [url_for('static', filename=filename) for filename in assets]
+                    state['version'] = version
+                    state['script'] = render_template(
+                        'service-worker.js',
+                        version=version,
+                        precache=precache,
+                        network_first=list(app.config['SERVICE_WORKER_NETWORK_FIRST']),
+                        network_timeout_ms=int(app.config['SERVICE_WORKER_NETWORK_TIMEOUT'] * 1000),
+                        api_max_age_ms=int(app.config['SERVICE_WORKER_API_MAX_AGE'] * 1000)
+                    ).encode()
+        return state
+
+    @app.route('/sw.js')
+    def service_worker():
+        """Service worker script; always revalidated so a deploy is picked up on the next visit"""
+        response = app.response_class(build()['script'], mimetype='application/javascript')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['Service-Worker-Allowed'] = '/'
+        response.set_etag(state['version'])
+        return response.make_conditional(request)
+
+    @app.route('/manifest.webmanifest')
+    def web_manifest():
+        """Web app manifest for installing the site"""
+        manifest = {
+            'name': app.config['HOTEL_NAME'],
+            'short_name': 'Ngenda',
+            'description': f"{app.config['HOTEL_NAME']}, {app.config['HOTEL_LOCATION']}",
+            'start_url': '/',
+            'scope': '/',
+            'display': 'standalone',
+            'background_color': '#ffffff',
+            'theme_color': app.config['SERVICE_WORKER_THEME_COLOR'],
+            'icons': [{'src': url_for('static', filename='images/logo/logo.png'), 'type': 'image/png', 'sizes': 'any'}]
+        }
+        response = app.response_class(json.dumps(manifest), mimetype='application/manifest+json')
+        response.headers['Cache-Control'] = 'public, max-age=86400'
+        return response
+
+    @app.context_processor
+    def service_worker_context():
+        return {'service_worker_enabled': True}
@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+import click
+from flask import template_rendered, url_for
+from jinja2 import meta
+
+MANIFEST_NAME = '.export-manifest.json'
+
+
+def _digest(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def template_closure(app, names, cache):
+    """Templates rendered plus everything they extend, include or import"""
+    pending, seen = list(names), set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        if name not in cache:
+            source = app.jinja_loader.get_source(app.jinja_env, name)[0]
+            cache[name] = (source, [ref for ref in meta.find_referenced_templates(app.jinja_env.parse(source)) if ref])
+        pending.extend(cache[name][1])
+    return sorted(seen)
+
+
+def page_file(url):
+    """Output path for a URL: /about -> about/index.html (nginx: try_files $uri/index.html)"""
+    return os.path.join(url.strip('/'), 'index.html') if url.strip('/') else 'index.html'
+
+
+def site_pages(app, inventory, blog_store):
+    """(url, data key) for every exportable page; the key changes whenever the page's data does"""
+    pages = [(url, '') for url in app.config['STATIC_EXPORT_ROUTES']]
+    with app.test_request_context():
+        # Home page lists all rooms; each room page shows its category's rooms as "similar"
+        pages.insert(0, ('/', inventory.version))
+        for room in inventory:
+            category = [r for r in inventory if r.category == room.category]
+            pages.append((url_for('room_detail', room_id=room.id), _digest(repr(room), repr(category))))
+
+        posts, _ = blog_store.list_posts(per_page=app.config['BLOG_PAGE_SIZE'])
+        pages.append((url_for('blog'), _digest(repr(posts))))
+        for post in blog_store.list_posts(per_page=len(blog_store) or 1)[0]:
+            pages.append((url_for('blog_post', post_type=post.slug), _digest(repr(post))))
+    return pages
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f'{path}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, path)
+
+
+class SiteExporter:
+    """Renders pages into output_dir with .gz variants, skipping pages whose templates and data are unchanged"""
+
+    def __init__(self, app, output_dir, force=False):
+        self.app = app
+        self.output_dir = output_dir
+        self.force = force
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.previous = json.load(f)['pages']
+        except (OSError, ValueError, KeyError):
+            self.previous = {}
+        self.current = {}
+        self.stats = {'written': 0, 'unchanged': 0, 'failed': 0, 'removed': 0}
+        self._sources = {}
+        self._rendered = []
+
+    def fingerprint(self, templates, data_key):
+        closure = template_closure(self.app, templates, self._sources)
+        return _digest(data_key, *(name + '\0' + self._sources[name][0] for name in closure))
+
+    def _record_template(self, sender, template, context, **extra):
+        self._rendered.append(template.name)
+
+    def run(self, pages):
+        client = self.app.test_client()
+        with template_rendered.connected_to(self._record_template, self.app):
+            for url, data_key in pages:
+                self.export_page(client, url, data_key)
+
+        # Pages that no longer exist (e.g. a room left the inventory) must not be served stale
+        kept = {entry['file'] for entry in self.current.values()}
+        for url, entry in self.previous.items():
+            if url not in self.current and entry['file'] not in kept:
+                for path in (entry['file'], entry['file'] + '.gz'):
+                    try:
+                        os.remove(os.path.join(self.output_dir, path))
+                    except FileNotFoundError:
+                        pass
+                self.stats['removed'] += 1
+
+        _write(self.manifest_path,
+               json.dumps({'generated_at': int(time.time()), 'pages': self.current}, indent=1).encode())
+        return self.stats
+
+    def export_page(self, client, url, data_key):
+        """Render one page unless its fingerprint is unchanged"""
+        file_name = page_file(url)
+        path = os.path.join(self.output_dir, file_name)
+        entry = self.previous.get(url)
+        if entry and not self.force and os.path.exists(path) and os.path.exists(path + '.gz'):
+            try:
+                if self.fingerprint(entry['templates'], data_key) == entry['fingerprint']:
+                    self.current[url] = entry
+                    self.stats['unchanged'] += 1
+                    return
+            except Exception:
+                pass  # A template disappeared; re-render to find out what the page uses now
+
+        self._rendered.clear()
+        try:
+            response = client.get(url)
+            status = response.status_code
+        except Exception as e:
+            status = f'{type(e).__name__}: {e}'
+        if status != 200 or response.mimetype != 'text/html':
+            # Leave it to the app; nginx falls through when the file is missing
+            print(f"Skipping {url}: {status}")
+            self.stats['failed'] += 1
+            return
+
+        body = response.get_data()
+        templates = sorted(set(self._rendered))
+        _write(path, body)
+        _write(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+        self.current[url] = {'file': file_name, 'templates': templates,
+                             'fingerprint': self.fingerprint(templates, data_key)}
+        self.stats['written'] += 1
+
+
+def export_site(app, pages, output_dir, force=False):
+    """Export pages into output_dir; returns counts of written/unchanged/failed/removed pages"""
+    return SiteExporter(app, output_dir, force).run(pages)
+
+
+def init_static_export(app, get_rooms, blog_store):
+    """Register `flask export-static` to freeze content and room pages for nginx"""
+
+    @app.cli.command('export-static')
+    @click.option('--output', default=None, help='Directory to write (default STATIC_EXPORT_DIR)')
+    @click.option('--force', is_flag=True, help='Re-render every page even if unchanged')
+    def export_static_command(output, force):
+        """Render content routes and room pages to static HTML + gzip"""
+        output = output or app.config['STATIC_EXPORT_DIR']
+        start = time.perf_counter()
+        stats = export_site(app, site_pages(app, get_rooms(), blog_store), output, force=force)
+        click.echo(f"Exported to {output} in {time.perf_counter() - start:.2f} s: {stats['written']} written, "
+                   f"{stats['unchanged']} unchanged, {stats['failed']} skipped, {stats['removed']} removed")
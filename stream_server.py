@@ -0,0 +1,33 @@
+"""
+Gevent entrypoint for long-lived connections (/api/rooms/stream)
+
+Each open stream is a greenlet waiting on the shared room-change broker, so one
+process holds thousands of idle browsers. Run behind nginx next to the sync workers:
+
+    gunicorn -k gevent --worker-connections 10000 --workers 1 --bind 127.0.0.1:5003 stream_server:app
+
+or, without gunicorn, `python stream_server.py`.
+"""
+
+try:
+    from gevent import monkey
+    monkey.patch_all()  # Before anything imports socket, ssl or threading
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
+import os
+
+from app import app
+
+app.config['ROOM_STREAM_ENABLED'] = True
+
+if __name__ == '__main__':
+    port = int(os.environ.get('STREAM_PORT', 5003))
+    if GEVENT_AVAILABLE:
+        from gevent.pywsgi import WSGIServer
+        print(f"Serving room streams with gevent on port {port}")
+        WSGIServer(('0.0.0.0', port), app).serve_forever()
+    else:
+        print("Warning: gevent not available. Serving room streams with one thread per connection.")
+        app.run(host='0.0.0.0', port=port, threaded=True)
@@ -0,0 +1,40 @@
+import os
+import time
+
+import click
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+
+def precompile_templates(app):
+    """Compile every template so its bytecode lands in the cache; returns (count, seconds)"""
+    start = time.perf_counter()
+    count = 0
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        try:
+            app.jinja_env.get_template(name)
+            count += 1
+        except TemplateSyntaxError as e:
+            # A broken template only breaks its own route; report it and keep going
+            print(f"Skipping template {name}: {e.message} (line {e.lineno})")
+    return count, time.perf_counter() - start
+
+
+def init_template_cache(app):
+    """Use a persistent Jinja bytecode cache and optionally load all templates at startup"""
+    cache_dir = app.config.get('TEMPLATE_CACHE_DIR')
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+    @app.cli.command('precompile-templates')
+    def precompile_templates_command():
+        """Compile all templates into TEMPLATE_CACHE_DIR (run on deploy)"""
+        if not cache_dir:
+            raise click.ClickException('TEMPLATE_CACHE_DIR is not configured')
+        count, seconds = precompile_templates(app)
+        click.echo(f"Compiled {count} templates into {cache_dir} in {seconds * 1000:.0f} ms")
+
+    if app.config.get('TEMPLATE_PRELOAD'):
+        # Workers then serve their first request without compiling or even reading templates
+        count, seconds = precompile_templates(app)
+        print(f"Preloaded {count} templates in {seconds * 1000:.0f} ms")
@@ -0,0 +1,89 @@
+/* Ngenda Hotel service worker - generated by service_worker.py, do not edit the served copy */
+const VERSION = {{ version|tojson }};
+const PRECACHE = `ngenda-precache-${VERSION}`;
+const RUNTIME = `ngenda-runtime-${VERSION}`;
+const PRECACHE_URLS = {{ precache|tojson }};
+const NETWORK_FIRST = {{ network_first|tojson }};
+const NETWORK_TIMEOUT_MS = {{ network_timeout_ms }};
+const API_MAX_AGE_MS = {{ api_max_age_ms }};
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(PRECACHE)
+            .then((cache) => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // Drop caches from previous deploys
+    event.waitUntil(
+        caches.keys()
+            .then((keys) => Promise.all(
+                keys.filter((key) => key.startsWith('ngenda-') && key !== PRECACHE && key !== RUNTIME)
+                    .map((key) => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+// Cache-first, refreshing the cached copy in the background
+function staleWhileRevalidate(event, cacheName) {
+    const refresh = fetch(event.request).then((response) => {
+        if (response.ok) {
+            const copy = response.clone();
+            caches.open(cacheName).then((cache) => cache.put(event.request, copy));
+        }
+        return response;
+    });
+    event.waitUntil(refresh.catch(() => undefined));
+    return caches.match(event.request).then((cached) => cached || refresh);
+}
+
+// Network-first; falls back to a recent cached copy when the network is slow or down
+function networkFirst(event) {
+    const network = fetch(event.request).then((response) => {
+        if (response.ok) {
+            const copy = response.clone();
+            event.waitUntil(copy.blob().then((body) => {
+                const headers = new Headers(copy.headers);
+                headers.set('sw-cached-at', String(Date.now()));
+                return caches.open(RUNTIME).then((cache) => cache.put(event.request, new Response(body, {
+                    status: copy.status, statusText: copy.statusText, headers: headers
+                })));
+            }));
+        }
+        return response;
+    });
+    const fallback = () => caches.open(RUNTIME).then((cache) => cache.match(event.request)).then((cached) => {
+        const age = cached ? Date.now() - Number(cached.headers.get('sw-cached-at')) : Infinity;
+        if (age <= API_MAX_AGE_MS) {
+            return cached;
+        }
+        return network;
+    });
+    const timeout = new Promise((resolve) => setTimeout(resolve, NETWORK_TIMEOUT_MS)).then(fallback);
+    return Promise.race([network.catch(fallback), timeout]);
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+    // Event streams (/api/rooms/stream) never end; copying one into the cache would buffer it forever
+    if ((request.headers.get('Accept') || '').includes('text/event-stream')) {
+        return;
+    }
+    if (NETWORK_FIRST.some((path) => url.pathname.startsWith(path))) {
+        event.respondWith(networkFirst(event));
+    } else if (PRECACHE_URLS.includes(url.pathname)) {
+        event.respondWith(staleWhileRevalidate(event, PRECACHE));
+    } else if (url.pathname.startsWith('/static/')) {
+        event.respondWith(staleWhileRevalidate(event, RUNTIME));
+    } else if (request.mode === 'navigate') {
+        // Other pages stay network-only, but an offline visit still gets the home page
+        event.respondWith(fetch(request).catch(() => caches.match('/')));
+    }
+});
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control: per-client rate limits and HMS load shedding
+"""
+
+import sys
+import os
+import tempfile
+from datetime import date, timedelta
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from admission_control import (
+    ConcurrencyLimiter, HMSOverloadedError, MemoryRateLimitBackend, SQLiteRateLimitBackend
+)
+
+
+def test_token_bucket_refills_at_rate():
+    """Burst is allowed up front, then one token per 1/rate seconds"""
+    backend = MemoryRateLimitBackend()
+    assert [backend.take('k', 1.0, 2, now=0)[0] for _ in range(3)] == [True, True, False]
+    allowed, retry_after = backend.take('k', 1.0, 2, now=0)
+    assert not allowed and retry_after == 1.0
+    assert backend.take('k', 1.0, 2, now=1.0)[0]
+    # Other clients have their own bucket
+    assert backend.take('other', 1.0, 2, now=0)[0]
+
+
+def test_sqlite_backend_shares_buckets_between_workers():
+    """Two backends on one file behave like two workers sharing a limit"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'limits.db')
+        worker_a, worker_b = SQLiteRateLimitBackend(path), SQLiteRateLimitBackend(path)
+        assert worker_a.take('k', 0.001, 2, now=100)[0]
+        assert worker_b.take('k', 0.001, 2, now=100)[0]
+        assert not worker_a.take('k', 0.001, 2, now=100)[0]
+
+
+def test_sqlite_backend_prunes_refilled_buckets():
+    """Idle clients' rows are deleted once their buckets are full again; limits are unchanged"""
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteRateLimitBackend(os.path.join(tmp, 'limits.db'))
+        for client in range(100):
+            backend.take(f'contact:10.0.0.{client}', 1.0, 2, now=100)
+        backend.take('contact:busy', 1.0, 2, now=100)
+        backend.take('contact:busy', 1.0, 2, now=100)
+        assert backend.prune(now=100.5) == 0
+        assert backend.prune(now=101) == 100  # One token taken refills in 1s; the busy client needs 2s
+        assert backend.take('contact:busy', 1.0, 2, now=101.5) == (True, 0)  # Its bucket was kept, 1.5 tokens
+        assert not backend.take('contact:busy', 1.0, 2, now=101.5)[0]
+        assert backend.prune(now=200) == 1
+        assert backend._connection().execute('SELECT COUNT(*) FROM rate_limit_buckets').fetchone()[0] == 0
+
+
+def test_contact_post_is_rate_limited_per_client():
+    """Repeated contact POSTs get a fast 429 with Retry-After; GETs are unaffected"""
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        form = {'username': 'Bot', 'email': '', 'message': 'spam'}
+        statuses = [client.post('/contact', data=form).status_code for _ in range(4)]
+        assert statuses == [200, 200, 200, 429]
+        response = client.post('/contact', data=form)
+        assert int(response.headers['Retry-After']) >= 1
+        assert client.get('/contact').status_code == 200
+        # A different client address still gets through
+        other = client.post('/contact', data=form, environ_base={'REMOTE_ADDR': '10.0.0.9'})
+        assert other.status_code == 200
+
+
+def test_booking_is_shed_when_hms_slots_are_exhausted():
+    """No free HMS slot means an immediate 503, never a mock booking"""
+    from app import create_app
+    app = create_app('development')
+    limiter = ConcurrencyLimiter(1, timeout=0.01)
+    with app.test_client() as client, limiter.slot():
+        # Point the app's API service at the saturated limiter and live mode
+        service = app.extensions['hotel_api']
+        service.hms_limiter = limiter
+        service.set_live_mode()
+        response = client.post('/book', data={
+            'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1',
+            'room_id': '1', 'room_type': 'Standard', 'check_in': (date.today() + timedelta(days=40)).isoformat(),
+            'check_out': (date.today() + timedelta(days=41)).isoformat()
+        })
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert limiter.rejected == 1
+
+
+def test_limiter_releases_slots():
+    limiter = ConcurrencyLimiter(1, timeout=0)
+    with limiter.slot():
+        try:
+            with limiter.slot():
+                assert False, 'second slot should be shed'
+        except HMSOverloadedError:
+            pass
+    with limiter.slot():
+        assert limiter.in_flight == 1
+
+
+if __name__ == '__main__':
+    test_token_bucket_refills_at_rate()
+    test_sqlite_backend_shares_buckets_between_workers()
+    test_sqlite_backend_prunes_refilled_buckets()
+    test_contact_post_is_rate_limited_per_client()
+    test_booking_is_shed_when_hms_slots_are_exhausted()
+    test_limiter_releases_slots()
+    print("✅ All admission control tests passed!")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for group bookings via /api/bookings/batch
+"""
+
+import sys
+import os
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_service import HotelAPIService
+from fake_hms import FakeHMS
+
+
+def _booking(room_id, check_in='2026-12-01', check_out='2026-12-03'):
+    return {
+        'room_id': room_id,
+        'room_type': 'Standard Double Room',
+        'check_in': check_in,
+        'check_out': check_out,
+        'guests': 2
+    }
+
+
+def _live_service(hms):
+    service = HotelAPIService(hms.url)
+    service.auth_service.base_url = hms.url
+    service.set_live_mode()
+    return service
+
+
+def test_batch_endpoint_validates_whole_group():
+    """One bad item rejects the group before anything is submitted"""
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        response = client.post('/api/bookings/batch', json={
+            'guest_name': 'Tour Operator',
+            'guest_email': 'ops@example.com',
+            'guest_phone': '+255700000000',
+            'bookings': [
+                _booking(1),
+                _booking(1, '2026-12-02', '2026-12-04'),  # overlaps item 0
+                {**_booking(2), 'check_out': '2026-11-30'}
+            ]
+        })
+        assert response.status_code == 400
+        assert [error['index'] for error in response.get_json()['errors']] == [1, 2]
+
+        response = client.post('/api/bookings/batch', json={
+            'guest_name': 'Tour Operator',
+            'guest_email': 'ops@example.com',
+            'guest_phone': '+255700000000',
+            'bookings': [_booking(1), _booking(2), _booking(3)]
+        })
+        result = response.get_json()
+        assert response.status_code == 200
+        assert result['confirmed'] == 3
+        assert len({item['booking_id'] for item in result['results']}) == 3
+
+
+def test_batch_endpoint_rejects_wrongly_typed_input():
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        response = client.post('/api/bookings/batch', json={
+            'guest_name': 'Tour Operator',
+            'guest_email': 'ops@example.com',
+            'guest_phone': '+255700000000',
+            'bookings': [{**_booking(1), 'guests': None}, {**_booking(2), 'guests': [2]},
+                         {**_booking(3), 'room_id': [3]}]
+        })
+        assert response.status_code == 400
+        assert [error['index'] for error in response.get_json()['errors']] == [0, 1, 2]
+        assert client.post('/api/bookings/batch', json=[1]).status_code == 400
+
+
+def test_batch_submits_concurrently_with_bounded_parallelism():
+    """Items run in parallel, capped at max_workers, with one auth lookup"""
+    guest = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1'}
+    with FakeHMS(booking_delay=0.05) as hms:
+        service = _live_service(hms)
+        result = service.create_bookings_batch(
+            [{**guest, **_booking(room_id)} for room_id in range(1, 9)], max_workers=3
+        )
+        assert result['success'] and result['confirmed'] == 8
+        assert hms.max_in_flight == 3
+
+
+def test_batch_all_or_nothing_compensates():
+    """A failed item cancels the bookings that already succeeded"""
+    guest = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1'}
+    with FakeHMS(fail_rooms=[2]) as hms:
+        service = _live_service(hms)
+        result = service.create_bookings_batch(
+            [{**guest, **_booking(room_id)} for room_id in (1, 2, 3)], all_or_nothing=True
+        )
+        assert not result['success']
+        assert [item['status'] for item in result['results']] == ['cancelled', 'failed', 'cancelled']
+        assert hms.bookings == {}
+        assert len(hms.cancelled) == 2
+
+
+def test_batch_uses_bulk_endpoint_when_supported():
+    """A configured bulk endpoint replaces the per-item POSTs"""
+    guest = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1'}
+    with FakeHMS(bulk=True) as hms:
+        service = _live_service(hms)
+        service.bulk_bookings_endpoint = '/api/bookings/bulk'
+        result = service.create_bookings_batch([{**guest, **_booking(room_id)} for room_id in (1, 2)])
+        assert result['confirmed'] == 2
+        assert ('POST', '/api/bookings/') not in hms.requests
+
+
+def test_bulk_failure_is_never_resubmitted_per_item():
+    """A 5xx after the HMS may have booked the group reports unknown instead of booking twice"""
+    guest = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1'}
+    with FakeHMS(bulk=True) as hms:
+        hms.bulk_status = 502
+        service = _live_service(hms)
+        service.bulk_bookings_endpoint = '/api/bookings/bulk'
+        result = service.create_bookings_batch([{**guest, **_booking(room_id)} for room_id in (1, 2)])
+        assert [item['status'] for item in result['results']] == ['unknown', 'unknown']
+        assert 'contact the hotel' in result['results'][0]['message']
+        assert ('POST', '/api/bookings/') not in hms.requests
+        assert len(hms.bookings) == 2 and service._bulk_supported
+
+
+def test_bulk_retries_once_with_refreshed_token():
+    """A 401 refreshes the token and resends with the new headers"""
+    guest = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1'}
+    with FakeHMS(bulk=True) as hms:
+        service = _live_service(hms)
+        service.bulk_bookings_endpoint = '/api/bookings/bulk'
+        stale = service.auth_service.get_auth_headers()['Authorization'].removeprefix('Bearer ')
+        hms.revoked_tokens.add(stale)
+        result = service.create_bookings_batch([{**guest, **_booking(room_id)} for room_id in (1, 2)])
+        assert result['confirmed'] == 2
+        assert hms.requests.count(('POST', '/api/bookings/bulk')) == 2
+        assert ('POST', '/api/bookings/') not in hms.requests
+
+
+def test_timed_out_item_is_unknown_not_failed():
+    """A read timeout after the POST was sent may still be a booking, unlike a refused connection"""
+    import time
+    guest = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1'}
+    with FakeHMS(booking_delay=0.3) as hms:
+        service = _live_service(hms)
+        service.timeout = 0.1
+        result = service.create_bookings_batch([{**guest, **_booking(1)}], all_or_nothing=True)
+        assert result['results'][0]['status'] == 'unknown'
+        assert 'contact the hotel' in result['results'][0]['message']
+        time.sleep(0.4)
+        assert len(hms.bookings) == 1 and hms.cancelled == []
+
+        service.base_url = 'http://127.0.0.1:9'  # Nothing listens here
+        result = service.create_bookings_batch([{**guest, **_booking(2)}])
+        assert result['results'][0]['status'] == 'failed'
+
+
+if __name__ == '__main__':
+    test_batch_endpoint_validates_whole_group()
+    test_batch_endpoint_rejects_wrongly_typed_input()
+    test_batch_submits_concurrently_with_bounded_parallelism()
+    test_batch_all_or_nothing_compensates()
+    test_batch_uses_bulk_endpoint_when_supported()
+    test_bulk_failure_is_never_resubmitted_per_item()
+    test_bulk_retries_once_with_refreshed_token()
+    test_timed_out_item_is_unknown_not_failed()
+    print("✅ All batch booking tests passed!")
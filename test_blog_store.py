@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the blog content store and search index
+Run directly to print load/search timings for thousands of posts
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import time
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from blog_store import BlogStore
+
+
+def _write(directory, name, text):
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_loads_markdown_and_json_posts():
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(tmp, 'kitulo.md', '---\ntitle: Kitulo Plateau\ndate: 2026-03-01\ntags: travel, flowers\n---\n'
+                                 'The **garden of God** blooms after the rains.\n\n- orchids\n- lilies\n')
+        _write(tmp, 'rates.json', json.dumps({'title': 'Group rates', 'date': '2026-04-01',
+                                              'body': 'Discounts for tour operators booking five rooms.'}))
+        store = BlogStore(tmp)
+        posts, total = store.list_posts()
+        assert total == 2 and [post.slug for post in posts] == ['rates', 'kitulo']
+        post = store.get_post('kitulo')
+        assert post.tags == ('travel', 'flowers')
+        assert '<strong>garden of God</strong>' in post.html and '<li>orchids</li>' in post.html
+        assert store.list_posts(tag='flowers')[1] == 1
+
+
+def test_skips_malformed_json_posts():
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(tmp, 'list.json', '["not", "a", "post"]')
+        _write(tmp, 'string.json', '"just text"')
+        _write(tmp, 'broken.json', '{"title": ')
+        _write(tmp, 'ok.md', '---\ntitle: Still here\n---\nBody')
+        posts, total = BlogStore(tmp).list_posts()
+        assert total == 1 and posts[0].slug == 'ok'
+
+
+def test_odd_posts_load_or_are_skipped_without_crashing():
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(tmp, 'draft.md', '---\ntitle: Coming soon\n---\n')
+        _write(tmp, 'null-body.json', json.dumps({'title': 'No body yet', 'body': None, 'tags': None}))
+        _write(tmp, 'bad-tags.json', json.dumps({'title': 'Numbered', 'tags': 5}))
+        _write(tmp, 'bad-title.json', json.dumps({'title': ['not', 'text'], 'body': 'Hi'}))
+        store = BlogStore(tmp)
+        posts, total = store.list_posts()
+        assert total == 2 and {post.slug for post in posts} == {'draft', 'null-body'}
+        assert store.get_post('draft').html == '' and store.get_post('null-body').tags == ()
+
+
+def test_search_ranks_title_matches_first():
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(tmp, 'a.md', '---\ntitle: Breakfast menu\ndate: 2026-01-01\n---\nFresh coffee from Mbeya farms.')
+        _write(tmp, 'b.md', '---\ntitle: Coffee tours\ndate: 2026-01-02\n---\nVisit a coffee estate near town.')
+        _write(tmp, 'c.md', '---\ntitle: Parking\ndate: 2026-01-03\n---\nSecure parking for guests.')
+        store = BlogStore(tmp)
+        posts, total = store.search('Coffee')
+        assert total == 2 and [post.slug for post in posts] == ['b', 'a']
+        assert store.search('the and') == ([], 0)
+
+
+def test_reparses_only_changed_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(tmp, 'a.md', 'First version')
+        _write(tmp, 'b.md', 'Unchanged')
+        store = BlogStore(tmp, reload_interval=0)
+        unchanged = store.get_post('b')
+        _write(tmp, 'a.md', 'Second version')
+        os.utime(os.path.join(tmp, 'a.md'), (time.time() + 10, time.time() + 10))
+        assert 'Second version' in store.get_post('a').html
+        assert store.get_post('b') is unchanged
+
+
+def test_blog_routes():
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        assert client.get('/blog').status_code == 200
+        assert client.get('/blog/welcome-to-ngenda').status_code == 200
+        assert client.get('/blog/search?q=waterfalls').status_code == 200
+        data = client.get('/api/blog/search?q=waterfalls').get_json()
+        assert data['posts'][0]['slug'] == 'exploring-mbeya'
+        assert client.get('/api/blog/posts?per_page=1').get_json()['total'] == 2
+        assert client.get('/api/blog/posts/missing').status_code == 404
+
+
+def benchmark_blog_store(count=5000):
+    words = ('mbeya room lake coffee tea safari breakfast family apartment balcony view '
+             'mountain waterfall crater plateau market airport transfer conference wedding').split()
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(count):
+            body = ' '.join(rng.choice(words) for _ in range(300))
+            _write(tmp, f'post-{i}.md', f'---\ntitle: Post {i} {rng.choice(words)}\ndate: 2025-01-01\n---\n{body}')
+        start = time.perf_counter()
+        store = BlogStore(tmp)
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(100):
+            store.search('coffee waterfall')
+        search = (time.perf_counter() - start) / 100
+        start = time.perf_counter()
+        for _ in range(100):
+            store.list_posts(page=50)
+        listing = (time.perf_counter() - start) / 100
+    print(f"{count} posts: load+render+index {load:.2f} s, search {search * 1000:.2f} ms, "
+          f"page listing {listing * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    test_loads_markdown_and_json_posts()
+    test_skips_malformed_json_posts()
+    test_odd_posts_load_or_are_skipped_without_crashing()
+    test_search_ranks_title_matches_first()
+    test_reparses_only_changed_files()
+    print("✓ Blog store tests passed")
+    benchmark_blog_store()
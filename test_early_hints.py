@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for Link preload headers and 103 Early Hints
+"""
+
+import sys
+import os
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from early_hints import CriticalAssetParser, build_link_header
+
+
+def test_parser_collects_local_assets_and_origins():
+    parser = CriticalAssetParser()
+    parser.feed('<html><head><link rel="stylesheet" href="/static/a.css">'
+                '<link href="https://fonts.example.com/css?family=X" rel="stylesheet">'
+                '<link rel="preload" href="/static/hero.jpg" as="image"></head>'
+                '<body><script defer src="/static/a.js"></script><script>inline()</script></body></html>')
+    assert build_link_header(parser, ['/static/f.woff2'], max_assets=3) == (
+        '<https://fonts.example.com>; rel=preconnect, </static/a.css>; rel=preload; as=style, '
+        '</static/f.woff2>; rel=preload; as=font; crossorigin, </static/hero.jpg>; rel=preload; as=image'
+    )
+
+
+def test_pages_send_preload_links_and_early_hints():
+    from app import create_app
+    app = create_app('development')
+    hints = []
+    with app.test_client() as client:
+        # The first render of an endpoint is parsed; later requests also get the 103 up front
+        first = client.get('/faq', environ_overrides={'wsgi.early_hints': hints.append})
+        assert hints == []
+        second = client.get('/faq', environ_overrides={'wsgi.early_hints': hints.append})
+        assert first.headers['Link'] == second.headers['Link'] == hints[0][0][1]
+        link = second.headers['Link']
+        assert '</static/css/bootstrap.min.css>; rel=preload; as=style' in link
+        assert '</static/js/jquery-3.7.1.min.js>; rel=preload; as=script' in link
+        assert 'fontawesome-webfont.woff2>; rel=preload; as=font; crossorigin' in link
+        assert link.index('style.css') < link.index('jquery')
+
+        assert 'Link' not in client.get('/api/rooms').headers
+
+
+if __name__ == '__main__':
+    test_parser_collects_local_assets_and_origins()
+    test_pages_send_preload_links_and_early_hints()
+    print("✓ Early hints tests passed")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for booking-funnel event collection
+
+Run directly to benchmark the per-event cost on the request path.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_hms import FakeHMS
+from funnel_events import FUNNEL_STAGES, FunnelEvents, funnel_report
+
+ROOMS = [{'id': 1, 'name': 'Standard', 'category': 'classic', 'price': 80000},
+         {'id': 2, 'name': 'Superior', 'category': 'superior', 'price': 120000}]
+BOOKING = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1', 'room_id': '1',
+           'room_type': 'Standard', 'check_in': (date.today() + timedelta(days=40)).isoformat(),
+           'check_out': (date.today() + timedelta(days=42)).isoformat(), 'visitor': 'v1'}
+
+
+def test_events_flush_in_batches_and_aggregate_across_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'funnel.db')
+        worker_a, worker_b = FunnelEvents(path, batch_size=2), FunnelEvents(path)
+        for visitor in ('v1', 'v2', 'v3'):
+            worker_a.record('room_select', '1', visitor)
+        worker_b.record('room_select', '2', 'v1')
+        worker_b.record('book_submit', '2', 'v1')
+        assert worker_a.counts()['room_select'] == {'events': 0, 'visitors': 0}  # Nothing flushed yet
+        assert worker_a.flush() == 3 and worker_b.flush() == 2 and worker_a.flush() == 0
+        counts = worker_b.counts()
+        assert counts['room_select'] == {'events': 4, 'visitors': 3}
+        assert counts['book_submit'] == {'events': 1, 'visitors': 1}
+        assert list(counts) == list(FUNNEL_STAGES)
+        assert worker_a.counts(since=time.time() + 60)['room_select']['events'] == 0
+
+
+def test_full_buffer_drops_oldest_events():
+    with tempfile.TemporaryDirectory() as tmp:
+        events = FunnelEvents(os.path.join(tmp, 'funnel.db'), capacity=3)
+        for room_id in range(5):
+            events.record('room_select', str(room_id))
+        assert events.dropped == 2
+        events.flush()
+        rows = sqlite3.connect(events.path).execute('SELECT room_id FROM funnel_events ORDER BY rowid').fetchall()
+        assert [row[0] for row in rows] == ['2', '3', '4']
+        assert events.dropped == 2
+
+
+def test_concurrent_records_count_every_drop():
+    with tempfile.TemporaryDirectory() as tmp:
+        events = FunnelEvents(os.path.join(tmp, 'funnel.db'), capacity=100)
+
+        def record():
+            for _ in range(20000):
+                events.record('room_select')
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert events.dropped == 4 * 20000 - 100
+        assert events.flush() == 100
+
+
+def test_failed_flush_rolls_back_and_keeps_the_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        events = FunnelEvents(os.path.join(tmp, 'funnel.db'), capacity=4, batch_size=2)
+        events.counts()  # Creates the table
+        events._db().execute('PRAGMA busy_timeout = 0')
+        other = sqlite3.connect(events.path, isolation_level=None)
+        other.execute('BEGIN IMMEDIATE')  # Another worker holds the write lock
+        for room_id in ('1', '2', '3'):
+            events.record('room_select', room_id)
+        try:
+            events.flush()
+            assert False, 'flush should raise "database is locked"'
+        except sqlite3.OperationalError:
+            pass
+        events.record('room_select', '4')
+        events.record('room_select', '5')  # Ring is full again: the oldest event goes
+        assert events.dropped == 1
+
+        other.execute('COMMIT')
+        assert events.flush() == 4  # No transaction left open by the failure
+        rows = other.execute('SELECT room_id FROM funnel_events ORDER BY rowid').fetchall()
+        assert [row[0] for row in rows] == ['2', '3', '4', '5']
+
+
+def test_scheduled_flush_keeps_its_interval():
+    """The job must not return the row count, which the scheduler would read as the next delay"""
+    from flask import Flask
+    from funnel_events import init_funnel_events
+
+    class RecordingScheduler:
+        def schedule(self, func, **kwargs):
+            self.func, self.kwargs = func, kwargs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config.update(FUNNEL_EVENTS_ENABLED=True, FUNNEL_EVENTS_DB=os.path.join(tmp, 'funnel.db'),
+                          FUNNEL_BUFFER_SIZE=10, FUNNEL_FLUSH_BATCH=10, FUNNEL_FLUSH_INTERVAL=5)
+        scheduler = RecordingScheduler()
+        events = init_funnel_events(app, scheduler)
+        events.record('room_select')
+        assert scheduler.func() is None and scheduler.kwargs['interval'] == 5
+        assert events.counts()['room_select']['events'] == 1
+
+
+def test_funnel_endpoint_closed_without_token():
+    from app import create_app
+    from config import DevelopmentConfig, config
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class OpenFunnelConfig(DevelopmentConfig):
+            FUNNEL_EVENTS_DB = os.path.join(tmp, 'funnel.db')
+            FUNNEL_API_TOKEN = None
+
+        config['funnel_open_test'] = OpenFunnelConfig
+        with create_app('funnel_open_test').test_client() as client:
+            assert client.get('/api/funnel').status_code == 404
+            assert client.get('/api/funnel', headers={'Authorization': 'Bearer '}).status_code == 404
+
+
+def test_funnel_report_conversion():
+    counts = {stage: {'events': 0, 'visitors': 0} for stage in FUNNEL_STAGES}
+    for stage, events in (('room_select', 200), ('date_pick', 100), ('book_submit', 40), ('book_success', 30),
+                          ('book_failure', 6), ('book_mock_fallback', 4)):
+        counts[stage] = {'events': events, 'visitors': events}
+    report = {row['stage']: row['conversion'] for row in funnel_report(counts)}
+    assert report == {'room_select': None, 'date_pick': 0.5, 'book_submit': 0.4, 'book_success': 0.75,
+                      'book_mock_fallback': 0.1, 'book_failure': 0.15}
+
+
+def test_endpoints_record_browser_and_booking_events():
+    from app import create_app
+    from config import DevelopmentConfig, config
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class FunnelTestConfig(DevelopmentConfig):
+            FUNNEL_EVENTS_DB = os.path.join(tmp, 'funnel.db')
+            FUNNEL_API_TOKEN = 'secret'
+
+        config['funnel_test'] = FunnelTestConfig
+        app = create_app('funnel_test')
+        with FakeHMS(ROOMS, fail_rooms=[2]) as hms, app.test_client() as client:
+            response = client.post('/api/events', json={'visitor': 'v1', 'events': [
+                {'stage': 'room_select', 'room_id': 1}, {'stage': 'date_pick', 'room_id': 1},
+                {'stage': 'book_success'}  # Server-side stages are not accepted from browsers
+            ]})
+            assert response.status_code == 204
+            assert client.post('/api/events', json={'events': [{'stage': 'book_success'}]}).status_code == 400
+
+            assert client.post('/book', data=BOOKING).status_code == 200  # Mock mode: a real success
+            assert client.post('/book', data=BOOKING).status_code == 409  # Same room and dates are held
+            service = app.extensions['hotel_api']
+            service.base_url = hms.url
+            service.auth_service.base_url = hms.url
+            service.set_live_mode()
+            client.post('/book', data={**BOOKING, 'room_id': '2'})  # HMS refuses, guest sees a mock booking
+
+            assert client.get('/api/funnel').status_code == 401
+            auth = {'Authorization': 'Bearer secret'}
+            for hours in ('nan', 'inf', '-1', 'x'):
+                assert client.get(f'/api/funnel?hours={hours}', headers=auth).status_code == 400
+            data = client.get('/api/funnel', headers=auth).get_json()
+            stages = {row['stage']: row['events'] for row in data['stages']}
+            assert stages == {'room_select': 1, 'date_pick': 1, 'book_submit': 3, 'book_success': 1,
+                              'book_mock_fallback': 1, 'book_failure': 1}
+            assert data['dropped'] == 0
+
+
+def benchmark_record(iterations=200000):
+    with tempfile.TemporaryDirectory() as tmp:
+        events = FunnelEvents(os.path.join(tmp, 'funnel.db'), capacity=iterations)
+        start = time.perf_counter()
+        for i in range(iterations):
+            events.record('room_select', '12', 'visitor-1')
+        per_event = (time.perf_counter() - start) / iterations
+        start = time.perf_counter()
+        events.flush()
+        flush = time.perf_counter() - start
+
+        # Baseline: one synchronous INSERT per event, as logging straight to the database would do
+        db = sqlite3.connect(os.path.join(tmp, 'sync.db'), isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE funnel_events (ts REAL, stage TEXT, room_id TEXT, visitor TEXT, detail TEXT)')
+        start = time.perf_counter()
+        for i in range(2000):
+            db.execute('INSERT INTO funnel_events VALUES (?, ?, ?, ?, ?)', (time.time(), 'room_select', '12', 'v', None))
+        synchronous = (time.perf_counter() - start) / 2000
+        print(f"record(): {per_event * 1e6:.2f} µs/event; flush {iterations} events in {flush * 1000:.0f} ms "
+              f"({flush / iterations * 1e6:.2f} µs/event off the request path); "
+              f"synchronous INSERT: {synchronous * 1e6:.1f} µs/event")
+
+
+if __name__ == '__main__':
+    test_events_flush_in_batches_and_aggregate_across_workers()
+    test_full_buffer_drops_oldest_events()
+    test_concurrent_records_count_every_drop()
+    test_failed_flush_rolls_back_and_keeps_the_batch()
+    test_scheduled_flush_keeps_its_interval()
+    test_funnel_endpoint_closed_without_token()
+    test_funnel_report_conversion()
+    test_endpoints_record_browser_and_booking_events()
+    print("✓ Funnel event tests passed")
+    benchmark_record()
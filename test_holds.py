@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for local reservation holds
+
+Run directly to benchmark how fast a conflicting hold is rejected.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_hms import FakeHMS
+from reservation_holds import HoldConflictError, HoldStore, create_hold_store
+
+DEC_1, DEC_3, DEC_5 = date(2026, 12, 1), date(2026, 12, 3), date(2026, 12, 5)
+def _day(days):
+    """ISO date `days` from today, so endpoint tests never book in the past"""
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+ROOMS = [{'id': room_id, 'name': f'Room {room_id}', 'category': 'classic', 'price': 80000} for room_id in (1, 2, 3)]
+
+
+def _conflicts(store, room_id, check_in, check_out):
+    try:
+        store.acquire(room_id, check_in, check_out)
+    except HoldConflictError:
+        return True
+    return False
+
+
+def _check_overlaps(store):
+    hold = store.acquire(1, DEC_1, DEC_3)
+    assert _conflicts(store, 1, DEC_1, DEC_3)
+    assert _conflicts(store, '1', date(2026, 11, 30), date(2026, 12, 2))
+    # Back-to-back stays share the changeover day, other rooms are independent
+    assert not _conflicts(store, 1, DEC_3, DEC_5)
+    assert not _conflicts(store, 1, date(2026, 11, 29), DEC_1)
+    assert not _conflicts(store, 2, DEC_1, DEC_3)
+    assert store.release(hold.hold_id) and not store.release(hold.hold_id)
+    assert not _conflicts(store, 1, DEC_1, DEC_3)
+
+
+def test_overlapping_holds_conflict():
+    _check_overlaps(create_hold_store('memory'))
+    with tempfile.TemporaryDirectory() as tmp:
+        _check_overlaps(create_hold_store(f"sqlite:///{os.path.join(tmp, 'holds.db')}"))
+
+
+def test_holds_expire_and_confirm_extends():
+    store = HoldStore(ttl=0.05, confirmed_ttl=60)
+    held = store.acquire(1, DEC_1, DEC_3)
+    time.sleep(0.06)
+    assert store.get(held.hold_id) is None and len(store) == 0
+    held = store.acquire(1, DEC_1, DEC_3)
+    confirmed = store.confirm(held.hold_id)
+    assert confirmed.status == 'confirmed' and confirmed.expires_at > held.expires_at
+    time.sleep(0.06)
+    assert _conflicts(store, 1, DEC_1, DEC_3)
+    store.purge_expired()
+    assert len(store) == 1
+
+
+def test_sqlite_holds_are_shared_between_workers():
+    """Two stores on one file behave like two Gunicorn workers"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'holds.db')
+        worker_a, worker_b = HoldStore(path), HoldStore(path)
+        hold = worker_a.acquire(1, DEC_1, DEC_3)
+        assert _conflicts(worker_b, 1, date(2026, 12, 2), DEC_5)
+        assert worker_b.get(hold.hold_id) == hold
+        assert worker_b.release(hold.hold_id)
+        assert worker_a.get(hold.hold_id) is None
+        assert not _conflicts(worker_a, 1, DEC_1, DEC_3)
+
+
+def test_concurrent_acquire_has_one_winner():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'holds.db')
+        workers = [HoldStore(path) for _ in range(4)]
+        barrier = threading.Barrier(8)
+        winners = []
+
+        def race(store):
+            barrier.wait()
+            if not _conflicts(store, 7, DEC_1, DEC_3):
+                winners.append(store)
+
+        threads = [threading.Thread(target=race, args=(workers[i % 4],)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(winners) == 1
+
+
+def test_booking_endpoints_use_holds():
+    """A held room is refused before the HMS is called; outcomes confirm or release the hold"""
+    from app import create_app
+    app = create_app('development')
+    booking = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1',
+               'room_id': '1', 'room_type': 'Standard', 'check_in': _day(40), 'check_out': _day(42)}
+    with FakeHMS(ROOMS, fail_rooms=[2]) as hms, app.test_client() as client:
+        service = app.extensions['hotel_api']
+        service.base_url = hms.url
+        service.auth_service.base_url = hms.url
+        service.set_live_mode()
+
+        hold = client.post('/api/holds', json=booking).get_json()['hold']
+        assert hold['status'] == 'held' and hold['expires_in'] > 0
+
+        # Another guest asking for the same room and dates never reaches the HMS
+        other = {'environ_base': {'REMOTE_ADDR': '10.0.0.9'}}
+        assert client.post('/api/holds', json={**booking, 'check_in': _day(41), 'check_out': _day(43)},
+                           **other).status_code == 409
+        assert client.post('/book', data=booking, **other).status_code == 409
+        assert not any(path.startswith('/api/bookings') for _, path in hms.requests)
+
+        response = client.post('/book', data={**booking, 'hold_id': hold['hold_id']})
+        assert response.status_code == 200 and len(hms.bookings) == 1
+        # The booked range stays blocked and its hold can no longer be released
+        assert client.delete(f"/api/holds/{hold['hold_id']}").status_code == 404
+        assert client.post('/api/holds', json=booking, **other).status_code == 409
+
+        # A booking the HMS refuses (answered with a mock fallback) frees the room again
+        failed = {**booking, 'room_id': '2'}
+        client.post('/book', data=failed)
+        assert client.post('/api/holds', json=failed, **other).status_code == 201
+
+        # A group clashing with held rooms is rejected whole, keeping none of its holds
+        group = {'guest_name': 'Tour Operator', 'guest_email': 'ops@example.com', 'guest_phone': '1',
+                 'bookings': [{**booking, 'room_id': '3'}, booking]}
+        response = client.post('/api/bookings/batch', json=group)
+        assert response.status_code == 409
+        assert [error['index'] for error in response.get_json()['errors']] == [1]
+        assert client.post('/api/holds', json={**booking, 'room_id': '3'}, **other).status_code == 201
+
+
+def test_holds_need_an_existing_room_and_allowed_stay():
+    """Unknown rooms, past dates and over-long stays are refused before anything is held"""
+    from app import create_app
+    app = create_app('development')
+    booking = {'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1',
+               'room_id': '4', 'room_type': 'Deluxe', 'check_in': _day(70), 'check_out': _day(72)}
+    with app.test_client() as client:
+        for invalid in ({'room_id': '999'}, {'check_out': _day(800)}, {'check_out': _day(70)},
+                        {'check_in': '2001-01-10', 'check_out': '2001-01-12'}):
+            assert client.post('/api/holds', json={**booking, **invalid}).status_code == 400
+            assert client.post('/book', data={**booking, **invalid}).status_code == 400
+        other = {'environ_base': {'REMOTE_ADDR': '10.0.0.9'}}  # Past the booking rate limit of the first client
+        assert client.post('/api/holds', json=[booking], **other).status_code == 400
+        assert client.post('/api/holds', json={**booking, 'room_id': ['4']}, **other).status_code == 400
+        response = client.post('/api/bookings/batch', json={
+            'guest_name': 'A', 'guest_email': 'a@example.com', 'guest_phone': '1',
+            'bookings': [booking, {**booking, 'room_id': '999'}]
+        })
+        assert response.status_code == 400 and response.get_json()['errors'][0]['index'] == 1
+        assert len(app.extensions['reservation_holds']) == 0
+        assert client.post('/api/holds', json=booking).status_code == 201
+
+
+def benchmark_conflicts(iterations=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, store in (('memory', HoldStore()), ('sqlite', HoldStore(os.path.join(tmp, 'holds.db')))):
+            for room_id in range(200):
+                store.acquire(room_id, DEC_1, DEC_3)
+            start = time.perf_counter()
+            for i in range(iterations):
+                try:
+                    store.acquire(i % 200, date(2026, 12, 2), DEC_5)
+                except HoldConflictError:
+                    pass
+            rejected = (time.perf_counter() - start) / iterations
+            start = time.perf_counter()
+            for i in range(1000):
+                store.acquire(1000 + i, DEC_1, DEC_3)
+            acquired = (time.perf_counter() - start) / 1000
+            print(f"{label:7s} conflict rejected in {rejected * 1e6:.1f} µs, new hold in {acquired * 1e6:.1f} µs")
+
+
+if __name__ == '__main__':
+    test_overlapping_holds_conflict()
+    test_holds_expire_and_confirm_extends()
+    test_sqlite_holds_are_shared_between_workers()
+    test_concurrent_acquire_has_one_winner()
+    test_booking_endpoints_use_holds()
+    test_holds_need_an_existing_room_and_allowed_stay()
+    print("✓ Reservation hold tests passed")
+    benchmark_conflicts()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for proxy cache headers, surrogate keys and tag purges, against a stub caching proxy
+"""
+
+import sys
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_hms import FakeHMS
+from http_cache import purge_tags
+from room_model import RoomInventory
+
+ROOMS = [
+    {'id': 1, 'name': 'Standard Double Room', 'category': 'classic', 'price': 80000},
+    {'id': 2, 'name': 'Superior Double Room', 'category': 'superior', 'price': 120000},
+    {'id': 3, 'name': 'Superior Family Room', 'category': 'superior', 'price': 150000},
+    {'id': 4, 'name': 'Deluxe Room', 'category': 'deluxe', 'price': 200000}
+]
+
+
+class StubProxy:
+    """Caching reverse proxy stand-in: honours s-maxage, indexes pages by surrogate key, purges by tag over HTTP"""
+
+    def __init__(self, tag_header='Surrogate-Key'):
+        self.tag_header = tag_header
+        self.client = None
+        self.cache = {}  # path -> (expires, tags, body)
+        self.hits = 0
+        self.misses = 0
+        self.purges = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/purge"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get(self, path):
+        with self._lock:
+            entry = self.cache.get(path)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        response = self.client.get(path)
+        match = re.search(r's-maxage=(\d+)', response.headers.get('Cache-Control', ''))
+        if response.status_code == 200 and match and 'public' in response.headers['Cache-Control']:
+            with self._lock:
+                self.cache[path] = (time.monotonic() + int(match.group(1)),
+                                    set(response.headers.get(self.tag_header, '').split()), response.get_data())
+        return response.get_data()
+
+    def hit_ratio(self):
+        return self.hits / ((self.hits + self.misses) or 1)
+
+    def _handler(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_PURGE(self):
+                tags = set(self.headers.get(proxy.tag_header, '').split())
+                with proxy._lock:
+                    proxy.purges.append(tags)
+                    for path in [path for path, entry in proxy.cache.items() if entry[1] & tags]:
+                        del proxy.cache[path]
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        return Handler
+
+
+def test_purge_tags_cover_changed_rooms_and_categories():
+    before = RoomInventory.from_records(ROOMS)
+    after = RoomInventory.from_records([ROOMS[0], {**ROOMS[1], 'category': 'deluxe'}, ROOMS[2]])
+    assert purge_tags(before, after) == sorted({
+        f'inventory-{before.version}', 'room-2', 'category-superior', 'category-deluxe', 'room-4'
+    })
+    assert purge_tags(before, RoomInventory.from_records(ROOMS)) == []
+    assert purge_tags(None, before) == []
+
+
+def test_proxy_hit_ratio_and_targeted_purge():
+    from app import create_app
+    from config import DevelopmentConfig, config
+
+    proxy = StubProxy().start()
+
+    class CacheTestConfig(DevelopmentConfig):
+        CACHE_PURGE_URL = proxy.url
+
+    config['cache_test'] = CacheTestConfig
+    app = create_app('cache_test')
+    app.extensions['cache_purger'].delay = 0.05
+    proxy.client = app.test_client()
+    pages = ['/', '/api/rooms', '/room_detail/1', '/room_detail/3', '/room_detail/4']
+    try:
+        with FakeHMS(ROOMS) as hms:
+            service = app.extensions['hotel_api']
+            service.base_url = hms.url
+            service.set_live_mode()
+            old_version = service.get_available_rooms().version
+
+            response = proxy.client.get('/room_detail/3')
+            assert response.headers['Cache-Control'] == 'public, max-age=0, s-maxage=300'
+            assert response.headers['Surrogate-Key'] == 'room-3 category-superior'
+            assert proxy.client.get('/api/rooms').headers['Surrogate-Key'] == f'rooms inventory-{old_version}'
+
+            for _ in range(5):
+                for page in pages:
+                    proxy.get(page)
+            assert proxy.misses == len(pages) and proxy.hit_ratio() == 0.8
+
+            # Room 3 gets booked out: only pages that showed it (or its category) are purged
+            hms.set_rooms(ROOMS[:2] + [{**ROOMS[2], 'available': False}, ROOMS[3]])
+            service.get_available_rooms()
+            deadline = time.monotonic() + 5
+            while not proxy.purges and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert proxy.purges == [{f'inventory-{old_version}', 'room-3', 'category-superior'}]
+            assert sorted(proxy.cache) == ['/room_detail/1', '/room_detail/4']
+            assert b'"available":false' in proxy.get('/api/rooms')
+            assert proxy.misses == len(pages) + 1
+    finally:
+        proxy.stop()
+
+
+def test_fallback_and_error_pages_are_not_cached():
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        service = app.extensions['hotel_api']
+        service.base_url = 'http://127.0.0.1:9'  # Nothing listening: pages fall back to mock rooms
+        service.set_live_mode()
+        response = client.get('/')
+        assert response.status_code == 200
+        assert 'Surrogate-Key' not in response.headers and 's-maxage' not in response.headers.get('Cache-Control', '')
+        response = client.get('/room_detail/999')
+        assert response.status_code == 302 and 'Surrogate-Key' not in response.headers
+
+
+if __name__ == '__main__':
+    test_purge_tags_cover_changed_rooms_and_categories()
+    test_proxy_hit_ratio_and_targeted_purge()
+    test_fallback_and_error_pages_are_not_cached()
+    print("✓ HTTP cache tests passed")
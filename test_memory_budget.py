@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Memory budgets for the room and booking data paths, driven by a fake HMS
+with synthetic inventories
+
+Budgets come from MEMORY_BUDGET_* environment variables (see BUDGETS) and
+inventory sizes from MEMORY_TEST_SIZES. Run directly to print a report
+from 100 to 50,000 rooms.
+"""
+
+import sys
+import os
+import gc
+import itertools
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_hms import FakeHMS
+
+SIZES = [int(size) for size in os.getenv('MEMORY_TEST_SIZES', '100,1000,10000').split(',')]
+REPORT_SIZES = [100, 1000, 10000, 50000]
+
+# name: default (override with MEMORY_BUDGET_<NAME>)
+BUDGETS = {
+    name: float(os.getenv(f'MEMORY_BUDGET_{name.upper()}', default))
+    for name, default in {
+        'map_retained_per_room': 2500,  # Bytes kept by a mapped inventory, per room
+        'map_peak_per_room': 4000,  # Peak bytes while mapping an HMS payload, per room
+        # Every room-backed request re-fetches and hashes the HMS payload, so its peak grows with the inventory
+        'request_peak_base': 512 * 1024,
+        'request_peak_per_room': 768,
+        'booking_peak': 512 * 1024,  # Bookings must not depend on inventory size at all
+        'retained_blocks_per_request': 50,  # Allocations still alive after a request (leaks)
+        'rss_growth_base': 16 * 1024 * 1024,
+        'rss_growth_per_room': 8192
+    }.items()
+}
+
+ENDPOINTS = ['get_available_rooms', 'room_detail', 'api_rooms', 'api_rooms_query', 'create_booking']
+
+_stays = itertools.count(1)
+
+
+def synthetic_rooms(count, seed=7):
+    """HMS-shaped room records"""
+    rng = random.Random(seed)
+    categories = ['classic', 'superior', 'deluxe', 'executive']
+    return [
+        {
+            'id': i,
+            'name': f'Room {i}',
+            'category': rng.choice(categories),
+            'price': rng.randrange(50000, 400000, 10000),
+            'price_usd': rng.randrange(20, 150),
+            'capacity': rng.randint(1, 6),
+            'size': f'{rng.randint(20, 60)} sqm',
+            'beds': rng.choice(['Double Bed', 'King Bed', 'Twin Beds']),
+            'amenities': rng.sample(['WiFi', 'Air Conditioning', 'TV', 'Mini Bar', 'Balcony', 'Safe'], 3),
+            'image': f'room{i % 9}.jpg',
+            'available': rng.random() > 0.3,
+            'description': 'A comfortable room with a view over Dar es Salaam.'
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(func, repeat=3):
+    """Peak traced bytes of one call and allocations left alive per call, after a warm-up call
+
+    Retained blocks are the smallest per-call delta: a leak shows up in every call, while
+    allocations from other threads (HMS handler threads winding down, scheduler jobs) do not.
+    """
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peak = 0
+        retained = None
+        for _ in range(repeat):
+            blocks = sys.getallocatedblocks()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            func()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+            gc.collect()
+            delta = sys.getallocatedblocks() - blocks
+            retained = delta if retained is None else min(retained, delta)
+    finally:
+        tracemalloc.stop()
+    return {'peak': peak, 'retained_blocks': retained}
+
+
+def _stay_form(count):
+    # A new room and stay each time so earlier holds never turn the request into a 409
+    n = next(_stays)
+    check_in = date(2027, 1, 1) + timedelta(days=2 * n)
+    return {
+        'guest_name': 'Memory Test', 'guest_email': 'memory@example.com', 'guest_phone': '1',
+        'room_id': str(n % count + 1), 'room_type': 'Standard',
+        'check_in': check_in.isoformat(), 'check_out': (check_in + timedelta(days=1)).isoformat()
+    }
+
+
+@lru_cache(maxsize=None)
+def _app():
+    from app import create_app
+    from config import DevelopmentConfig, config
+
+    class MemoryTestConfig(DevelopmentConfig):
+        RATE_LIMIT_ENABLED = False  # Per-client buckets would show up as retained allocations
+
+    config['memory_test'] = MemoryTestConfig
+    return create_app('memory_test')
+
+
+@lru_cache(maxsize=None)
+def profile_inventory(count):
+    """Memory profile of the room and booking paths against a fake HMS serving count rooms"""
+    app = _app()
+    service = app.extensions['hotel_api']
+    client = app.test_client()
+    result = {'rooms': count}
+    with FakeHMS(synthetic_rooms(count)) as hms:
+        service.base_url = hms.url
+        service.auth_service.base_url = hms.url
+        service.set_live_mode()
+        hms.rooms_body()
+
+        # Mapping: a new payload digest forces RoomInventory.from_records
+        service._inventory = service._payload_digest = None
+        gc.collect()
+        rss_before = rss_bytes()
+        tracemalloc.start()
+        start = time.perf_counter()
+        inventory = service.get_available_rooms()
+        result['map_seconds'] = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(inventory) == count
+        result['map_retained'] = retained
+        result['map_peak'] = peak
+        result['rss_growth'] = rss_bytes() - rss_before
+
+        room_id = count // 2
+        requests = {
+            'get_available_rooms': service.get_available_rooms,
+            'room_detail': lambda: client.get(f'/room_detail/{room_id}'),
+            'api_rooms': lambda: client.get('/api/rooms'),
+            'api_rooms_query': lambda: client.get('/api/rooms?category=deluxe&sort=-price&limit=20'),
+            'create_booking': lambda: client.post('/book', data=_stay_form(count))
+        }
+        for name, func in requests.items():
+            result[name] = measure(func)
+        assert service._inventory is inventory, 'unchanged payload must not be re-mapped'
+        result['rss'] = rss_bytes()
+    return result
+
+
+def test_inventory_mapping_within_budget():
+    for count in SIZES:
+        profile = profile_inventory(count)
+        assert profile['map_retained'] <= BUDGETS['map_retained_per_room'] * count, profile
+        assert profile['map_peak'] <= BUDGETS['map_peak_per_room'] * count, profile
+
+
+def test_requests_within_budget():
+    for count in SIZES:
+        profile = profile_inventory(count)
+        request_budget = BUDGETS['request_peak_base'] + BUDGETS['request_peak_per_room'] * count
+        for name in ENDPOINTS:
+            budget = BUDGETS['booking_peak'] if name == 'create_booking' else request_budget
+            assert profile[name]['peak'] <= budget, (count, name, profile[name])
+            assert profile[name]['retained_blocks'] <= BUDGETS['retained_blocks_per_request'], (count, name, profile[name])
+
+
+def test_rss_growth_within_budget():
+    for count in SIZES:
+        profile = profile_inventory(count)
+        assert profile['rss_growth'] <= BUDGETS['rss_growth_base'] + BUDGETS['rss_growth_per_room'] * count, profile
+
+
+def report(sizes=REPORT_SIZES):
+    print(f"{'rooms':>7} {'map s':>6} {'map B/room':>10} {'peak B/room':>11} "
+          + ' '.join(f'{name:>20}' for name in ENDPOINTS) + f" {'RSS MB':>7}")
+    for count in sizes:
+        profile = profile_inventory(count)
+        cells = [f"{profile[name]['peak'] / 1024:8.0f}K {profile[name]['retained_blocks']:4.0f} blk" for name in ENDPOINTS]
+        print(f"{count:>7} {profile['map_seconds']:6.2f} {profile['map_retained'] / count:10.0f} "
+              f"{profile['map_peak'] / count:11.0f} " + ' '.join(f'{cell:>20}' for cell in cells)
+              + f" {profile['rss'] / 1024 / 1024:7.0f}")
+
+
+if __name__ == '__main__':
+    SIZES = REPORT_SIZES
+    test_inventory_mapping_within_budget()
+    test_requests_within_budget()
+    test_rss_growth_within_budget()
+    print("✓ Memory budgets met")
+    report()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for stay quotes from rate calendars
+Run directly to benchmark quoting 1,000 rooms for 30-night stays
+"""
+
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pricing
+from pricing import PricingError, PricingRules, RateCalendar
+from room_model import RoomInventory
+
+START = date(2026, 12, 7)  # a Monday
+
+RULES = PricingRules(
+    seasons=[{'name': 'holidays', 'start': '12-15', 'end': '01-05', 'multiplier': 1.5}],
+    weekend_multiplier=1.2, weekend_nights=(4, 5), stay_discounts={7: 0.10, 14: 0.20},
+    min_nights=1, max_nights=30, horizon_days=60
+)
+
+
+def _inventory(count=3):
+    return RoomInventory.from_records(
+        {'id': i, 'name': f'Room {i}', 'category': 'classic', 'price': 100000 * i} for i in range(1, count + 1)
+    )
+
+
+def _quote(numpy, *args, **kwargs):
+    saved = pricing.NUMPY_AVAILABLE
+    pricing.NUMPY_AVAILABLE = numpy and saved
+    try:
+        return RateCalendar(_inventory(), RULES, start=START).quote(*args, **kwargs)
+    finally:
+        pricing.NUMPY_AVAILABLE = saved
+
+
+def test_weekend_season_and_stay_discount():
+    for numpy in (True, False):
+        # Mon-Mon: five weekday nights, Friday and Saturday at +20%
+        nights, discount, quotes = _quote(numpy, START, START + timedelta(days=7), tzs_per_usd=2500)
+        assert (nights, discount) == (7, 0.10)
+        assert quotes[0]['subtotal'] == 5 * 100000 + 2 * 120000
+        assert quotes[0]['total'] == 666000 and quotes[0]['discount'] == 74000
+        assert quotes[0]['total_usd'] == 266.4
+        assert [quote['room_id'] for quote in quotes] == [1, 2, 3]
+
+        # Two nights across the season start: Mon 14th regular, Tue 15th holiday rate
+        _, _, quotes = _quote(numpy, date(2026, 12, 14), date(2026, 12, 16), room_ids=[2])
+        assert quotes == [{'room_id': 2, 'quotable': True, 'subtotal': 500000, 'discount': 0, 'total': 500000,
+                           'currency': 'TZS', 'total_usd': None}]
+
+
+def test_usd_rooms_are_converted_and_unpriced_rooms_not_quoted():
+    inventory = RoomInventory.from_records([
+        {'id': 1, 'name': 'Shilling', 'category': 'classic', 'price': 100000},
+        {'id': 2, 'name': 'Dollar', 'category': 'suite', 'price': 40, 'currency': 'USD'},
+        {'id': 3, 'name': 'Unpriced', 'category': 'classic', 'price': None}
+    ])
+    check_in, check_out = START + timedelta(days=1), START + timedelta(days=3)  # Two weekday nights
+    for numpy in (True, False):
+        saved = pricing.NUMPY_AVAILABLE
+        pricing.NUMPY_AVAILABLE = numpy and saved
+        try:
+            _, _, quotes = RateCalendar(inventory, RULES, start=START, tzs_per_usd=2650).quote(
+                check_in, check_out, tzs_per_usd=2650
+            )
+            assert quotes[0]['total'] == 200000
+            assert quotes[1]['total'] == 2 * 40 * 2650 and quotes[1]['total_usd'] == 80.0
+            assert quotes[1]['currency'] == 'TZS'
+            assert quotes[2] == {'room_id': 3, 'quotable': False, 'message': 'No price available for this room'}
+
+            # Without a rate a USD price cannot be quoted in TZS
+            _, _, quotes = RateCalendar(inventory, RULES, start=START).quote(check_in, check_out, room_ids=[2])
+            assert quotes[0]['quotable'] is False
+        finally:
+            pricing.NUMPY_AVAILABLE = saved
+
+
+def test_rejects_stays_outside_limits():
+    calendar = RateCalendar(_inventory(), RULES, start=START)
+    for check_in, check_out in ((START, START), (START - timedelta(days=1), START + timedelta(days=2)),
+                                (START, START + timedelta(days=31)),
+                                (START + timedelta(days=80), START + timedelta(days=82))):
+        try:
+            calendar.quote(check_in, check_out)
+            assert False, f'{check_in}..{check_out} should be rejected'
+        except PricingError:
+            pass
+    try:
+        calendar.quote(START, START + timedelta(days=1), room_ids=[99])
+        assert False, 'unknown room should be rejected'
+    except PricingError:
+        pass
+
+
+def test_quote_endpoint():
+    from app import create_app
+    app = create_app('development')
+    check_in = date.today() + timedelta(days=10)
+    with app.test_client() as client:
+        data = client.get(f'/api/quote?check_in={check_in}&check_out={check_in + timedelta(days=3)}'
+                          '&room_id=1,2').get_json()
+        assert data['nights'] == 3 and [quote['room_id'] for quote in data['quotes']] == [1, 2]
+        assert data['quotes'][0]['total'] >= 3 * 80000 * 0.85
+        assert client.get('/api/quote?check_in=soon').status_code == 400
+
+
+def benchmark_quotes(rooms=1000, nights=30, iterations=200):
+    inventory = _inventory(rooms)
+    rules = PricingRules(seasons=RULES.seasons, weekend_multiplier=1.2, stay_discounts={7: 0.1, 28: 0.2})
+    check_in = date.today() + timedelta(days=30)
+    check_out = check_in + timedelta(days=nights)
+    saved = pricing.NUMPY_AVAILABLE
+    for label, numpy in (('numpy', True), ('pure Python', False)):
+        if numpy and not saved:
+            continue
+        pricing.NUMPY_AVAILABLE = numpy
+        start = time.perf_counter()
+        calendar = RateCalendar(inventory, rules)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(iterations):
+            calendar.quote(check_in, check_out, tzs_per_usd=2650)
+        per_quote = (time.perf_counter() - start) / iterations
+        offset, span = calendar.stay_range(check_in, check_out)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            calendar.subtotals(offset, span)
+        sums = (time.perf_counter() - start) / iterations
+        print(f"{label:12s} {rooms} rooms x {nights} nights: calendar build {build * 1000:.1f} ms, "
+              f"range sums {sums * 1000:.3f} ms, full quote {per_quote * 1000:.2f} ms")
+    pricing.NUMPY_AVAILABLE = saved
+
+    # Naive per-night loop over dates, as a baseline
+    start = time.perf_counter()
+    for room in inventory:
+        sum(room.price * rules.night_multiplier(check_in + timedelta(days=day)) for day in range(nights))
+    print(f"{'naive loop':12s} {rooms} rooms x {nights} nights: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    test_weekend_season_and_stay_discount()
+    test_usd_rooms_are_converted_and_unpriced_rooms_not_quoted()
+    test_rejects_stays_outside_limits()
+    test_quote_endpoint()
+    print("✓ Pricing tests passed")
+    benchmark_quotes()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the typed Room model and shared RoomInventory
+Run directly to print the tracemalloc/timing comparison for 10k rooms
+"""
+
+import sys
+import os
+import json
+import time
+import tracemalloc
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from room_model import Room, RoomInventory
+from api_service import HotelAPIService
+
+
+def _hms_records(count):
+    """Synthetic HMS room payloads"""
+    categories = ['classic', 'superior', 'deluxe', 'executive']
+    return [
+        {
+            'id': i,
+            'name': f'Room {i}',
+            'category': categories[i % 4],
+            'price': 60000 + (i % 50) * 5000,
+            'price_usd': 23 + (i % 50) * 2,
+            'capacity': 1 + i % 4,
+            'beds': 'Double Bed',
+            'size': '25 sqm',
+            'amenities': ['Free WiFi', 'Air Conditioning'],
+            'image': 'room2.jpg',
+            'available': i % 7 != 0,
+            'description': 'Comfortable room with modern amenities',
+            'currency': 'TZS'
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _legacy_mapping(records):
+    """The per-request dict construction Room replaces"""
+    return [
+        {
+            'id': room.get('id'),
+            'name': room.get('name'),
+            'category': room.get('category'),
+            'price': room.get('price'),
+            'price_usd': room.get('price_usd'),
+            'capacity': room.get('capacity', 2),
+            'size': room.get('size', '25 sqm'),
+            'beds': room.get('beds', 'Double Bed'),
+            'amenities': room.get('amenities', []),
+            'image': room.get('image', 'default_room.jpg'),
+            'available': room.get('available', True),
+            'description': room.get('description', ''),
+            'currency': room.get('currency', 'TZS')
+        }
+        for room in records
+    ]
+
+
+def test_room_is_immutable_and_slotted():
+    """Rooms are frozen, carry no __dict__ and keep the legacy dict shape"""
+    room = Room.from_hms(_hms_records(1)[0])
+    assert not hasattr(room, '__dict__')
+    try:
+        room.price = 1
+        assert False, 'Room should be frozen'
+    except AttributeError:
+        pass
+    assert json.loads(room.json_bytes) == room.to_dict()
+    assert room.to_dict() == _legacy_mapping(_hms_records(1))[0]
+
+
+def test_inventory_json_matches_legacy_response():
+    """Cached inventory bytes decode to the payload jsonify used to produce"""
+    records = _hms_records(25)
+    inventory = RoomInventory.from_records(records)
+    assert json.loads(inventory.json_bytes) == {'success': True, 'rooms': _legacy_mapping(records)}
+    assert inventory.get(3).name == 'Room 3'
+    assert inventory.get(999) is None
+    # Same content gives the same version in every worker
+    assert RoomInventory.from_records(records).version == inventory.version
+    records[0]['price'] += 1
+    assert RoomInventory.from_records(records).version != inventory.version
+
+
+def test_mock_inventory_is_shared():
+    """Mock rooms are built once rather than on every call"""
+    service = HotelAPIService()
+    assert service.get_available_rooms() is service.get_available_rooms()
+
+
+def test_api_rooms_serves_cached_bytes():
+    """/api/rooms writes the inventory bytes and room pages still render"""
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        response = client.get('/api/rooms')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert response.get_json()['success'] is True
+        assert len(response.get_json()['rooms']) == 5
+        assert client.get('/room_detail/2').status_code == 200
+        assert client.get('/').status_code == 200
+
+
+def benchmark_room_model(count=10000, requests_served=100):
+    """Compare per-request dict mapping against a shared Room inventory"""
+    records = _hms_records(count)
+
+    # Memory a single /api/rooms request allocates on the legacy path
+    tracemalloc.start()
+    legacy = _legacy_mapping(records)
+    legacy_objects = tracemalloc.get_traced_memory()[0]
+    json.dumps({'success': True, 'rooms': legacy}).encode()
+    legacy_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del legacy
+
+    # Memory the shared inventory holds for its whole lifetime
+    tracemalloc.start()
+    inventory = RoomInventory.from_records(records)
+    inventory_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    json_cache = len(inventory.json_bytes) + sum(len(room.json_bytes) for room in inventory)
+
+    start = time.perf_counter()
+    for _ in range(requests_served):
+        json.dumps({'success': True, 'rooms': _legacy_mapping(records)}).encode()
+    legacy_time = (time.perf_counter() - start) / requests_served
+
+    start = time.perf_counter()
+    inventory = RoomInventory.from_records(records)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(requests_served):
+        inventory.json_bytes
+    cached_time = (time.perf_counter() - start) / requests_served
+
+    print(f"{count} rooms, {requests_served} /api/rooms requests")
+    print(f"  legacy dicts per request:   {legacy_objects / 1024:9.0f} KiB allocated, {legacy_peak / 1024:.0f} KiB peak with encoding")
+    print(f"  inventory per version:      {inventory_bytes / 1024:9.0f} KiB retained "
+          f"({(inventory_bytes - json_cache) / 1024:.0f} KiB Room objects + {json_cache / 1024:.0f} KiB cached JSON)")
+    print(f"  legacy map + encode:        {legacy_time * 1000:9.2f} ms per request")
+    print(f"  inventory build:            {build_time * 1000:9.2f} ms once per version")
+    print(f"  cached bytes:               {cached_time * 1000:9.4f} ms per request, 0 KiB allocated")
+
+
+if __name__ == '__main__':
+    test_room_is_immutable_and_slotted()
+    test_inventory_json_matches_legacy_response()
+    test_mock_inventory_is_shared()
+    print("✓ Room model tests passed")
+    benchmark_room_model()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for filtered, sorted and paginated /api/rooms queries
+Run directly to print query timings as the inventory grows
+"""
+
+import sys
+import os
+import random
+import time
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.datastructures import MultiDict
+
+from room_model import RoomInventory
+from room_query import RoomIndex, RoomQueryError, encode_cursor, parse_room_query, render_room_page
+
+
+def _inventory(count, seed=7):
+    rng = random.Random(seed)
+    categories = ['classic', 'superior', 'deluxe', 'executive']
+    return RoomInventory.from_records([
+        {
+            'id': i,
+            'name': f'Room {rng.randint(1, 500)}',
+            'category': rng.choice(categories),
+            'price': rng.randrange(50000, 400000, 10000),
+            'capacity': rng.randint(1, 6),
+            'available': rng.random() > 0.3
+        }
+        for i in range(1, count + 1)
+    ])
+
+
+def _walk(index, query):
+    """Follow cursors until the last page and return every room id seen"""
+    seen, after = [], None
+    while True:
+        rooms, total, after = index.query(**{**query, 'after': after})
+        seen.extend(room.id for room in rooms)
+        if after is None:
+            return seen, total
+
+
+def _brute_force(inventory, categories=None, min_price=None, max_price=None, capacity=None,
+                 available=None, sort='price', descending=False, **_):
+    rooms = [
+        room for room in inventory
+        if (not categories or room.category in categories)
+        and (min_price is None or room.price >= min_price)
+        and (max_price is None or room.price <= max_price)
+        and (capacity is None or room.capacity >= capacity)
+        and (available is None or room.available == available)
+    ]
+    rooms.sort(key=lambda room: (getattr(room, sort), room.id), reverse=descending)
+    return [room.id for room in rooms]
+
+
+def test_queries_match_brute_force_across_pages():
+    """Every filter/sort combination pages through exactly the brute-force result"""
+    inventory = _inventory(500)
+    index = RoomIndex(inventory)
+    queries = [
+        {},
+        {'categories': ['deluxe']},
+        {'categories': ['classic', 'executive'], 'available': True, 'sort': 'capacity'},
+        {'min_price': 100000, 'max_price': 200000, 'descending': True},
+        {'capacity': 5, 'sort': 'name'},
+        {'available': False, 'sort': 'id', 'descending': True},
+        {'categories': ['superior'], 'min_price': 390000}
+    ]
+    for query in queries:
+        query = {'sort': 'price', 'limit': 7, **query}
+        seen, total = _walk(index, query)
+        expected = _brute_force(inventory, **query)
+        assert seen == expected, query
+        assert total == len(expected)
+
+
+def test_parse_and_render_projection():
+    """Query strings are validated and fields project the output"""
+    query, fields = parse_room_query(MultiDict({'category': 'Deluxe,classic', 'sort': '-price',
+                                                'limit': '2', 'fields': 'id,price'}))
+    assert query['categories'] == ['deluxe', 'classic'] and query['descending']
+    rooms, total, next_key = RoomIndex(_inventory(50)).query(**query)
+    body = render_room_page(rooms, total, next_key, 'v1', fields)
+    assert b'"name"' not in body and b'"next_cursor":"' in body
+    for bad in ({'sort': 'size'}, {'limit': '0'}, {'fields': 'secret'}, {'cursor': '!!'}, {'min_price': 'x'}):
+        try:
+            parse_room_query(MultiDict(bad))
+            assert False, bad
+        except RoomQueryError:
+            pass
+
+
+def test_cursor_must_match_sort_key():
+    """A cursor replayed with another sort is a 400, not a TypeError inside bisect"""
+    name_cursor = encode_cursor(('Room 7', 7))
+    assert parse_room_query(MultiDict({'sort': 'name', 'cursor': name_cursor}))[0]['after'] == ('Room 7', 7)
+    for sort, cursor in (('price', name_cursor), ('name', encode_cursor((80000, 7))),
+                         ('-capacity', encode_cursor((2, 'x'))), ('id', encode_cursor((True, 1)))):
+        try:
+            parse_room_query(MultiDict({'sort': sort, 'cursor': cursor}))
+            assert False, (sort, cursor)
+        except RoomQueryError:
+            pass
+
+
+def test_category_filter_ignores_hms_casing():
+    inventory = RoomInventory.from_records([
+        {'id': 1, 'name': 'A', 'category': 'Deluxe', 'price': 1},
+        {'id': 2, 'name': 'B', 'category': 'deluxe', 'price': 2},
+        {'id': 3, 'name': 'C', 'category': 'Classic', 'price': 3}
+    ])
+    query, _ = parse_room_query(MultiDict({'category': 'DELUXE'}))
+    rooms, total, _ = RoomIndex(inventory).query(**query)
+    assert [room.id for room in rooms] == [1, 2] and total == 2
+
+
+def test_api_rooms_etag_and_filters():
+    """/api/rooms answers filtered queries and honours If-None-Match"""
+    from app import create_app
+    app = create_app('development')
+    with app.test_client() as client:
+        response = client.get('/api/rooms?category=classic&sort=-price')
+        data = response.get_json()
+        assert [room['id'] for room in data['rooms']] == [1, 5]
+        etag = response.headers['ETag']
+        assert client.get('/api/rooms?category=classic&sort=-price',
+                          headers={'If-None-Match': etag}).status_code == 304
+        assert client.get('/api/rooms?category=deluxe',
+                          headers={'If-None-Match': etag}).status_code == 200
+
+        full = client.get('/api/rooms')
+        assert len(full.get_json()['rooms']) == 5
+        assert client.get('/api/rooms', headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+        assert client.get('/api/rooms?sort=bogus').status_code == 400
+
+
+def benchmark_room_query():
+    for count in (1000, 10000, 50000):
+        inventory = _inventory(count)
+        start = time.perf_counter()
+        index = RoomIndex(inventory)
+        build = time.perf_counter() - start
+        query = {'categories': ['deluxe'], 'min_price': 150000, 'max_price': 250000,
+                 'available': True, 'sort': 'price', 'limit': 20}
+        start = time.perf_counter()
+        for _ in range(100):
+            rooms, total, next_key = index.query(**query)
+            body = render_room_page(rooms, total, next_key, inventory.version)
+        per_query = (time.perf_counter() - start) / 100
+        print(f"{count:6d} rooms: index build {build * 1000:7.1f} ms, "
+              f"filtered page {per_query * 1000:6.3f} ms, {len(body)} bytes "
+              f"(full list {len(inventory.json_bytes)} bytes)")
+
+
+if __name__ == '__main__':
+    test_queries_match_brute_force_across_pages()
+    test_parse_and_render_projection()
+    test_cursor_must_match_sort_key()
+    test_category_filter_ignores_hms_casing()
+    print("✓ Room query tests passed")
+    benchmark_room_query()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Tests for the live room availability stream (/api/rooms/stream)
+
+Run directly to benchmark fan-out to idle connections (add --gevent to use
+greenlets instead of threads when gevent is installed) and, with gevent, real
+SSE connections held open by stream_server.py.
+"""
+
+import sys
+import os
+import json
+import selectors
+import socket
+import subprocess
+import threading
+import time
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_hms import FakeHMS
+from room_model import RoomInventory
+from room_stream import RoomChangeBroker, diff_inventories
+
+ROOMS = [
+    {'id': 1, 'name': 'Standard Double Room', 'category': 'classic', 'price': 80000},
+    {'id': 2, 'name': 'Superior Double Room', 'category': 'superior', 'price': 120000},
+    {'id': 3, 'name': 'Family Room', 'category': 'superior', 'price': 150000}
+]
+
+
+def _events(chunks):
+    """Parse SSE bytes into (event, id, data) tuples, skipping comments"""
+    events = []
+    for block in b''.join(chunks).decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields['id'], json.loads(fields['data'])))
+    return events
+
+
+def test_diff_reports_changed_and_removed_rooms():
+    before = RoomInventory.from_records(ROOMS)
+    after = RoomInventory.from_records([{**ROOMS[0], 'available': False}, ROOMS[1],
+                                        {'id': 4, 'name': 'Suite', 'category': 'executive', 'price': 300000}])
+    changed, removed = diff_inventories(before, after)
+    assert [room.id for room in changed] == [1, 4]
+    assert removed == [3]
+    assert diff_inventories(after, after) == ([], [])
+
+
+def test_broker_replays_and_resets():
+    broker = RoomChangeBroker(history=2)
+    before = RoomInventory.from_records(ROOMS)
+    broker.publish_inventory(None, before)
+    stream = broker.stream(heartbeat=0.01, max_seconds=0.05)
+    assert next(stream) == b'retry: 5000\n\n'
+    ready = _events([next(stream)])[0]
+    assert ready[0] == 'ready' and ready[2]['version'] == before.version
+
+    after = RoomInventory.from_records([{**ROOMS[1], 'price': 99000}, ROOMS[0], ROOMS[2]])
+    broker.publish_inventory(before, after)
+    event, event_id, data = _events([next(stream)])[0]
+    assert event == 'rooms' and [room['id'] for room in data['changed']] == [2]
+    assert data['removed'] == [] and data['version'] == after.version
+    assert _events(list(stream)) == []  # keepalives until the stream is recycled
+
+    # Resuming from a known id replays what was missed; a foreign or evicted id gets a reset
+    broker.publish_inventory(after, before)
+    missed = _events(list(broker.stream(event_id, heartbeat=0.01, max_seconds=0.02)))
+    assert [event for event, _, _ in missed] == ['rooms']
+    assert _events(list(broker.stream('beef-1', heartbeat=0.01, max_seconds=0.01)))[0][0] == 'reset'
+    broker.publish('rooms', b'{}')
+    broker.publish('rooms', b'{}')
+    assert _events(list(broker.stream(event_id, heartbeat=0.01, max_seconds=0.01)))[0][0] == 'reset'
+    assert broker.subscribers == 0
+
+
+def test_stream_endpoint_pushes_inventory_changes():
+    from app import create_app
+    app = create_app('development')
+    app.config.update(ROOM_STREAM_HEARTBEAT=0.05, ROOM_STREAM_MAX_SECONDS=2)
+    with FakeHMS(ROOMS) as hms, app.test_client() as client:
+        service = app.extensions['hotel_api']
+        service.base_url = hms.url
+        service.set_live_mode()
+        service.get_available_rooms()
+
+        response = client.get('/api/rooms/stream', buffered=False)
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        chunks = iter(response.response)
+        next(chunks)
+        assert _events([next(chunks)])[0][0] == 'ready'
+
+        # The scheduled refresh sees the HMS change and the stream pushes only that room
+        hms.set_rooms([{**ROOMS[0], 'available': False}] + ROOMS[1:])
+        threading.Timer(0.1, service.get_available_rooms).start()
+        for chunk in chunks:
+            events = _events([chunk])
+            if events:
+                break
+        response.close()
+        event, _, data = events[0]
+        assert event == 'rooms'
+        assert [(room['id'], room['available']) for room in data['changed']] == [(1, False)]
+
+        app.config['ROOM_STREAM_ENABLED'] = False
+        assert client.get('/api/rooms/stream').status_code == 204
+
+
+def benchmark_connections(counts=(100, 1000, 5000), use_gevent=False):
+    if use_gevent:
+        import gevent
+        spawn, join = gevent.spawn, lambda tasks: gevent.joinall(tasks)
+    else:
+        def spawn(func):
+            thread = threading.Thread(target=func, daemon=True)
+            thread.start()
+            return thread
+
+        def join(tasks):
+            for task in tasks:
+                task.join()
+
+    inventory = RoomInventory.from_records(ROOMS)
+    for count in counts:
+        broker = RoomChangeBroker()
+        broker.publish_inventory(None, inventory)
+        delivered = []
+
+        def client():
+            for chunk in broker.stream(heartbeat=30, max_seconds=30):
+                if b'event: rooms' in chunk:
+                    delivered.append(time.perf_counter())
+                    return
+
+        tasks = [spawn(client) for _ in range(count)]
+        while broker.subscribers < count:
+            time.sleep(0.01)
+        changed = RoomInventory.from_records([{**ROOMS[0], 'available': False}] + ROOMS[1:])
+        start = time.perf_counter()
+        broker.publish_inventory(inventory, changed)
+        publish = time.perf_counter() - start
+        join(tasks)
+        print(f"{count:6d} {'greenlets' if use_gevent else 'threads'}: publish {publish * 1e6:.0f} µs, "
+              f"all delivered in {(max(delivered) - start) * 1000:.1f} ms")
+
+
+# Serves stream_server.app with gevent, live against the fake HMS given on the command line
+_STREAM_SERVER = """
+import sys
+import stream_server
+from gevent.pywsgi import WSGIServer
+service = stream_server.app.extensions['hotel_api']
+service.base_url = service.auth_service.base_url = sys.argv[1]
+service.set_live_mode()
+server = WSGIServer(('127.0.0.1', 0), stream_server.app, log=None, backlog=1024)
+server.start()
+print(server.server_port, flush=True)
+server.serve_forever()
+"""
+
+
+def _rss_kb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmRSS'))
+
+
+def benchmark_stream_server(counts=(100, 1000, 5000)):
+    """Idle connections held by one gevent process: memory per stream and fan-out of one HMS change"""
+    for count in counts:
+        with FakeHMS(ROOMS) as hms:
+            server = subprocess.Popen(
+                [sys.executable, '-c', _STREAM_SERVER, hms.url],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                env={**os.environ, 'INVENTORY_REFRESH_INTERVAL': '1', 'ROOM_STREAM_MAX_CLIENTS': str(count)},
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+            try:
+                port = next(int(line) for line in server.stdout if line.strip().isdigit())
+                # Load the first inventory now, so the change below arrives as a rooms event and not a reset
+                with socket.create_connection(('127.0.0.1', port)) as sock:
+                    sock.sendall(b'GET /api/rooms HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+                    while sock.recv(65536):
+                        pass
+                rss_before = _rss_kb(server.pid)
+
+                selector = selectors.DefaultSelector()
+                received = {}
+                start = time.perf_counter()
+                for _ in range(count):
+                    sock = socket.create_connection(('127.0.0.1', port))
+                    sock.sendall(b'GET /api/rooms/stream HTTP/1.1\r\nHost: localhost\r\n\r\n')
+                    sock.setblocking(False)
+                    selector.register(sock, selectors.EVENT_READ)
+                    received[sock] = b''
+
+                def read_until(marker, deadline):
+                    waiting = {sock for sock, data in received.items() if marker not in data}
+                    arrivals = []
+                    while waiting and time.monotonic() < deadline:
+                        for key, _ in selector.select(timeout=0.5):
+                            received[key.fileobj] += key.fileobj.recv(65536)
+                            if key.fileobj in waiting and marker in received[key.fileobj]:
+                                waiting.discard(key.fileobj)
+                                arrivals.append(time.perf_counter())
+                    assert not waiting, f'{len(waiting)} streams missed {marker!r}'
+                    return arrivals
+
+                read_until(b'event: ready', time.monotonic() + 60)
+                connect = time.perf_counter() - start
+                rss_after = _rss_kb(server.pid)
+
+                changed = time.perf_counter()
+                hms.set_rooms([{**ROOMS[0], 'available': False}] + ROOMS[1:])
+                arrivals = read_until(b'event: rooms', time.monotonic() + 30)
+                print(f"{count:6d} gevent streams: connected in {connect * 1000:.0f} ms, "
+                      f"{(rss_after - rss_before) / count:.1f} KB RSS each; change reached all in "
+                      f"{(max(arrivals) - changed) * 1000:.0f} ms (poll wait included), "
+                      f"first to last {(max(arrivals) - min(arrivals)) * 1000:.1f} ms")
+                for sock in received:
+                    sock.close()
+                selector.close()
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    use_gevent = '--gevent' in sys.argv
+    if use_gevent:
+        from gevent import monkey
+        monkey.patch_all()
+    test_diff_reports_changed_and_removed_rooms()
+    test_broker_replays_and_resets()
+    test_stream_endpoint_pushes_inventory_changes()
+    print("✓ Room stream tests passed")
+    benchmark_connections(use_gevent=use_gevent)
+    if not use_gevent:
+        try:
+            import gevent  # noqa: F401 (stream_server.py runs in its own process)
+            benchmark_stream_server()
+        except ImportError:
+            print("gevent not installed; skipping the stream_server.py benchmark")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for the deadline scheduler and scheduled token refresh
+Run directly to print scheduling lag for many jobs
+"""
+
+import sys
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scheduler import Scheduler
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_jobs_run_in_deadline_order():
+    scheduler = Scheduler(max_workers=1)
+    order = []
+    for name, delay in (('a', 0.06), ('b', 0.01), ('c', 0.03)):
+        scheduler.schedule(lambda name=name: order.append(name), delay=delay, name=name)
+    assert _wait_for(lambda: len(order) == 3)
+    assert order == ['b', 'c', 'a']
+    assert all(metrics['runs'] == 1 and metrics['max_lag_ms'] < 50 for metrics in scheduler.metrics().values())
+    scheduler.shutdown()
+
+
+def test_interval_return_value_and_cancel():
+    scheduler = Scheduler()
+    runs = []
+    job = scheduler.schedule(lambda: runs.append(time.monotonic()), interval=0.02, name='tick')
+    assert _wait_for(lambda: len(runs) >= 3)
+    scheduler.cancel(job)
+    count = len(runs)
+    time.sleep(0.06)
+    assert len(runs) <= count + 1
+
+    # A returned number picks the next delay
+    delays = iter([0.01, None])
+    calls = []
+    scheduler.schedule(lambda: calls.append(1) or next(delays), name='dynamic')
+    assert _wait_for(lambda: len(calls) == 2)
+    time.sleep(0.05)
+    assert len(calls) == 2
+    scheduler.shutdown()
+
+
+def test_same_name_replaces_live_job():
+    scheduler = Scheduler()
+    first_runs, second_runs = [], []
+    first = scheduler.schedule(lambda: first_runs.append(1), interval=0.01, name='refresh')
+    assert _wait_for(lambda: first_runs)
+    scheduler.schedule(lambda: second_runs.append(1), interval=0.01, name='refresh')
+    assert first.cancelled
+    assert _wait_for(lambda: len(second_runs) >= 3)
+    count = len(first_runs)
+    time.sleep(0.05)
+    assert len(first_runs) == count
+    assert list(scheduler.metrics()) == ['refresh']
+    scheduler.shutdown()
+
+
+def test_recreated_app_replaces_its_jobs():
+    from app import create_app
+    from scheduler import get_scheduler
+    create_app('development')
+    old = dict(get_scheduler()._jobs)
+    create_app('development')
+    for name in ('hold-purge', 'inventory-refresh', 'funnel-flush'):
+        assert old[name].cancelled and not get_scheduler()._jobs[name].cancelled
+
+
+def test_slow_job_never_overlaps_itself():
+    scheduler = Scheduler(max_workers=4)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    job = scheduler.schedule(slow, interval=0.01, name='slow')
+    time.sleep(0.25)
+    scheduler.cancel(job)
+    scheduler.shutdown()
+    assert peak[0] == 1 and job.runs >= 3
+
+
+def test_shutdown_waits_for_running_job():
+    scheduler = Scheduler()
+    finished = []
+    scheduler.schedule(lambda: time.sleep(0.1) or finished.append(1), name='finishing')
+    time.sleep(0.02)
+    scheduler.shutdown(timeout=1)
+    assert finished == [1]
+
+
+def test_jobs_survive_fork():
+    if not hasattr(os, 'fork'):
+        return
+    scheduler = Scheduler()
+    ran = []
+    scheduler.schedule(lambda: ran.append(os.getpid()), delay=0.05, name='after-fork')
+    pid = os.fork()
+    if pid == 0:
+        # Child: the job scheduled before the fork still runs here, on fresh threads
+        os._exit(0 if _wait_for(lambda: os.getpid() in ran) else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert _wait_for(lambda: os.getpid() in ran)
+    scheduler.shutdown()
+
+
+def test_token_refresh_runs_at_refresh_point():
+    from auth_service import HMSAuthService
+    service = HMSAuthService()
+    service.refresh_jitter_seconds = 0
+    refreshed = []
+
+    def authenticate():
+        refreshed.append(datetime.now())
+        service.token_expires_at = datetime.now() + timedelta(hours=1)
+        return True
+
+    service.authenticate = authenticate
+    service.jwt_token = 'token'
+    refresh_at = datetime.now() + timedelta(seconds=0.2)
+    service.token_expires_at = refresh_at + timedelta(minutes=service.refresh_buffer_minutes)
+    service.start_background_refresh()
+    try:
+        time.sleep(0.1)
+        assert refreshed == []
+        assert _wait_for(lambda: refreshed)
+        assert abs((refreshed[0] - refresh_at).total_seconds()) < 0.1
+        # Next run is planned for the new token, not a fixed poll
+        assert service.refresh_job.due - time.monotonic() > 3000
+    finally:
+        from scheduler import get_scheduler
+        get_scheduler().cancel(service.refresh_job)
+
+
+def test_short_lived_token_does_not_refresh_in_a_loop():
+    """A token that expires within the refresh buffer is due at once; the next run is still spaced out"""
+    from auth_service import HMSAuthService
+    service = HMSAuthService()
+
+    def authenticate():
+        service.jwt_token = 'token'
+        service.token_expires_at = datetime.now() + timedelta(minutes=service.refresh_buffer_minutes - 1)
+        return True
+
+    service.authenticate = authenticate
+    assert service._scheduled_refresh() == service.min_refresh_interval
+
+
+def benchmark_lag(count=2000):
+    scheduler = Scheduler(max_workers=4)
+    for i in range(count):
+        scheduler.schedule(lambda: None, delay=random.uniform(0, 1), name=f'job-{i}')
+    time.sleep(1.2)
+    lags = [metrics['last_lag_ms'] for metrics in scheduler.metrics().values()]
+    scheduler.shutdown()
+    lags.sort()
+    print(f"{count} jobs over 1 s: lag p50 {lags[len(lags) // 2]:.2f} ms, "
+          f"p99 {lags[int(len(lags) * 0.99)]:.2f} ms, max {lags[-1]:.2f} ms")
+
+
+if __name__ == '__main__':
+    test_jobs_run_in_deadline_order()
+    test_interval_return_value_and_cancel()
+    test_same_name_replaces_live_job()
+    test_recreated_app_replaces_its_jobs()
+    test_slow_job_never_overlaps_itself()
+    test_shutdown_waits_for_running_job()
+    test_jobs_survive_fork()
+    test_token_refresh_runs_at_refresh_point()
+    test_short_lived_token_does_not_refresh_in_a_loop()
+    print("✓ Scheduler tests passed")
+    benchmark_lag()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the generated service worker and web manifest
+"""
+
+import sys
+import os
+import json
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from service_worker import cache_version, shell_assets
+
+
+def _app():
+    from app import create_app
+    return create_app('development')
+
+
+def test_service_worker_precaches_shell_and_routes():
+    app = _app()
+    with app.test_client() as client:
+        response = client.get('/sw.js')
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'no-cache'
+        script = response.get_data(as_text=True)
+        precache = json.loads(script.split('const PRECACHE_URLS = ', 1)[1].split(';\n', 1)[0])
+        assert precache[:5] == ['/', '/about', '/faq', '/gallery', '/services']
+        assert '/static/css/style.css' in precache and '/static/js/custom.js' in precache
+        assert 'const NETWORK_FIRST = ["/api/rooms"]' in script
+        assert "includes('text/event-stream')" in script  # /api/rooms/stream bypasses the worker
+
+        # Every precached URL must load, or the browser rejects the whole install
+        for url in precache:
+            assert client.get(url).status_code == 200, url
+
+        assert client.get('/sw.js', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+        manifest = client.get('/manifest.webmanifest')
+        assert manifest.mimetype == 'application/manifest+json' and manifest.get_json()['start_url'] == '/'
+        page = client.get('/about').get_data(as_text=True)
+        assert 'navigator.serviceWorker.register("/sw.js")' in page and 'rel="manifest"' in page
+
+
+def test_version_changes_with_build_id_and_assets():
+    app = _app()
+    assets = shell_assets(app)
+    routes = app.config['SERVICE_WORKER_ROUTES']
+    first = cache_version(app, assets, routes)
+    assert cache_version(app, assets, routes) == first
+    app.config['BUILD_ID'] = 'next-deploy'
+    assert cache_version(app, assets, routes) != first
+    app.config['BUILD_ID'] = ''
+    assert cache_version(app, assets[:-1], routes) != first
+
+
+def test_disabled_service_worker_is_not_registered():
+    from app import create_app
+    from config import DevelopmentConfig
+    DevelopmentConfig.SERVICE_WORKER_ENABLED = False
+    try:
+        app = create_app('development')
+    finally:
+        DevelopmentConfig.SERVICE_WORKER_ENABLED = True
+    with app.test_client() as client:
+        assert client.get('/sw.js').status_code == 404
+        assert 'serviceWorker' not in client.get('/about').get_data(as_text=True)
+
+
+if __name__ == '__main__':
+    test_service_worker_precaches_shell_and_routes()
+    test_version_changes_with_build_id_and_assets()
+    test_disabled_service_worker_is_not_registered()
+    print("✓ Service worker tests passed")
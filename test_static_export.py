@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the static site export
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, render_template
+from jinja2 import DictLoader
+
+from static_export import export_site
+
+
+def _app(templates):
+    app = Flask(__name__)
+    app.jinja_loader = DictLoader(templates)
+
+    @app.route('/about')
+    def about():
+        return render_template('about.html')
+
+    @app.route('/faq')
+    def faq():
+        return render_template('faq.html')
+
+    @app.route('/broken')
+    def broken():
+        return 'nope', 500
+
+    return app
+
+
+TEMPLATES = {
+    'base.html': '<html>{% block body %}{% endblock %}{% include "footer.html" %}</html>',
+    'footer.html': '<footer>Mbeya</footer>',
+    'about.html': '{% extends "base.html" %}{% block body %}About{% endblock %}',
+    'faq.html': '<p>FAQ</p>'
+}
+
+
+def test_export_writes_html_and_gzip():
+    with tempfile.TemporaryDirectory() as out:
+        stats = export_site(_app(TEMPLATES), [('/about', ''), ('/faq', ''), ('/broken', '')], out)
+        assert stats == {'written': 2, 'unchanged': 0, 'failed': 1, 'removed': 0}
+        with open(os.path.join(out, 'about', 'index.html'), 'rb') as f:
+            body = f.read()
+        assert body == b'<html>About<footer>Mbeya</footer></html>'
+        with gzip.open(os.path.join(out, 'about', 'index.html.gz')) as f:
+            assert f.read() == body
+        assert not os.path.exists(os.path.join(out, 'broken'))
+
+
+def test_reexport_rebuilds_only_changed_pages():
+    with tempfile.TemporaryDirectory() as out:
+        pages = [('/about', 'v1'), ('/faq', 'v1')]
+        export_site(_app(TEMPLATES), pages, out)
+        assert export_site(_app(TEMPLATES), pages, out)['unchanged'] == 2
+
+        # An included template changes: only the page that uses it is re-rendered
+        changed = {**TEMPLATES, 'footer.html': '<footer>Isyesye Street</footer>'}
+        assert export_site(_app(changed), pages, out) == {'written': 1, 'unchanged': 1, 'failed': 0, 'removed': 0}
+        with open(os.path.join(out, 'about', 'index.html')) as f:
+            assert 'Isyesye' in f.read()
+
+        # Page data changes, and a page disappears
+        stats = export_site(_app(changed), [('/about', 'v2')], out)
+        assert stats == {'written': 1, 'unchanged': 0, 'failed': 0, 'removed': 1}
+        assert not os.path.exists(os.path.join(out, 'faq', 'index.html'))
+
+
+def test_export_includes_room_and_blog_pages():
+    from app import create_app
+    app = create_app('development')
+    with tempfile.TemporaryDirectory() as out:
+        result = app.test_cli_runner().invoke(args=['export-static', '--output', out])
+        assert result.exit_code == 0 and 'written' in result.output
+        for page in ('index.html', 'about/index.html', 'room_detail/1/index.html', 'blog/index.html',
+                     'blog/welcome-to-ngenda/index.html'):
+            assert os.path.exists(os.path.join(out, page)), page
+        result = app.test_cli_runner().invoke(args=['export-static', '--output', out])
+        assert ' 0 written' in result.output
+
+
+if __name__ == '__main__':
+    test_export_writes_html_and_gzip()
+    test_reexport_rebuilds_only_changed_pages()
+    test_export_includes_room_and_blog_pages()
+    print("✓ Static export tests passed")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for template precompilation into the Jinja bytecode cache
+Run directly to compare first-request latency in fresh processes
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+
+from template_cache import init_template_cache, precompile_templates
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+def _app(cache_dir):
+    app = Flask(__name__, template_folder=TEMPLATE_DIR)
+    app.config['TEMPLATE_CACHE_DIR'] = cache_dir
+    init_template_cache(app)
+    return app
+
+
+def test_precompiled_templates_load_without_compiling():
+    """A new worker with a warm cache directory never calls the Jinja compiler"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        count, _ = precompile_templates(_app(cache_dir))
+        assert count >= 10
+        assert len(os.listdir(cache_dir)) == count
+
+        worker = _app(cache_dir)
+        compiled = []
+        original = worker.jinja_env.compile
+        worker.jinja_env.compile = lambda *args, **kwargs: compiled.append(args[1]) or original(*args, **kwargs)
+        for name in ('index.html', 'base.html', 'about-1.html', 'news-grid.html'):
+            worker.jinja_env.get_template(name)
+        assert compiled == []
+
+
+def test_precompile_cli_command():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result = _app(cache_dir).test_cli_runner().invoke(args=['precompile-templates'])
+        assert result.exit_code == 0 and 'Compiled' in result.output
+
+
+_FIRST_REQUEST = '''
+import os, sys, time, io, contextlib
+sys.path.insert(0, {root!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    from app import create_app
+    app = create_app('development')
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    if {disable_cache}:
+        app.jinja_env.bytecode_cache = None
+        app.jinja_env.cache.clear()
+client = app.test_client()
+timings = []
+for path in ('/', '/about', '/gallery', '/blog'):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.get(path)
+    timings.append((time.perf_counter() - start) * 1000)
+print(' '.join(f'{{t:.1f}}' for t in timings))
+'''
+
+
+def benchmark_first_request():
+    root = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {**os.environ, 'TEMPLATE_CACHE_DIR': cache_dir, 'FLASK_CONFIG': 'development'}
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'precompile-templates'],
+                       cwd=root, env=env, capture_output=True, check=True)
+        runs = [
+            ('no bytecode cache (before)', {'TEMPLATE_PRELOAD': 'false'}, True),
+            ('precompiled bytecode cache', {'TEMPLATE_PRELOAD': 'false'}, False),
+            ('bytecode cache + preload', {'TEMPLATE_PRELOAD': 'true'}, False)
+        ]
+        print("First request after worker start, ms:   /    /about  /gallery  /blog")
+        for label, extra, disable_cache in runs:
+            output = subprocess.run(
+                [sys.executable, '-c', _FIRST_REQUEST.format(root=root, disable_cache=disable_cache)],
+                env={**env, **extra}, capture_output=True, text=True, check=True
+            ).stdout.split()
+            print(f"  {label:30s}" + ''.join(f'{value:>9s}' for value in output))
+
+
+if __name__ == '__main__':
+    test_precompiled_templates_load_without_compiling()
+    test_precompile_cli_command()
+    print("✓ Template cache tests passed")
+    benchmark_first_request()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for per-request tracing and the Server-Timing header
+Run directly to print the per-span overhead
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+
+from fake_hms import FakeHMS
+from tracing import init_tracing, span
+
+
+def _app(sample_rate=1.0, export_file=None, force_token='secret'):
+    app = Flask(__name__)
+    app.config.update(TRACING_ENABLED=True, TRACE_SAMPLE_RATE=sample_rate, TRACE_EXPORT_FILE=export_file,
+                      TRACE_EXPORT_SAMPLE_RATE=1.0, TRACE_FORCE_HEADER='X-Trace',
+                      TRACE_FORCE_TOKEN=force_token)
+    init_tracing(app)
+
+    @app.route('/work')
+    def work():
+        with span('hms', desc='GET /api/public/rooms'):
+            with span('auth', desc='token refresh'):
+                pass
+        with span('hms', desc='POST /api/bookings/'):
+            pass
+        return 'ok'
+
+    return app
+
+
+def test_span_outside_request_is_noop():
+    with span('hms'):
+        pass
+
+
+def test_server_timing_sums_spans_by_name():
+    client = _app().test_client()
+    timing = client.get('/work', headers={'X-Trace': 'secret'}).headers['Server-Timing']
+    names = [part.split(';')[0] for part in timing.split(', ')]
+    assert names == ['auth', 'hms', 'total']
+    assert 'desc="2 calls"' in timing and 'desc="token refresh"' in timing
+
+
+def test_sampled_requests_get_bare_durations():
+    """Span descriptions (HMS paths, template names) are only sent on forced traces"""
+    timing = _app().test_client().get('/work').headers['Server-Timing']
+    assert [part.split(';')[0] for part in timing.split(', ')] == ['auth', 'hms', 'total']
+    assert 'desc=' not in timing
+
+
+def test_unsampled_requests_are_untouched_unless_forced():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'traces.jsonl')
+        client = _app(sample_rate=0.0, export_file=path).test_client()
+        assert 'Server-Timing' not in client.get('/work').headers
+        assert not os.path.exists(path)
+
+        assert 'Server-Timing' not in client.get('/work', headers={'X-Trace': '1'}).headers
+        assert not os.path.exists(path)
+
+        assert 'Server-Timing' in client.get('/work', headers={'X-Trace': 'secret'}).headers
+        with open(path) as f:
+            lines = f.readlines()
+        assert len(lines) == 1
+        spans = json.loads(lines[0])['resourceSpans'][0]['scopeSpans'][0]['spans']
+        root, by_name = spans[0], {s['name']: s for s in spans[1:]}
+        assert root['name'] == 'GET /work' and root['kind'] == 2
+        assert by_name['auth']['parentSpanId'] != root['spanId']
+        assert all(s['parentSpanId'] in {root['spanId'], by_name['auth']['parentSpanId']} for s in spans[1:])
+        assert all(int(s['endTimeUnixNano']) >= int(s['startTimeUnixNano']) for s in spans)
+
+
+def test_force_header_is_ignored_without_token():
+    client = _app(sample_rate=0.0, force_token=None).test_client()
+    for value in ('1', 'None', ''):
+        assert 'Server-Timing' not in client.get('/work', headers={'X-Trace': value}).headers
+
+
+def test_app_reports_hms_and_template_phases():
+    from app import create_app
+    from config import DevelopmentConfig, config
+
+    class ForcedTraceConfig(DevelopmentConfig):
+        TRACE_FORCE_TOKEN = 'secret'
+
+    config['trace_test'] = ForcedTraceConfig
+    app = create_app('trace_test')
+    with FakeHMS() as hms, app.test_client() as client:
+        service = app.extensions['hotel_api']
+        service.base_url = hms.url
+        service.auth_service.base_url = hms.url
+        service.set_live_mode()
+        timing = client.get('/', headers={'X-Trace': 'secret'}).headers['Server-Timing']
+        assert 'hms;dur=' in timing and 'desc="GET /api/public/rooms"' in timing
+        assert 'template;dur=' in timing and 'desc="index.html"' in timing
+        assert 'desc=' not in client.get('/').headers['Server-Timing']
+
+
+def benchmark_span_overhead(iterations=100000):
+    app = _app(sample_rate=0.0)
+    for label, headers in (('unsampled', None), ('sampled', {'X-Trace': 'secret'})):
+        with app.test_request_context('/work', headers=headers):
+            app.preprocess_request()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                with span('hms'):
+                    pass
+            elapsed = time.perf_counter() - start
+            app.do_teardown_request()
+        print(f"{label:10s} span: {elapsed / iterations * 1e6:.2f} µs")
+
+
+if __name__ == '__main__':
+    test_span_outside_request_is_noop()
+    test_server_timing_sums_spans_by_name()
+    test_sampled_requests_get_bare_durations()
+    test_unsampled_requests_are_untouched_unless_forced()
+    test_force_header_is_ignored_without_token()
+    test_app_reports_hms_and_template_phases()
+    print("✓ Tracing tests passed")
+    benchmark_span_overhead()
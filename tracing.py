@@ -0,0 +1,207 @@
+import hmac
+import json
+import random
+import time
+from contextvars import ContextVar
+from threading import Lock
+
+from flask import before_render_template, g, request, template_rendered
+
+# Span kinds from the OTLP spec
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_current_trace = ContextVar('current_trace', default=None)
+
+
+class Trace:
+    """Spans recorded for one sampled request"""
+
+    __slots__ = ('trace_id', 'spans', 'stack', 'start_ns', 'wall_start_ns', 'export', 'forced')
+
+    def __init__(self, export=False, forced=False):
+        self.trace_id = f'{random.getrandbits(128):032x}'
+        self.spans = []  # (span_id, parent_id, name, kind, start_ns, end_ns, attributes)
+        self.stack = []
+        self.start_ns = time.perf_counter_ns()
+        self.wall_start_ns = time.time_ns()
+        self.export = export
+        self.forced = forced
+
+    def begin(self, name, kind=SPAN_KIND_CLIENT, attributes=None):
+        span = [f'{random.getrandbits(64):016x}', self.stack[-1][0] if self.stack else None, name, kind,
+                time.perf_counter_ns(), None, attributes or {}]
+        self.stack.append(span)
+        return span
+
+    def end(self, span):
+        span[5] = time.perf_counter_ns()
+        if self.stack and self.stack[-1] is span:
+            self.stack.pop()
+        self.spans.append(span)
+
+    def server_timing(self, total_ns, details=False):
+        """Server-Timing header value: one entry per span name with summed duration
+
+        Descriptions (HMS paths, template names) are only included with details,
+        for traces forced with the shared token; visitors see bare durations.
+        """
+        totals = {}
+        for _, _, name, _, start, end, attributes in self.spans:
+            entry = totals.setdefault(name, [0, 0, attributes.get('desc')])
+            entry[0] += end - start
+            entry[1] += 1
+        parts = []
+        for name, (duration, count, desc) in totals.items():
+            desc = f'{count} calls' if count > 1 else desc
+            part = f'{name};dur={duration / 1e6:.1f}'
+            if desc and details:
+                part += ';desc="' + str(desc).replace('"', "'") + '"'
+            parts.append(part)
+        parts.append(f'total;dur={total_ns / 1e6:.1f}')
+        return ', '.join(parts)
+
+    def to_otlp(self, root_name, end_ns, attributes):
+        """Encode as an OTLP/JSON ExportTraceServiceRequest"""
+        root_id = f'{random.getrandbits(64):016x}'
+
+        def wall(ns):
+            return str(self.wall_start_ns + ns - self.start_ns)
+
+        def otlp_attributes(values):
+            return [{'key': key, 'value': {'stringValue': str(value)}} for key, value in values.items()]
+
+        spans = [{
+            'traceId': self.trace_id, 'spanId': root_id, 'name': root_name, 'kind': SPAN_KIND_SERVER,
+            'startTimeUnixNano': wall(self.start_ns), 'endTimeUnixNano': wall(end_ns),
+            'attributes': otlp_attributes(attributes)
+        }]
+        for span_id, parent_id, name, kind, start, end, span_attributes in self.spans:
+            spans.append({
+                'traceId': self.trace_id, 'spanId': span_id, 'parentSpanId': parent_id or root_id,
+                'name': name, 'kind': kind, 'startTimeUnixNano': wall(start), 'endTimeUnixNano': wall(end),
+                'attributes': otlp_attributes(span_attributes)
+            })
+        return {'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({'service.name': 'ngenda-website'})},
+            'scopeSpans': [{'scope': {'name': 'ngenda.tracing'}, 'spans': spans}]
+        }]}
+
+
+class _Span:
+    """Context manager recording one span on a sampled trace"""
+
+    __slots__ = ('trace', 'name', 'attributes', 'record')
+
+    def __init__(self, trace, name, attributes):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.record = self.trace.begin(self.name, attributes=self.attributes)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.end(self.record)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name, **attributes):
+    """Time a phase of the current request; a no-op when the request is not sampled"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, name, attributes)
+
+
+class TraceFileExporter:
+    """Appends sampled traces to a local file as OTLP/JSON lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+
+    def export(self, payload):
+        line = json.dumps(payload, separators=(',', ':')) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+def init_tracing(app):
+    """Record spans for sampled requests and report them as Server-Timing"""
+    if not app.config['TRACING_ENABLED']:
+        return
+
+    sample_rate = app.config['TRACE_SAMPLE_RATE']
+    export_rate = app.config['TRACE_EXPORT_SAMPLE_RATE']
+    force_header = app.config['TRACE_FORCE_HEADER']
+    force_token = app.config.get('TRACE_FORCE_TOKEN')
+    exporter = TraceFileExporter(app.config['TRACE_EXPORT_FILE']) if app.config['TRACE_EXPORT_FILE'] else None
+
+    def trace_forced():
+        # Forcing needs the shared secret so visitors cannot fill the export file or read span details
+        supplied = request.headers.get(force_header) if force_header else None
+        return bool(force_token and supplied and hmac.compare_digest(supplied.encode(), force_token.encode()))
+
+    @app.before_request
+    def start_trace():
+        forced = trace_forced()
+        if not forced and random.random() >= sample_rate:
+            return
+        trace = Trace(export=exporter is not None and (forced or random.random() < export_rate), forced=forced)
+        g.trace_token = _current_trace.set(trace)
+
+    @app.after_request
+    def add_server_timing(response):
+        trace = _current_trace.get()
+        if trace is not None:
+            response.headers['Server-Timing'] = trace.server_timing(time.perf_counter_ns() - trace.start_ns,
+                                                                    details=trace.forced)
+        return response
+
+    @app.teardown_request
+    def finish_trace(error=None):
+        token = g.pop('trace_token', None)
+        if token is None:
+            return
+        trace = _current_trace.get()
+        _current_trace.reset(token)
+        if trace is not None and trace.export:
+            try:
+                exporter.export(trace.to_otlp(
+                    f'{request.method} {request.url_rule.rule if request.url_rule else request.path}',
+                    time.perf_counter_ns(),
+                    {'http.method': request.method, 'http.target': request.path}
+                ))
+            except OSError as e:
+                print(f"Trace export error: {e}")
+
+    def template_started(sender, template, context, **extra):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.begin('template', attributes={'desc': template.name})
+
+    def template_finished(sender, template, context, **extra):
+        trace = _current_trace.get()
+        if trace is not None and trace.stack and trace.stack[-1][2] == 'template':
+            trace.end(trace.stack[-1])
+
+    before_render_template.connect(template_started, app, weak=False)
+    template_rendered.connect(template_finished, app, weak=False)
+
+    print(f"Tracing enabled (sample rate {sample_rate}, export {app.config['TRACE_EXPORT_FILE'] or 'off'})")